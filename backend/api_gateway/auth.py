@@ -0,0 +1,129 @@
+"""
+Edge authentication for the Taskly API Gateway
+Verifies bearer tokens locally and caches verified claims until they expire
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from jose import jwt, JWTError
+from taskly_common.jws import ASYMMETRIC_ALGORITHMS, decode, unverified_header
+
+from jwks import JwksKeySet
+
+# Headers carrying verified identity to upstream services. Any client-supplied
+# copies are stripped before proxying so they can only come from the gateway.
+USER_ID_HEADER = "x-user-id"
+USER_TENANT_HEADER = "x-user-tenant-id"
+USER_ROLES_HEADER = "x-user-roles"
+TRUSTED_IDENTITY_HEADERS = {USER_ID_HEADER, USER_TENANT_HEADER, USER_ROLES_HEADER}
+
+
+class TokenVerificationError(Exception):
+    """Raised when a bearer token fails signature or claim verification"""
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified claims keyed by token digest, expiring at the token's exp"""
+
+    def __init__(self, max_entries: int, max_ttl: float):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def put(self, key: bytes, claims: Dict[str, Any], exp: float):
+        expires_at = min(exp, time.time() + self.max_ttl)
+        self._entries[key] = (expires_at, claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TokenVerifier:
+    """Verify JWTs with the shared secret (HS*) or the issuer's published keys
+    (ES256/EdDSA), memoizing successful verifications"""
+
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str,
+        cache_size: int,
+        cache_ttl: float,
+        key_set: Optional[JwksKeySet] = None,
+        accepted_algorithms: Iterable[str] = ()
+    ):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.accepted_algorithms = {algorithm, *accepted_algorithms}
+        self.key_set = key_set
+        self.cache = VerifiedTokenCache(cache_size, cache_ttl)
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        key = hashlib.sha256(token.encode()).digest()
+        claims = self.cache.get(key)
+        if claims is not None:
+            return claims
+
+        try:
+            header = unverified_header(token)
+            algorithm = header.get("alg")
+            if algorithm not in self.accepted_algorithms:
+                raise TokenVerificationError(f"token algorithm {algorithm} is not accepted")
+            if algorithm in ASYMMETRIC_ALGORITHMS:
+                public_key = self.key_set.get(header.get("kid")) if self.key_set is not None else None
+                if public_key is None:
+                    raise TokenVerificationError("unknown signing key")
+                claims = decode(token, public_key)
+            else:
+                claims = jwt.decode(token, self.secret_key, algorithms=[algorithm])
+        except JWTError as e:
+            raise TokenVerificationError(str(e)) from e
+
+        # Tokens without exp are still accepted upstream, so only bound them by max_ttl
+        exp = claims.get("exp")
+        self.cache.put(key, claims, float(exp) if exp is not None else float("inf"))
+        return claims
+
+
+def authenticate_request(request: Request, verifier: TokenVerifier) -> Dict[str, str]:
+    """Verify the request's bearer token and return trusted identity headers for upstream"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(401, "Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+
+    try:
+        claims = verifier.verify(token)
+    except TokenVerificationError:
+        raise HTTPException(401, "invalid token", headers={"WWW-Authenticate": "Bearer"})
+
+    tenant_id = claims.get("tenant_id")
+    if tenant_id != request.headers.get("x-tenant-id"):
+        raise HTTPException(403, "token tenant mismatch")
+
+    return {
+        USER_ID_HEADER: str(claims.get("sub", "")),
+        USER_TENANT_HEADER: str(tenant_id),
+        USER_ROLES_HEADER: ",".join(claims.get("roles", [])),
+    }
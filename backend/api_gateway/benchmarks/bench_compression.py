@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark response compression and the orjson response class
+
+Sends the same proxied requests through the gateway app with
+COMPRESSION_ENABLED off and on, against an in-process upstream returning a
+JSON list, and reports bytes on the wire and process CPU time per request
+for each encoding. Uncached requests (POST) are compressed per response;
+cacheable GETs are compressed once and then served from the cache. Also
+compares rendering the gateway's own /health body with FastAPI's default
+JSONResponse and with ORJSONResponse.
+
+Usage (from api_gateway/):
+    python benchmarks/bench_compression.py [requests] [users]
+"""
+
+import asyncio
+import importlib
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# taskly_common, when it has not been pip-installed
+sys.path.insert(1, str(Path(__file__).resolve().parent.parent.parent / "common"))
+import config  # noqa: E402
+from compression import SUPPORTED_ENCODINGS  # noqa: E402
+
+
+def build_payload(users: int) -> bytes:
+    return json.dumps([
+        {
+            "id": f"6f1c2a9e-0000-4000-8000-{i:012d}",
+            "username": f"user{i}",
+            "tenant_id": "acme",
+            "roles": ["user"] if i % 10 else ["user", "admin"]
+        }
+        for i in range(users)
+    ]).encode()
+
+
+def build_gateway(payload: bytes):
+    """Import a fresh gateway app wired to the in-process upstream"""
+    async def upstream(request: httpx.Request) -> httpx.Response:
+        headers = {"content-type": "application/json"}
+        if request.method == "GET":
+            headers["cache-control"] = "max-age=300"
+        return httpx.Response(200, content=payload, headers=headers)
+
+    config.RATE_LIMITS = {"default": 10**9, "auth": 10**9}
+    config.TENANT_RATE_LIMITS = {"default": 10**9, "auth": 10**9}
+    config.PROXY_STREAMING = False  # MockTransport bodies are pre-read
+    import main
+    gateway = importlib.reload(main)
+    for pool in gateway.service_pools.values():
+        pool.client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+    return gateway.app
+
+
+async def run(app, method: str, encoding: str, requests: int, compression_enabled: bool = True):
+    """(wire bytes, CPU seconds) per request for `requests` sequential proxied calls"""
+    config.COMPRESSION_ENABLED = compression_enabled
+    transport = httpx.ASGITransport(app=app)
+    headers = {"accept-encoding": encoding}
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+        for _ in range(20):  # warm up, and fill the cache for GETs
+            await client.request(method, "/auth/auth/users", headers=headers)
+        wire_bytes = 0
+        start = time.process_time()
+        for _ in range(requests):
+            response = await client.request(method, "/auth/auth/users", headers=headers)
+            wire_bytes += response.num_bytes_downloaded
+        return wire_bytes / requests, (time.process_time() - start) / requests
+
+
+def bench_json_render(iterations: int):
+    """Microseconds to render the gateway's /health body with each response class"""
+    import main
+    body = asyncio.run(main.health_check())
+    results = {}
+    for response_class in (JSONResponse, ORJSONResponse):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            response_class(body)
+        results[response_class.__name__] = (time.perf_counter() - start) / iterations * 1e6
+    return results
+
+
+async def main(requests: int, users: int):
+    logging.disable(logging.WARNING)
+    payload = build_payload(users)
+    app = build_gateway(payload)
+
+    print(f"payload: {len(payload)} bytes ({users} users), requests: {requests}")
+    print(f"{'path':<14}{'accept-encoding':<18}{'bytes/request':>15}{'cpu us/request':>16}")
+    for method, label in (("POST", "uncached POST"), ("GET", "cached GET")):
+        wire, cpu = await run(app, method, "gzip, br", requests, compression_enabled=False)
+        print(f"{label:<14}{'(compression off)':<18}{wire:>15.0f}{cpu * 1e6:>16.1f}")
+        for encoding in SUPPORTED_ENCODINGS:
+            wire, cpu = await run(app, method, encoding, requests)
+            print(f"{label:<14}{encoding:<18}{wire:>15.0f}{cpu * 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    u = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    asyncio.run(main(n, u))
+    print()
+    for name, micros in bench_json_render(20000).items():
+        print(f"/health body via {name:<15}{micros:8.2f} us")
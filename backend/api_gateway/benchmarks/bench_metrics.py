@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of gateway instrumentation
+
+Runs the same proxied requests through the gateway app with METRICS_ENABLED
+off and on, against an in-process upstream, and reports the per-request
+overhead. Rounds alternate between the two apps and the fastest round of
+each is compared, which filters out scheduler and GC noise. Request logging
+is silenced so it does not drown out the difference. Exits non-zero if
+instrumentation adds more than 5%.
+
+Usage (from api_gateway/):
+    python benchmarks/bench_metrics.py [requests] [rounds]
+"""
+
+import asyncio
+import importlib
+import logging
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# taskly_common, when it has not been pip-installed
+sys.path.insert(1, str(Path(__file__).resolve().parent.parent.parent / "common"))
+import config  # noqa: E402
+
+MAX_OVERHEAD = 0.05
+PAYLOAD = b'{"id": "1", "username": "bench", "roles": ["user"]}' * 20
+
+
+async def upstream(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, content=PAYLOAD, headers={"content-type": "application/json"})
+
+
+def build_gateway(metrics_enabled: bool):
+    """Import a fresh gateway app wired to the in-process upstream"""
+    config.METRICS_ENABLED = metrics_enabled
+    config.RATE_LIMITS = {"default": 10**9, "auth": 10**9}
+    config.TENANT_RATE_LIMITS = {"default": 10**9, "auth": 10**9}
+    config.PROXY_STREAMING = False  # MockTransport bodies are pre-read
+    import main
+    gateway = importlib.reload(main)
+    for pool in gateway.service_pools.values():
+        pool.client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+    return gateway.app
+
+
+async def run(app, requests: int) -> float:
+    """Seconds per request for `requests` sequential proxied calls"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+        for _ in range(100):  # warm up
+            await client.post("/auth/auth/login", content=b'{"username": "bench"}')
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.post("/auth/auth/login", content=b'{"username": "bench"}')
+        return (time.perf_counter() - start) / requests
+
+
+async def main(requests: int, rounds: int):
+    logging.disable(logging.INFO)
+    plain_app = build_gateway(False)
+    instrumented_app = build_gateway(True)
+
+    plain, instrumented = [], []
+    for _ in range(rounds):
+        plain.append(await run(plain_app, requests))
+        instrumented.append(await run(instrumented_app, requests))
+
+    base = min(plain)
+    with_metrics = min(instrumented)
+    overhead = with_metrics / base - 1
+    print(f"requests/round: {requests}, rounds: {rounds}")
+    print(f"without metrics: {base * 1e6:8.1f} us/request")
+    print(f"with metrics:    {with_metrics * 1e6:8.1f} us/request")
+    print(f"overhead:        {overhead * 100:8.2f} %  (limit {MAX_OVERHEAD * 100:.0f} %)")
+    return overhead <= MAX_OVERHEAD
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    r = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    sys.exit(0 if asyncio.run(main(n, r)) else 1)
@@ -0,0 +1,55 @@
+"""
+Circuit breaker for the Taskly API Gateway
+Stops sending traffic to a failing service and probes it again after a cooldown
+"""
+
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-service breaker: closed -> open after consecutive failures -> half-open trial -> closed"""
+
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now; lets one trial through per recovery window"""
+        if self.state == CLOSED:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at >= self.recovery_timeout:
+            # Restart the window so a trial that never reports back cannot wedge the breaker
+            self.state = HALF_OPEN
+            self.opened_at = now
+            return True
+        return False
+
+    def retry_after(self) -> float:
+        """Seconds until the next trial request is allowed"""
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        self.state = CLOSED
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_after": round(self.retry_after(), 1) if self.state != CLOSED else 0.0
+        }
@@ -0,0 +1,101 @@
+"""
+Response compression for the Taskly API Gateway
+Accept-Encoding negotiation with gzip and, when the brotli package is installed, br
+"""
+
+import zlib
+from typing import AsyncIterator, Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Preferred first when the client weighs several encodings equally
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Media types worth compressing; images, archives and the like are already compressed
+COMPRESSIBLE_TYPES = {
+    "application/json", "application/javascript", "application/xml",
+    "application/problem+json", "application/x-ndjson", "image/svg+xml"
+}
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """Split an Accept-Encoding header into {coding: q}"""
+    weights = {}
+    for part in value.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        name, _, argument = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                q = float(argument)
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+    return weights
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported encoding the client accepts, or None for identity"""
+    if not accept_encoding:
+        return None
+    weights = parse_accept_encoding(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(status_code: int, headers, min_size: int) -> bool:
+    """Whether a response with these headers should be compressed at the edge"""
+    if status_code < 200 or status_code in (204, 206, 304):
+        return False
+    if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+        return False
+    media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    # A compressor holds output back until it fills a block, which would delay each event
+    if media_type == "text/event-stream":
+        return False
+    if not (media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES):
+        return False
+    # Streamed bodies of unknown length are assumed to be worth it
+    length = headers.get("content-length")
+    return length is None or not length.isdigit() or int(length) >= min_size
+
+
+def vary_accept_encoding(vary: str) -> str:
+    """Add Accept-Encoding to a Vary header value"""
+    values = [v.strip() for v in vary.split(",") if v.strip()]
+    if not any(v.lower() in ("accept-encoding", "*") for v in values):
+        values.append("Accept-Encoding")
+    return ", ".join(values)
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """Compress a complete body"""
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return zlib.compress(body, level, wbits=31)
+
+
+async def compress_stream(chunks: AsyncIterator[bytes], encoding: str, level: int) -> AsyncIterator[bytes]:
+    """Compress a body chunk by chunk as it is relayed"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        process, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        process, finish = compressor.compress, compressor.flush
+    async for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
@@ -1,31 +1,112 @@
 # API Gateway Configuration
+import os
 
-# Service discovery
+
+def service_urls(env_var: str, default: str) -> list:
+    """Instance URLs from a comma-separated environment variable"""
+    return [url.strip() for url in os.getenv(env_var, default).split(",") if url.strip()]
+
+
+# Settings a SERVICES entry may leave out
+SERVICE_DEFAULTS = {
+    "health_endpoint": "/health",
+    "timeout": 10.0,  # Seconds per attempt
+    "retries": 2,  # Extra attempts for idempotent requests
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 60.0,
+    "pool_timeout": 2.0,  # Max seconds waiting for a free connection
+    "http2": False  # h2c prior knowledge; the upstream server must support it
+}
+
+
+def service_settings(settings: dict) -> dict:
+    """A SERVICES entry with the keys it leaves out taken from SERVICE_DEFAULTS"""
+    return {**SERVICE_DEFAULTS, **settings}
+
+
+# Service discovery - each service is a pool of instances; only "urls" is required
 SERVICES = {
     "auth_service": {
-        "url": "http://auth_service:8000",
-        "health_endpoint": "/health",
-        "timeout": 30.0
+        "urls": service_urls("AUTH_SERVICE_URLS", "http://auth_service:8000"),
+        "max_keepalive_connections": 100  # Keep bursts on warm sockets
     },
     "notification_service": {
-        "url": "http://notification_service:8000", 
-        "health_endpoint": "/health",
-        "timeout": 30.0
+        "urls": service_urls("NOTIFICATION_SERVICE_URLS", "http://notification_service:8000"),
+        "max_connections": 50
     }
 }
 
+# Upstream health checking
+HEALTH_CHECK_INTERVAL = 10.0  # Seconds between active probes
+HEALTH_CHECK_TIMEOUT = 2.0
+PASSIVE_EJECTION_THRESHOLD = 3  # Consecutive 5xx/connect errors before ejection
+PASSIVE_EJECTION_SECONDS = 30.0
+
+# Circuit breaking and retries
+CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failures before the circuit opens
+CIRCUIT_RECOVERY_TIMEOUT = 15.0  # Seconds before a half-open trial request
+RETRY_BACKOFF_BASE = 0.05  # Seconds, doubled per attempt with full jitter
+RETRY_BACKOFF_MAX = 1.0
+
+# Response caching for anonymous GETs
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+RESPONSE_CACHE_MAX_ENTRY_BYTES = 1024 * 1024
+DOCS_CACHE_TTL = 300.0  # Seconds, for docs/openapi routes without upstream Cache-Control
+
+# Response compression (gzip, plus br when the brotli package is installed)
+COMPRESSION_ENABLED = True
+COMPRESSION_MIN_SIZE = 1024  # Bytes; smaller bodies are sent as-is
+COMPRESSION_LEVELS = {"gzip": 5, "br": 4}  # Per response, on the event loop
+COMPRESSION_CACHED_LEVELS = {"gzip": 9, "br": 11}  # Once per cached response, off the event loop
+
 # Rate limiting (requests per minute)
 RATE_LIMITS = {
     "default": 1000,
     "auth": 500
 }
 
+# Rate limits shared by every client of a tenant (X-Tenant-Id)
+TENANT_RATE_LIMITS = {
+    "default": 10000,
+    "auth": 5000
+}
+
+# Path prefix -> RATE_LIMITS key, anything unmatched uses "default"
+RATE_LIMIT_ROUTES = {
+    "/auth/": "auth"
+}
+RATE_LIMIT_EXEMPT_PATHS = frozenset({"/health", "/metrics"})
+
+# Metrics
+METRICS_ENABLED = True  # Serve /metrics and instrument every request
+
 # Security
-JWT_SECRET_KEY = "your-secret-key-here"  # Change in production
-JWT_ALGORITHM = "HS256"
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "CHANGE_ME_TO_A_STRONG_SECRET")  # Must match auth_service
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")  # HS256, or ES256/EdDSA verified with the auth service's JWKS
+# Also accepted, e.g. HS256 while tokens issued before a switch to ES256 expire
+JWT_ACCEPTED_ALGORITHMS = {a.strip() for a in os.getenv("JWT_ACCEPTED_ALGORITHMS", "").split(",") if a.strip()}
+JWKS_PATH = "/.well-known/jwks.json"  # Fetched from every auth_service instance
+JWKS_DEFAULT_MAX_AGE = 300.0  # Seconds between refreshes when the JWKS has no max-age
+JWKS_MIN_REFRESH_INTERVAL = 10.0  # Floor between refreshes, including those an unknown kid triggers
 JWT_EXPIRE_MINUTES = 30
 
+# Upstream paths whose bearer token is verified at the edge
+JWT_PROTECTED_PATHS = {
+    "auth_service": {"me", "admin-only", "auth/register/bulk", "auth/users", "auth/logout"}
+}
+# Upstream paths only other services call, on the internal network; never proxied
+INTERNAL_ONLY_PATHS = {
+    "auth_service": {"auth/introspect/batch"}
+}
+JWT_CACHE_SIZE = 10000  # Verified tokens kept in memory
+JWT_CACHE_TTL = 300.0  # Upper bound in seconds, tokens also expire at their exp
+
 # CORS settings
 CORS_ORIGINS = ["*"]  # Configure for production
 CORS_METHODS = ["GET", "POST", "PUT", "DELETE", "PATCH"]
-CORS_HEADERS = ["*"]
\ No newline at end of file
+CORS_HEADERS = ["*"]
+
+# Proxying
+PROXY_STREAMING = True  # Relay bodies chunk by chunk instead of buffering them
+PROXY_CHUNK_SIZE = 64 * 1024  # Max bytes per relayed chunk
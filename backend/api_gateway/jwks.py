@@ -0,0 +1,97 @@
+"""
+Public keys for offline verification of the auth service's ES256/EdDSA access tokens
+Loaded from the JWKS of every auth_service instance and refreshed in the background;
+tokens are checked with taskly_common.jws
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import httpx
+from taskly_common.jws import ASYMMETRIC_ALGORITHMS, PublicKey, public_key_from_jwk
+
+from response_cache import parse_cache_control
+from upstreams import ServicePool, UpstreamInstance
+
+logger = logging.getLogger(__name__)
+
+
+class JwksKeySet:
+    """Public keys by kid, merged from every instance of the issuing service
+
+    Each instance's keys are replaced whenever it answers, and kept when it
+    does not, so one instance being down does not invalidate its tokens. The
+    issuer publishes keys well before signing with them, so an unknown kid
+    normally means a forged or stale token; it still triggers an early
+    refresh, at most once per min_interval.
+    """
+
+    def __init__(self, pool: ServicePool, path: str, min_interval: float, default_max_age: float, timeout: float = 2.0):
+        self.pool = pool
+        self.path = path
+        self.min_interval = min_interval
+        self.default_max_age = default_max_age
+        self.timeout = timeout
+        self._per_instance: Dict[str, Dict[str, PublicKey]] = {}
+        self._keys: Dict[str, PublicKey] = {}
+        self._wanted = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, kid: Optional[str]) -> Optional[PublicKey]:
+        key = self._keys.get(kid)
+        if key is None:
+            self._wanted.set()
+        return key
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    async def fetch(self, instance: UpstreamInstance) -> Optional[float]:
+        """Load one instance's keys; returns how long they may be cached, or None on failure"""
+        try:
+            response = await self.pool.client.get(f"{instance.url}{self.path}", timeout=self.timeout)
+            response.raise_for_status()
+            keys = {}
+            for jwk in response.json().get("keys", []):
+                if jwk.get("alg") in ASYMMETRIC_ALGORITHMS and jwk.get("kid"):
+                    keys[jwk["kid"]] = public_key_from_jwk(jwk)
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️ Could not load signing keys from {instance.url}: {e}")
+            return None
+        self._per_instance[instance.url] = keys
+        try:
+            return float(parse_cache_control(response.headers.get("cache-control", "")).get("max-age"))
+        except (TypeError, ValueError):
+            return self.default_max_age
+
+    async def refresh(self) -> float:
+        """Reload keys from every instance; returns seconds until the next scheduled refresh"""
+        max_ages = await asyncio.gather(*(self.fetch(instance) for instance in self.pool.instances))
+        merged = {}
+        for keys in self._per_instance.values():
+            merged.update(keys)
+        self._keys = merged
+        answered = [age for age in max_ages if age is not None]
+        return max(self.min_interval, min(answered) if answered else self.min_interval)
+
+    async def run(self):
+        while True:
+            self._wanted.clear()
+            delay = await self.refresh()
+            try:
+                await asyncio.wait_for(self._wanted.wait(), timeout=delay)
+                await asyncio.sleep(self.min_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
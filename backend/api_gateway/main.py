@@ -6,48 +6,124 @@ Centralized entry point for all microservices
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 import httpx
+import asyncio
 import logging
+import math
+import random
+import time
 from typing import Optional
 from contextlib import asynccontextmanager
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+import config
+from auth import TokenVerifier, authenticate_request, TRUSTED_IDENTITY_HEADERS
+from jwks import JwksKeySet
+from rate_limit import RateLimitMiddleware, InMemoryRateLimitBackend
+from upstreams import HealthChecker, Lease, build_service_pools
+from circuit_breaker import CircuitBreaker
+from response_cache import CachedResponse, ResponseCache, storable_ttl
+from compression import compress, compress_stream, is_compressible, negotiate_encoding, vary_accept_encoding
+from taskly_common.access_log import configure_logging
+from taskly_common.asgi import AccessLogMiddleware
+from taskly_common.jws import ASYMMETRIC_ALGORITHMS
+from metrics import (
+    MetricsMiddleware, registry, status_class, UPSTREAM_REQUESTS, UPSTREAM_DURATION,
+    UPSTREAM_IN_FLIGHT, POOL_CONNECTIONS, POOL_SATURATION, POOL_TIMEOUTS, CIRCUIT_OPEN
 )
+
+# Configure logging (JSON lines written off the event loop thread)
+configure_logging(quiet_loggers=("httpx",))
 logger = logging.getLogger(__name__)
 
-# Service URLs - Internal network addresses
-SERVICE_URLS = {
-    "auth_service": "http://auth_service:8000",
-    "notification_service": "http://notification_service:8000",
+# Upstream instance pools - Internal network addresses from config.SERVICES
+service_pools = build_service_pools(
+    {name: config.service_settings(settings) for name, settings in config.SERVICES.items()},
+    ejection_threshold=config.PASSIVE_EJECTION_THRESHOLD,
+    ejection_seconds=config.PASSIVE_EJECTION_SECONDS
+)
+health_checker = HealthChecker(
+    service_pools,
+    interval=config.HEALTH_CHECK_INTERVAL,
+    timeout=config.HEALTH_CHECK_TIMEOUT
+)
+
+# Per-service circuit breakers
+circuit_breakers = {
+    name: CircuitBreaker(
+        name,
+        failure_threshold=config.CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout=config.CIRCUIT_RECOVERY_TIMEOUT
+    )
+    for name in config.SERVICES
+}
+
+# Shared cache for anonymous GET responses
+response_cache = ResponseCache(
+    max_bytes=config.RESPONSE_CACHE_MAX_BYTES,
+    max_entry_bytes=config.RESPONSE_CACHE_MAX_ENTRY_BYTES
+)
+
+# Requests carrying these are per-user and never served from the shared cache
+CREDENTIAL_HEADERS = {"authorization", "cookie"}
+
+# Methods whose request body is forwarded upstream
+BODY_METHODS = {"POST", "PUT", "PATCH"}
+
+# Idempotent methods without a body, safe to send again to another instance
+RETRYABLE_METHODS = {"GET", "HEAD", "OPTIONS", "DELETE"}
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+# Hop-by-hop headers that must not be forwarded in either direction
+HOP_BY_HOP_REQUEST_HEADERS = {
+    "host", "content-length", "connection", "upgrade",
+    "proxy-connection", "te", "trailer", "transfer-encoding"
+}
+HOP_BY_HOP_RESPONSE_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate",
+    "proxy-authorization", "te", "trailers", "transfer-encoding", "upgrade"
 }
 
-# Global HTTP client
-http_client: Optional[httpx.AsyncClient] = None
+# Edge JWT verification; asymmetric tokens are checked against the auth service's published keys
+jwks_key_set = JwksKeySet(
+    service_pools["auth_service"],
+    config.JWKS_PATH,
+    min_interval=config.JWKS_MIN_REFRESH_INTERVAL,
+    default_max_age=config.JWKS_DEFAULT_MAX_AGE,
+    timeout=config.HEALTH_CHECK_TIMEOUT
+) if {config.JWT_ALGORITHM, *config.JWT_ACCEPTED_ALGORITHMS} & set(ASYMMETRIC_ALGORITHMS) else None
+token_verifier = TokenVerifier(
+    config.JWT_SECRET_KEY,
+    config.JWT_ALGORITHM,
+    cache_size=config.JWT_CACHE_SIZE,
+    cache_ttl=config.JWT_CACHE_TTL,
+    key_set=jwks_key_set,
+    accepted_algorithms=config.JWT_ACCEPTED_ALGORITHMS
+)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle"""
-    global http_client
     
     # Startup
     logger.info("🚀 Starting API Gateway...")
-    http_client = httpx.AsyncClient(
-        timeout=httpx.Timeout(30.0),
-        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
-        follow_redirects=True
-    )
-    logger.info("✅ HTTP client initialized")
+    for pool in service_pools.values():
+        pool.open()
+    logger.info("✅ Upstream connection pools initialized")
+    health_checker.start()
+    if jwks_key_set is not None:
+        jwks_key_set.start()
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down API Gateway...")
-    if http_client:
-        await http_client.aclose()
+    await health_checker.stop()
+    if jwks_key_set is not None:
+        await jwks_key_set.stop()
+    for pool in service_pools.values():
+        await pool.close()
     logger.info("✅ API Gateway shutdown complete")
 
 # Initialize FastAPI app
@@ -56,11 +132,23 @@ app = FastAPI(
     description="Centralized API Gateway for Taskly microservices",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url=None,
     redoc_url=None,
     openapi_url=None
 )
 
+# Rate limiting (added before CORS so 429 responses still carry CORS headers).
+# Swap InMemoryRateLimitBackend for a shared backend when running several replicas.
+app.add_middleware(
+    RateLimitMiddleware,
+    client_limits=config.RATE_LIMITS,
+    tenant_limits=config.TENANT_RATE_LIMITS,
+    route_rules=config.RATE_LIMIT_ROUTES,
+    backend=InMemoryRateLimitBackend(),
+    exempt_paths=config.RATE_LIMIT_EXEMPT_PATHS
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -70,15 +158,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrics and access log (outermost, so rate-limited and CORS preflight requests are counted too)
+if config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+app.add_middleware(AccessLogMiddleware)
+
+def collect_upstream_metrics():
+    """Refresh connection pool and breaker gauges at scrape time"""
+    for name, pool in service_pools.items():
+        stats = pool.connection_stats()
+        UPSTREAM_IN_FLIGHT.set(stats["in_flight"], name)
+        POOL_SATURATION.set(stats["in_flight"] / stats["max_connections"], name)
+        POOL_TIMEOUTS.set(stats["pool_timeouts"], name)
+        if "open_connections" in stats:
+            POOL_CONNECTIONS.set(stats["open_connections"], name, "open")
+            POOL_CONNECTIONS.set(stats["idle_connections"], name, "idle")
+        CIRCUIT_OPEN.set(0 if circuit_breakers[name].state == "closed" else 1, name)
+
+registry.add_collector(collect_upstream_metrics)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
         "service": "api_gateway",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "upstreams": {name: pool.status() for name, pool in service_pools.items()},
+        "connection_pools": {name: pool.connection_stats() for name, pool in service_pools.items()},
+        "circuit_breakers": {name: breaker.status() for name, breaker in circuit_breakers.items()},
+        "response_cache": response_cache.stats()
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return Response(registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -89,89 +205,332 @@ async def root():
             "/auth/*": "Authentication service",
             "/notifications/*": "Notification service",
             "/health": "Health check",
+            "/metrics": "Prometheus metrics",
             "/docs": "API documentation"
         }
     }
 
-async def proxy_request(service_name: str, path: str, request: Request):
-    """Proxy request to microservice"""
+async def close_upstream(upstream_response: httpx.Response, lease: Lease):
+    """Release the upstream connection and the instance lease"""
+    try:
+        await upstream_response.aclose()
+    finally:
+        lease.release()
+
+async def relay_upstream(upstream_response: httpx.Response, lease: Lease):
+    """Yield upstream body chunks and release the connection however the stream ends"""
+    try:
+        # Chunks go out as they arrive; aiter_raw(size) would hold back a partial
+        # chunk until `size` bytes came in, stalling slow or event streams
+        async for chunk in upstream_response.aiter_raw():
+            for start in range(0, len(chunk), config.PROXY_CHUNK_SIZE):
+                yield chunk[start:start + config.PROXY_CHUNK_SIZE]
+    finally:
+        await close_upstream(upstream_response, lease)
+
+def record_upstream(request: Request, service_name: str, service_url: str, outcome: str, seconds: float):
+    """Count an upstream attempt and charge its time to the request's upstream total"""
+    state = request.scope.setdefault("state", {})
+    state["upstream_seconds"] = state.get("upstream_seconds", 0.0) + seconds
+    state["access_log"] = {"service": service_name, "upstream": service_url, "upstream_status": outcome}
+    if config.METRICS_ENABLED:
+        UPSTREAM_REQUESTS.inc(service_name, outcome)
+        UPSTREAM_DURATION.observe(seconds, service_name)
+
+def normalize_path(path: str) -> str:
+    """The path the upstream will route, for matching against config path sets
+
+    Empty and dot segments are resolved the way upstream (or the redirect
+    follow_redirects obeys) would, so `auth/introspect/batch/` or
+    `auth//introspect/./batch` cannot slip past an exact comparison.
+    """
+    segments = []
+    for segment in path.split("/"):
+        if segment == "..":
+            if segments:
+                segments.pop()
+        elif segment not in ("", "."):
+            segments.append(segment)
+    return "/".join(segments)
+
+def retry_backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` + 1"""
+    return random.uniform(0, min(config.RETRY_BACKOFF_MAX, config.RETRY_BACKOFF_BASE * 2 ** attempt))
+
+async def proxy_request(service_name: str, path: str, request: Request, cache_ttl: Optional[float] = None):
+    """Proxy request to microservice
+    
+    `cache_ttl` lets a route cache GET responses for that long when upstream
+    sends no Cache-Control of its own.
+    """
     
-    if service_name not in SERVICE_URLS:
+    if service_name not in service_pools:
         raise HTTPException(404, f"Service '{service_name}' not found")
     
-    # Build target URL
-    service_url = SERVICE_URLS[service_name]
-    target_url = f"{service_url}/{path}" if path else service_url
+    route = normalize_path(path)
+    if route in config.INTERNAL_ONLY_PATHS.get(service_name, ()):
+        raise HTTPException(404, "Not found")
     
-    # Prepare headers (exclude hop-by-hop headers)
+    # Prepare headers (exclude hop-by-hop headers and spoofed identity headers)
     headers = {
         key: value for key, value in request.headers.items()
-        if key.lower() not in {
-            "host", "content-length", "connection", "upgrade",
-            "proxy-connection", "te", "trailer", "transfer-encoding"
-        }
+        if key.lower() not in HOP_BY_HOP_REQUEST_HEADERS
+        and key.lower() not in TRUSTED_IDENTITY_HEADERS
     }
     
-    try:
-        # Get request body
-        body = await request.body() if request.method in ["POST", "PUT", "PATCH"] else None
+    # Reject bad tokens at the edge, forward verified claims upstream
+    if route in config.JWT_PROTECTED_PATHS.get(service_name, ()):
+        headers.update(authenticate_request(request, token_verifier))
+    
+    # Only anonymous GETs are shared between clients
+    if request.method == "GET" and not CREDENTIAL_HEADERS & headers.keys():
+        return await cached_forward(service_name, path, request, headers, cache_ttl)
+    
+    return await compress_response(request, await forward_request(service_name, path, request, headers))
+
+def accepted_encoding(request: Request) -> Optional[str]:
+    """Encoding to compress the response with, if compression is on and the client accepts one"""
+    if not config.COMPRESSION_ENABLED:
+        return None
+    return negotiate_encoding(request.headers.get("accept-encoding", ""))
+
+async def compress_response(request: Request, response: Response) -> Response:
+    """Compress an uncached response on the way out when worthwhile"""
+    if not config.COMPRESSION_ENABLED or request.method == "HEAD":
+        return response
+    if not is_compressible(response.status_code, response.headers, config.COMPRESSION_MIN_SIZE):
+        return response
+    response.headers["vary"] = vary_accept_encoding(response.headers.get("vary", ""))
+    encoding = accepted_encoding(request)
+    if encoding is None:
+        return response
+    
+    level = config.COMPRESSION_LEVELS[encoding]
+    if isinstance(response, StreamingResponse):
+        if "content-length" not in response.headers:
+            # Unknown length: read up to the threshold before deciding
+            chunks, size = [], 0
+            iterator = response.body_iterator.__aiter__()
+            async for chunk in iterator:
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= config.COMPRESSION_MIN_SIZE:
+                    break
+            response.body_iterator = chain_chunks(chunks, iterator)
+            if size < config.COMPRESSION_MIN_SIZE:
+                return response
+        del response.headers["content-length"]
+        response.body_iterator = compress_stream(response.body_iterator, encoding, level)
+    else:
+        response.body = compress(response.body, encoding, level)
+        response.headers["content-length"] = str(len(response.body))
+    response.headers["content-encoding"] = encoding
+    return response
+
+async def cached_variant(key: str, entry: CachedResponse, request: Request) -> Optional[str]:
+    """Encoding of the compressed copy to serve for a cache entry, compressing it on first use"""
+    encoding = accepted_encoding(request) if entry.compressible else None
+    if encoding is None or encoding in entry.variants:
+        return encoding
+    # Compressed once at a high level, so keep it off the event loop
+    body = await asyncio.to_thread(compress, entry.body, encoding, config.COMPRESSION_CACHED_LEVELS[encoding])
+    if len(body) >= len(entry.body):
+        return None
+    response_cache.add_variant(key, entry, encoding, body)
+    return encoding
+
+async def cached_forward(service_name: str, path: str, request: Request, headers: dict, default_ttl: Optional[float]) -> Response:
+    """Serve a GET from the response cache, fetching it once for concurrent misses"""
+    key = f"{service_name}:{path}?{request.url.query}"
+    
+    async def fetch():
+        # Cache identity bodies; the gateway, not upstream, negotiates encodings
+        upstream_headers = {k: v for k, v in headers.items() if k != "accept-encoding"}
+        response = await forward_request(service_name, path, request, upstream_headers)
+        ttl = storable_ttl(response.headers, default_ttl) if response.status_code == 200 else None
+        if ttl is None:
+            return None, response
         
-        logger.info(f"🔄 Proxying {request.method} {path} to {service_name}")
+        if not isinstance(response, StreamingResponse):
+            body = response.body
+        else:
+            chunks, size = [], 0
+            iterator = response.body_iterator.__aiter__()
+            async for chunk in iterator:
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > response_cache.max_entry_bytes:
+                    # Too big to cache: relay what was read followed by the rest
+                    response.body_iterator = chain_chunks(chunks, iterator)
+                    return None, response
+            body = b"".join(chunks)
         
-        # Make request to microservice
-        upstream_response = await http_client.request(
-            method=request.method,
-            url=target_url,
-            headers=headers,
-            content=body,
-            params=request.query_params
-        )
+        compressible = is_compressible(response.status_code, {**response.headers, "content-length": str(len(body))}, config.COMPRESSION_MIN_SIZE)
+        entry = CachedResponse(response.status_code, response.headers, body, ttl, compressible)
+        response_cache.put(key, entry)
+        return entry, None
+    
+    entry, response, cache_status = await response_cache.get_or_fetch(key, fetch)
+    if entry is not None:
+        encoding = await cached_variant(key, entry, request)
+        return entry.to_response(request.headers.get("if-none-match"), cache_status, encoding)
+    if response is not None:
+        return await compress_response(request, response)
+    # Coalesced onto a fetch that turned out uncacheable
+    return await compress_response(request, await forward_request(service_name, path, request, headers))
+
+async def chain_chunks(chunks: list, iterator):
+    """Yield already-read chunks, then the remainder of an iterator"""
+    for chunk in chunks:
+        yield chunk
+    async for chunk in iterator:
+        yield chunk
+
+async def forward_request(service_name: str, path: str, request: Request, headers: dict) -> Response:
+    """Send the request upstream with circuit breaking, timeouts and retries"""
+    pool = service_pools[service_name]
+    breaker = circuit_breakers[service_name]
+    settings = pool.settings
+    timeout = httpx.Timeout(settings["timeout"], pool=settings["pool_timeout"])
+    
+    # Streamed request bodies cannot be replayed, so only bodyless idempotent calls are retried
+    attempts = 1 + settings["retries"] if request.method in RETRYABLE_METHODS else 1
+    
+    for attempt in range(attempts):
+        # Fail fast without touching a socket while the service is known to be down
+        if not breaker.allow_request():
+            raise HTTPException(
+                503,
+                f"Service '{service_name}' unavailable",
+                headers={"Retry-After": str(max(1, math.ceil(breaker.retry_after())))}
+            )
         
-        # Clean response headers
-        response_headers = {
-            key: value for key, value in upstream_response.headers.items()
-            if key.lower() not in {
-                "connection", "keep-alive", "proxy-authenticate",
-                "proxy-authorization", "te", "trailers", "transfer-encoding", "upgrade"
-            }
-        }
+        # Pick an instance and build target URL
+        lease = pool.acquire()
+        service_url = lease.instance.url
+        target_url = f"{service_url}/{path}" if path else service_url
         
-        # Return response with original content type
-        return Response(
-            content=upstream_response.content,
-            status_code=upstream_response.status_code,
-            headers=dict(response_headers),
-            media_type=upstream_response.headers.get("content-type")
-        )
+        started = time.perf_counter()
+        try:
+            response = await send_upstream(pool.client, target_url, headers, request, lease, timeout)
+        except httpx.RequestError as e:
+            record_upstream(request, service_name, service_url, "error", time.perf_counter() - started)
+            lease.release()
+            if isinstance(e, httpx.PoolTimeout):
+                pool.pool_timeouts += 1
+            pool.record_failure(lease.instance)
+            breaker.record_failure()
+            logger.error(f"❌ Request error from {service_url}: {e}")
+            if attempt + 1 < attempts:
+                await asyncio.sleep(retry_backoff(attempt))
+                continue
+            raise HTTPException(503, f"Service '{service_name}' unavailable")
+        except Exception as e:
+            lease.release()
+            logger.error(f"❌ Proxy error: {e}")
+            raise HTTPException(500, "Internal gateway error")
         
-    except httpx.RequestError as e:
-        logger.error(f"❌ Request error: {e}")
-        raise HTTPException(503, f"Service '{service_name}' unavailable")
-    except Exception as e:
-        logger.error(f"❌ Proxy error: {e}")
-        raise HTTPException(500, "Internal gateway error")
+        record_upstream(request, service_name, service_url, status_class(response.status_code), time.perf_counter() - started)
+        
+        # Passive health: repeated 5xx ejects the instance and trips the breaker
+        if response.status_code < 500:
+            pool.record_success(lease.instance)
+            breaker.record_success()
+            return response
+        
+        pool.record_failure(lease.instance)
+        breaker.record_failure()
+        if response.status_code in RETRYABLE_STATUS_CODES and attempt + 1 < attempts:
+            # Drop the failed response (closing its upstream connection) and try another instance
+            if response.background:
+                await response.background()
+            await asyncio.sleep(retry_backoff(attempt))
+            continue
+        return response
+
+async def send_upstream(client: httpx.AsyncClient, target_url: str, headers: dict, request: Request, lease: Lease, timeout: httpx.Timeout) -> Response:
+    """Send one attempt of the request to the leased instance"""
+    if config.PROXY_STREAMING:
+        return await stream_request(client, target_url, headers, request, lease, timeout)
+    
+    # Get request body
+    body = await request.body() if request.method in BODY_METHODS else None
+    
+    # Make request to microservice
+    upstream_response = await client.request(
+        method=request.method,
+        url=target_url,
+        headers=headers,
+        content=body,
+        params=request.query_params,
+        timeout=timeout
+    )
+    lease.release()
+    
+    # Return response with original content type
+    return Response(
+        content=upstream_response.content,
+        status_code=upstream_response.status_code,
+        headers=clean_response_headers(upstream_response),
+        media_type=upstream_response.headers.get("content-type")
+    )
+
+def clean_response_headers(upstream_response: httpx.Response) -> dict:
+    """Drop hop-by-hop headers from an upstream response"""
+    return {
+        key: value for key, value in upstream_response.headers.items()
+        if key.lower() not in HOP_BY_HOP_RESPONSE_HEADERS
+    }
+
+async def stream_request(client: httpx.AsyncClient, target_url: str, headers: dict, request: Request, lease: Lease, timeout: httpx.Timeout) -> StreamingResponse:
+    """Forward request and response bodies chunk by chunk without buffering them"""
+    body = None
+    if request.method in BODY_METHODS:
+        body = request.stream()
+        # Keep fixed-length uploads fixed-length instead of switching to chunked
+        if "content-length" in request.headers:
+            headers["content-length"] = request.headers["content-length"]
+    
+    upstream_request = client.build_request(
+        method=request.method,
+        url=target_url,
+        headers=headers,
+        content=body,
+        params=request.query_params,
+        timeout=timeout
+    )
+    upstream_response = await client.send(upstream_request, stream=True)
+    
+    # Raw chunks keep any upstream Content-Encoding/Content-Length valid; the
+    # background task closes the upstream connection if the client disconnects
+    return StreamingResponse(
+        relay_upstream(upstream_response, lease),
+        status_code=upstream_response.status_code,
+        headers=clean_response_headers(upstream_response),
+        background=BackgroundTask(close_upstream, upstream_response, lease)
+    )
 
 # Documentation routes (must be first due to FastAPI routing precedence)
 @app.get("/openapi.json")
 async def gateway_openapi(request: Request):
     """Route root openapi.json to auth service for docs functionality"""
-    return await proxy_request("auth_service", "openapi.json", request)
+    return await proxy_request("auth_service", "openapi.json", request, cache_ttl=config.DOCS_CACHE_TTL)
 
 # Auth service routes
 @app.get("/auth/openapi.json")
 async def auth_openapi(request: Request):
     """Auth service OpenAPI spec"""
-    return await proxy_request("auth_service", "openapi.json", request)
+    return await proxy_request("auth_service", "openapi.json", request, cache_ttl=config.DOCS_CACHE_TTL)
 
 @app.get("/auth/docs")
 async def auth_docs(request: Request):
     """Auth service documentation page"""
-    return await proxy_request("auth_service", "docs", request)
+    return await proxy_request("auth_service", "docs", request, cache_ttl=config.DOCS_CACHE_TTL)
 
 @app.api_route("/auth/docs/{path:path}", methods=["GET"])
 async def auth_docs_assets(path: str, request: Request):
     """Auth service docs assets (CSS, JS, etc.)"""
-    return await proxy_request("auth_service", f"docs/{path}", request)
+    return await proxy_request("auth_service", f"docs/{path}", request, cache_ttl=config.DOCS_CACHE_TTL)
 
 # General auth service proxy
 @app.api_route("/auth/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
@@ -187,4 +546,4 @@ async def notifications_proxy(path: str, request: Request):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, access_log=False)
\ No newline at end of file
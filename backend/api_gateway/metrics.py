@@ -0,0 +1,84 @@
+"""
+Metrics for the Taskly API Gateway
+The gateway's instruments (see taskly_common.metrics) and the middleware recording them
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from taskly_common.metrics import SIZE_BUCKETS, Counter, Gauge, Histogram, Registry, status_class
+
+registry = Registry()
+
+REQUESTS = registry.register(Counter(
+    "gateway_requests_total", "Requests handled by the gateway", ("route", "method", "status_class")))
+REQUEST_DURATION = registry.register(Histogram(
+    "gateway_request_duration_seconds", "Time from request arrival to response headers", ("route",)))
+GATEWAY_OVERHEAD = registry.register(Histogram(
+    "gateway_overhead_seconds", "Request duration not spent waiting on upstream services", ("route",)))
+IN_FLIGHT = registry.register(Gauge(
+    "gateway_requests_in_flight", "Requests currently being handled"))
+REQUEST_SIZE = registry.register(Histogram(
+    "gateway_request_size_bytes", "Request body size", ("route",), SIZE_BUCKETS))
+RESPONSE_SIZE = registry.register(Histogram(
+    "gateway_response_size_bytes", "Response body size", ("route",), SIZE_BUCKETS))
+
+UPSTREAM_REQUESTS = registry.register(Counter(
+    "gateway_upstream_requests_total", "Upstream attempts by outcome", ("service", "status_class")))
+UPSTREAM_DURATION = registry.register(Histogram(
+    "gateway_upstream_duration_seconds", "Time from sending upstream to upstream response headers", ("service",)))
+UPSTREAM_IN_FLIGHT = registry.register(Gauge(
+    "gateway_upstream_in_flight", "Leased upstream requests", ("service",)))
+POOL_CONNECTIONS = registry.register(Gauge(
+    "gateway_upstream_pool_connections", "Connections in the service's pool", ("service", "state")))
+POOL_SATURATION = registry.register(Gauge(
+    "gateway_upstream_pool_saturation", "In-flight upstream requests over max_connections", ("service",)))
+POOL_TIMEOUTS = registry.register(Gauge(
+    "gateway_upstream_pool_timeouts", "Requests that gave up waiting for a pooled connection", ("service",)))
+CIRCUIT_OPEN = registry.register(Gauge(
+    "gateway_circuit_open", "1 while the service's circuit breaker is not closed", ("service",)))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route counts, latency, sizes and in-flight requests"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        sizes = [0, 0]  # request bytes, response bytes
+        status = [500, 0.0]  # status code, seconds to response headers
+
+        async def counting_receive() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes[0] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message: Message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                status[1] = time.perf_counter() - start
+            elif message["type"] == "http.response.body":
+                sizes[1] += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            IN_FLIGHT.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            duration = status[1] or time.perf_counter() - start
+            upstream = scope.get("state", {}).get("upstream_seconds", 0.0)
+            REQUESTS.inc(route_path, scope["method"], status_class(status[0]))
+            REQUEST_DURATION.observe(duration, route_path)
+            GATEWAY_OVERHEAD.observe(max(0.0, duration - upstream), route_path)
+            REQUEST_SIZE.observe(sizes[0], route_path)
+            RESPONSE_SIZE.observe(sizes[1], route_path)
@@ -0,0 +1,125 @@
+"""
+Rate limiting for the Taskly API Gateway
+Token buckets per client IP and per tenant, enforced before any upstream call
+"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class TokenBucket:
+    """Bucket refilled continuously at `rate` tokens per second up to `capacity`"""
+
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.updated_at = now
+
+    def take(self, rate: float, capacity: float, now: float) -> float:
+        """Consume one token; return 0 on success or the seconds until one is available"""
+        self.tokens = min(capacity, self.tokens + (now - self.updated_at) * rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / rate
+
+
+class RateLimitBackend(ABC):
+    """Bucket storage. Implement this over a shared store (e.g. Redis) for multi-replica deployments."""
+
+    @abstractmethod
+    async def acquire(self, key: str, limit_per_minute: int) -> float:
+        """Take one token from `key`; return 0 if allowed, else the seconds to wait"""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Process-local buckets, bounded so a spray of client IPs cannot grow memory without limit"""
+
+    def __init__(self, max_keys: int = 100000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    async def acquire(self, key: str, limit_per_minute: int) -> float:
+        now = self.clock()
+        capacity = float(limit_per_minute)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(capacity, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take(limit_per_minute / 60.0, capacity, now)
+
+
+class RateLimitMiddleware:
+    """ASGI middleware answering 429 with Retry-After once a client or tenant bucket is empty"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        client_limits: Dict[str, int],
+        tenant_limits: Dict[str, int],
+        route_rules: Dict[str, str],
+        backend: Optional[RateLimitBackend] = None,
+        exempt_paths: frozenset = frozenset(),
+    ):
+        self.app = app
+        self.client_limits = client_limits
+        self.tenant_limits = tenant_limits
+        self.route_rules = route_rules
+        self.backend = backend or InMemoryRateLimitBackend()
+        self.exempt_paths = exempt_paths
+
+    def match_rule(self, path: str) -> str:
+        """Map a request path to a RATE_LIMITS key by prefix"""
+        for prefix, rule in self.route_rules.items():
+            if path.startswith(prefix):
+                return rule
+        return "default"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        rule = self.match_rule(scope["path"])
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+
+        wait = await self.backend.acquire(
+            f"{rule}:ip:{client_ip}",
+            self.client_limits.get(rule, self.client_limits["default"])
+        )
+
+        tenant_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-tenant-id":
+                tenant_id = value.decode("latin-1")
+                break
+        if not wait and tenant_id:
+            wait = await self.backend.acquire(
+                f"{rule}:tenant:{tenant_id}",
+                self.tenant_limits.get(rule, self.tenant_limits["default"])
+            )
+
+        if wait:
+            response = JSONResponse(
+                {"detail": "rate limit exceeded"},
+                status_code=429,
+                headers={"Retry-After": str(max(1, math.ceil(wait)))}
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
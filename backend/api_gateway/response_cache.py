@@ -0,0 +1,201 @@
+"""
+Response cache for the Taskly API Gateway
+Size-bounded LRU of idempotent GET responses with ETag revalidation and single-flight misses
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from starlette.responses import Response
+
+from compression import vary_accept_encoding
+
+# Upstream Cache-Control directives that forbid storing the response at the edge
+UNCACHEABLE_DIRECTIVES = {"no-store", "no-cache", "private"}
+
+
+def parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    """Split a Cache-Control header into {directive: argument}"""
+    directives = {}
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def storable_ttl(headers, default_ttl: Optional[float]) -> Optional[float]:
+    """Seconds a response may be stored for, or None if it must not be cached"""
+    if "set-cookie" in headers or "content-encoding" in headers:
+        return None
+    # The key only covers the path and query; the gateway negotiates encodings itself
+    vary = headers.get("vary", "")
+    if vary and any(v.strip().lower() not in ("", "accept-encoding") for v in vary.split(",")):
+        return None
+
+    directives = parse_cache_control(headers.get("cache-control", ""))
+    if UNCACHEABLE_DIRECTIVES & directives.keys():
+        return None
+    for name in ("s-maxage", "max-age"):
+        if name in directives:
+            try:
+                ttl = float(directives[name])
+            except (TypeError, ValueError):
+                return None
+            return ttl if ttl > 0 else None
+    return default_ttl
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+class CachedResponse:
+    """A stored upstream response"""
+
+    __slots__ = ("status_code", "headers", "body", "etag", "expires_at", "size", "compressible", "variants")
+
+    def __init__(self, status_code: int, headers: Dict[str, str], body: bytes, ttl: float, compressible: bool = False):
+        self.status_code = status_code
+        self.body = body
+        self.compressible = compressible
+        # Content-Encoding -> compressed copy of body, filled in on first request for it
+        self.variants: Dict[str, bytes] = {}
+        self.headers = dict(headers)
+        # Synthesize a strong validator when upstream did not send one
+        self.etag = self.headers.get("etag") or f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self.headers["etag"] = self.etag
+        self.expires_at = time.monotonic() + ttl
+        self.size = len(body) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+    def to_response(self, if_none_match: Optional[str], cache_status: str, encoding: Optional[str] = None) -> Response:
+        """Full response, or 304 when the client already holds this version
+
+        `encoding` selects a stored compressed variant. It is sent with a weak
+        ETag, as the bytes differ from the identity body's.
+        """
+        headers = self.headers
+        body = self.body
+        if encoding is not None:
+            body = self.variants[encoding]
+            headers = {key: value for key, value in headers.items() if key != "content-length"}
+            headers["content-encoding"] = encoding
+            headers["etag"] = self.etag if self.etag.startswith("W/") else f"W/{self.etag}"
+        if self.compressible:
+            headers = {**headers, "vary": vary_accept_encoding(headers.get("vary", ""))}
+
+        if if_none_match and etag_matches(if_none_match, self.etag):
+            headers = {
+                key: value for key, value in headers.items()
+                if key in ("etag", "cache-control", "expires", "last-modified", "vary")
+            }
+            headers["x-cache"] = cache_status
+            return Response(status_code=304, headers=headers)
+        return Response(
+            content=body,
+            status_code=self.status_code,
+            headers={**headers, "x-cache": cache_status}
+        )
+
+
+class ResponseCache:
+    """LRU bounded by total bytes, coalescing concurrent misses for the same key"""
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse):
+        if entry.size > self.max_entry_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self.current_bytes += entry.size
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def add_variant(self, key: str, entry: CachedResponse, encoding: str, body: bytes):
+        """Keep a compressed copy alongside the entry, counted against the byte budget"""
+        entry.variants[encoding] = body
+        if self._entries.get(key) is entry:
+            entry.size += len(body)
+            self.current_bytes += len(body)
+            while self.current_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry.size
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Tuple[Optional[CachedResponse], Optional[Response]]]]
+    ) -> Tuple[Optional[CachedResponse], Optional[Response], str]:
+        """
+        Serve `key` from cache or run `fetch` once for all concurrent callers.
+
+        `fetch` returns (entry, None) for a cacheable response it stored, or
+        (None, response) for one that must not be cached. Callers waiting on an
+        uncacheable fetch get (None, None, ...) and must make their own request.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry, None, "HIT"
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(in_flight), None, "HIT"
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        entry = None
+        try:
+            entry, response = await fetch()
+            return entry, response, "MISS"
+        finally:
+            del self._in_flight[key]
+            future.set_result(entry)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced
+        }
@@ -0,0 +1,28 @@
+# Test configuration and fixtures
+import sys
+from pathlib import Path
+import pytest
+
+# The gateway's modules live at its top level
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+# taskly_common, when it has not been pip-installed
+sys.path.insert(1, str(project_root.parent / "common"))
+
+
+class FakeClock:
+    """A monotonic clock the test moves by hand"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
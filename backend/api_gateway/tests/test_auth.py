@@ -0,0 +1,73 @@
+# Tests for offline token verification at the gateway
+import time
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from taskly_common import jws
+from auth import TokenVerificationError, TokenVerifier
+
+
+class StaticKeySet:
+    """Stands in for JwksKeySet with a fixed set of keys"""
+
+    def __init__(self, *private_keys):
+        self.keys = {jws.thumbprint(jws.public_jwk(key.public_key())): key.public_key() for key in private_keys}
+
+    def get(self, kid):
+        return self.keys.get(kid)
+
+
+def sign(private_key, **claims) -> str:
+    kid = jws.thumbprint(jws.public_jwk(private_key.public_key()))
+    return jws.encode({"sub": "user-1", "exp": time.time() + 60, **claims}, private_key, kid)
+
+
+def generate(algorithm: str):
+    return ec.generate_private_key(ec.SECP256R1()) if algorithm == "ES256" else ed25519.Ed25519PrivateKey.generate()
+
+
+@pytest.fixture(params=jws.ASYMMETRIC_ALGORITHMS)
+def private_key(request):
+    return generate(request.param)
+
+
+@pytest.fixture
+def verifier(private_key):
+    return TokenVerifier(
+        "secret", jws.algorithm_for(private_key), cache_size=10, cache_ttl=60, key_set=StaticKeySet(private_key)
+    )
+
+
+class TestTokenVerifier:
+    def test_verified_and_memoized(self, verifier, private_key):
+        """Test that a token signed by a published key verifies, then comes from the cache."""
+        token = sign(private_key)
+
+        assert verifier.verify(token)["sub"] == "user-1"
+        assert verifier.verify(token)["sub"] == "user-1"
+        assert (verifier.cache.hits, verifier.cache.misses) == (1, 1)
+
+    def test_expired(self, verifier, private_key):
+        """Test that exp is checked and expired tokens are not cached."""
+        with pytest.raises(TokenVerificationError):
+            verifier.verify(sign(private_key, exp=time.time() - 1))
+        assert len(verifier.cache) == 0
+
+    def test_unknown_kid(self, verifier, private_key):
+        """Test that a key missing from the JWKS is rejected."""
+        other = generate(jws.algorithm_for(private_key))
+
+        with pytest.raises(TokenVerificationError, match="unknown signing key"):
+            verifier.verify(sign(other))
+
+    def test_tampered(self, verifier, private_key):
+        """Test that changing the payload breaks the signature."""
+        header, _, signature = sign(private_key).split(".")
+        payload = jws.b64url_encode(b'{"sub": "admin"}')
+
+        with pytest.raises(TokenVerificationError):
+            verifier.verify(f"{header}.{payload}.{signature}")
+
+    def test_algorithm_not_accepted(self, verifier):
+        """Test that an HS256 token is refused when only the asymmetric algorithm is accepted."""
+        with pytest.raises(TokenVerificationError, match="not accepted"):
+            verifier.verify("eyJhbGciOiJIUzI1NiJ9.e30.c2ln")
@@ -0,0 +1,90 @@
+# Tests for the per-service circuit breaker
+import pytest
+import circuit_breaker
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def breaker(clock, monkeypatch):
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return CircuitBreaker("svc", failure_threshold=3, recovery_timeout=15.0)
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+class TestCircuitBreaker:
+    def test_stays_closed_below_threshold(self, breaker):
+        """Test that failures short of the threshold, or broken by a success, keep it closed."""
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+
+        assert breaker.state == CLOSED
+        assert breaker.allow_request()
+        assert breaker.status() == {"state": CLOSED, "consecutive_failures": 2, "retry_after": 0.0}
+
+    def test_opens_after_consecutive_failures(self, breaker, clock):
+        """Test that the threshold opens the circuit and requests fail fast until the timeout."""
+        trip(breaker)
+
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+        clock.advance(10)
+        assert not breaker.allow_request()
+        assert breaker.retry_after() == pytest.approx(5.0)
+        assert breaker.status()["retry_after"] == 5.0
+
+    def test_half_open_lets_one_trial_through(self, breaker, clock):
+        """Test that after the timeout exactly one trial request is allowed."""
+        trip(breaker)
+        clock.advance(15)
+
+        assert breaker.allow_request()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow_request()
+        assert not breaker.allow_request()
+
+    def test_trial_success_closes(self, breaker, clock):
+        """Test that a successful trial closes the circuit and clears the failure count."""
+        trip(breaker)
+        clock.advance(15)
+        breaker.allow_request()
+
+        breaker.record_success()
+
+        assert breaker.state == CLOSED
+        assert breaker.consecutive_failures == 0
+        assert breaker.allow_request()
+        assert breaker.allow_request()
+
+    def test_trial_failure_reopens(self, breaker, clock):
+        """Test that a failed trial reopens the circuit for a full recovery timeout."""
+        trip(breaker)
+        clock.advance(15)
+        breaker.allow_request()
+
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert breaker.retry_after() == pytest.approx(15.0)
+        clock.advance(14.9)
+        assert not breaker.allow_request()
+        clock.advance(0.1)
+        assert breaker.allow_request()
+
+    def test_lost_trial_does_not_wedge(self, breaker, clock):
+        """Test that a trial which never reports back is followed by another one a window later."""
+        trip(breaker)
+        clock.advance(15)
+        assert breaker.allow_request()
+
+        clock.advance(10)
+        assert not breaker.allow_request()
+        clock.advance(5)
+
+        assert breaker.allow_request()
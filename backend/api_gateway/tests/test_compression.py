@@ -0,0 +1,166 @@
+# Tests for gateway response compression
+import gzip
+import brotli
+import pytest
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+import compression
+import config
+import main
+from compression import is_compressible, negotiate_encoding, parse_accept_encoding, vary_accept_encoding
+
+BODY = b'{"items": "' + b"a" * 4000 + b'"}'
+
+
+def request(accept_encoding=None, method="GET") -> Request:
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding is not None else []
+    return Request({"type": "http", "method": method, "path": "/", "headers": headers})
+
+
+async def read_body(response) -> bytes:
+    if isinstance(response, StreamingResponse):
+        return b"".join([chunk async for chunk in response.body_iterator])
+    return response.body
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+class TestNegotiation:
+    def test_parse_q_values(self):
+        """Test that codings are lower-cased and weighted, with bad weights treated as 0."""
+        assert parse_accept_encoding("GZIP;q=0.5, br, deflate;q=nope, ") == {"gzip": 0.5, "br": 1.0, "deflate": 0.0}
+
+    @pytest.mark.parametrize("accept_encoding, encoding", [
+        ("", None),
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("gzip;q=1.0, br;q=0.8", "gzip"),
+        ("br;q=0, gzip;q=0.1", "gzip"),
+        ("deflate", None),
+        ("*", "br"),
+        ("*;q=0.5, br;q=0", "gzip"),
+        ("gzip;q=0, *;q=0", None),
+        ("identity;q=0, gzip;q=0.5", "gzip"),
+        ("identity;q=0", None),
+    ])
+    def test_negotiate(self, accept_encoding, encoding):
+        """Test that the highest weighted supported coding wins, preferring br on ties."""
+        assert negotiate_encoding(accept_encoding) == encoding
+
+    def test_without_brotli(self, monkeypatch):
+        """Test that br is never chosen when the brotli package is missing."""
+        monkeypatch.setattr(compression, "SUPPORTED_ENCODINGS", ("gzip",))
+
+        assert negotiate_encoding("br") is None
+        assert negotiate_encoding("br, gzip;q=0.1") == "gzip"
+
+
+class TestIsCompressible:
+    @pytest.mark.parametrize("status_code, headers, expected", [
+        (200, {"content-type": "application/json", "content-length": "2048"}, True),
+        (200, {"content-type": "text/html; charset=utf-8"}, True),
+        (200, {"content-type": "application/json", "content-length": "100"}, False),
+        (200, {"content-type": "image/png", "content-length": "2048"}, False),
+        (200, {"content-type": "application/json", "content-encoding": "gzip"}, False),
+        (200, {"content-type": "application/json", "cache-control": "no-transform"}, False),
+        (200, {"content-type": "text/event-stream"}, False),
+        (204, {"content-type": "application/json"}, False),
+        (304, {"content-type": "application/json"}, False),
+        (101, {"content-type": "application/json"}, False),
+    ])
+    def test_is_compressible(self, status_code, headers, expected):
+        """Test which responses are worth compressing at the edge."""
+        assert is_compressible(status_code, headers, min_size=1024) is expected
+
+    @pytest.mark.parametrize("vary, expected", [
+        ("", "Accept-Encoding"),
+        ("Origin", "Origin, Accept-Encoding"),
+        ("origin, accept-encoding", "origin, accept-encoding"),
+        ("*", "*"),
+    ])
+    def test_vary(self, vary, expected):
+        """Test that Accept-Encoding is added to Vary once."""
+        assert vary_accept_encoding(vary) == expected
+
+
+class TestCompressResponse:
+    async def test_gzip_body(self):
+        """Test that a large buffered body is gzipped with a matching Content-Length and Vary."""
+        response = await main.compress_response(request("gzip"), Response(BODY, media_type="application/json"))
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(response.body) < len(BODY)
+        assert gzip.decompress(response.body) == BODY
+
+    async def test_below_min_size(self):
+        """Test that small bodies are sent as-is, and without Vary as no client would get them encoded."""
+        response = await main.compress_response(request("gzip"), Response(b"{}", media_type="application/json"))
+
+        assert "content-encoding" not in response.headers
+        assert "vary" not in response.headers
+        assert response.body == b"{}"
+
+    async def test_identity_requested(self):
+        """Test that a client accepting no supported coding gets identity, with Vary."""
+        response = await main.compress_response(request("deflate"), Response(BODY, media_type="application/json"))
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.body == BODY
+
+    async def test_already_encoded(self):
+        """Test that a body upstream already encoded is passed through untouched."""
+        encoded = gzip.compress(BODY)
+        upstream = Response(encoded, media_type="application/json", headers={"content-encoding": "gzip"})
+
+        response = await main.compress_response(request("br"), upstream)
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "vary" not in response.headers
+        assert response.body == encoded
+
+    async def test_head_untouched(self):
+        """Test that HEAD responses keep their headers as they are."""
+        response = await main.compress_response(request("gzip", "HEAD"), Response(BODY, media_type="application/json"))
+
+        assert "content-encoding" not in response.headers
+
+    async def test_disabled(self, monkeypatch):
+        """Test that COMPRESSION_ENABLED = False turns compression off."""
+        monkeypatch.setattr(config, "COMPRESSION_ENABLED", False)
+
+        response = await main.compress_response(request("gzip"), Response(BODY, media_type="application/json"))
+
+        assert "content-encoding" not in response.headers
+
+    async def test_stream_compressed_chunk_by_chunk(self):
+        """Test that a long stream of unknown length is compressed as it is relayed."""
+        upstream = StreamingResponse(stream(BODY[:10], BODY[10:2000], BODY[2000:]), media_type="application/json")
+
+        response = await main.compress_response(request("br"), upstream)
+
+        assert response.headers["content-encoding"] == "br"
+        assert "content-length" not in response.headers
+        assert brotli.decompress(await read_body(response)) == BODY
+
+    async def test_short_stream_not_compressed(self):
+        """Test that a stream ending below the threshold is relayed as-is without losing chunks."""
+        upstream = StreamingResponse(stream(b'{"a"', b": 1}"), media_type="application/json")
+
+        response = await main.compress_response(request("gzip"), upstream)
+
+        assert "content-encoding" not in response.headers
+        assert await read_body(response) == b'{"a": 1}'
+
+    async def test_event_stream_not_compressed(self):
+        """Test that server-sent events are relayed uncompressed so each event goes out at once."""
+        upstream = StreamingResponse(stream(b"data: 1\n\n" * 200), media_type="text/event-stream")
+
+        response = await main.compress_response(request("gzip"), upstream)
+
+        assert "content-encoding" not in response.headers
+        assert await read_body(response) == b"data: 1\n\n" * 200
@@ -0,0 +1,116 @@
+# Tests for the gateway's JWKS key set
+import asyncio
+import httpx
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+from taskly_common import jws
+import config
+from jwks import JwksKeySet
+from upstreams import ServicePool
+
+
+def signing_jwk():
+    """A fresh ES256 public key as the auth service publishes it"""
+    jwk = jws.public_jwk(ec.generate_private_key(ec.SECP256R1()).public_key())
+    return {**jwk, "kid": jws.thumbprint(jwk), "alg": "ES256", "use": "sig"}
+
+
+class FakeAuthInstances:
+    """JWKS answers per instance host; None means the instance is down"""
+
+    def __init__(self, **jwks):
+        self.jwks = jwks
+        self.cache_control = {}
+        self.requests = 0
+
+    def __call__(self, request):
+        self.requests += 1
+        keys = self.jwks[request.url.host]
+        if keys is None:
+            raise httpx.ConnectError("refused", request=request)
+        headers = {"cache-control": self.cache_control[request.url.host]} if request.url.host in self.cache_control else {}
+        return httpx.Response(200, json={"keys": keys}, headers=headers)
+
+
+@pytest.fixture
+def instances():
+    return FakeAuthInstances(a=[], b=[])
+
+
+@pytest.fixture
+def key_set(instances):
+    pool = ServicePool("auth_service", config.service_settings({"urls": ["http://a:8000", "http://b:8000"]}), 3, 30.0)
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(instances))
+    return JwksKeySet(pool, config.JWKS_PATH, min_interval=0.05, default_max_age=300.0)
+
+
+class TestJwksKeySet:
+    async def test_merges_every_instance(self, key_set, instances):
+        """Test that keys published by any instance verify, and unusable entries are skipped."""
+        key_a, key_b = signing_jwk(), signing_jwk()
+        instances.jwks = {"a": [key_a, {**signing_jwk(), "alg": "RS256"}], "b": [key_b, {**signing_jwk(), "kid": None}]}
+
+        await key_set.refresh()
+
+        assert len(key_set) == 2
+        assert key_set.get(key_a["kid"]).public_numbers() == jws.public_key_from_jwk(key_a).public_numbers()
+        assert key_set.get(key_b["kid"]) is not None
+
+    async def test_down_instance_keeps_its_keys(self, key_set, instances):
+        """Test that an instance failing to answer does not drop the keys it published before."""
+        key_a, key_b = signing_jwk(), signing_jwk()
+        instances.jwks = {"a": [key_a], "b": [key_b]}
+        await key_set.refresh()
+
+        instances.jwks["b"] = None
+        await key_set.refresh()
+
+        assert key_set.get(key_b["kid"]) is not None
+
+    async def test_replaced_keys_are_dropped(self, key_set, instances):
+        """Test that a key an instance stops publishing is forgotten once it answers without it."""
+        old, new = signing_jwk(), signing_jwk()
+        instances.jwks = {"a": [old], "b": []}
+        await key_set.refresh()
+
+        instances.jwks["a"] = [new]
+        await key_set.refresh()
+
+        assert key_set.get(old["kid"]) is None
+        assert key_set.get(new["kid"]) is not None
+
+    @pytest.mark.parametrize("cache_control, delay", [
+        ({"a": "public, max-age=120", "b": "max-age=60"}, 60.0),
+        ({"a": "max-age=0"}, 0.05),
+        ({}, 300.0),
+    ])
+    async def test_next_refresh_follows_max_age(self, key_set, instances, cache_control, delay):
+        """Test that the shortest max-age schedules the next refresh, floored at min_interval."""
+        instances.cache_control = cache_control
+
+        assert await key_set.refresh() == delay
+
+    async def test_no_answers_retries_at_min_interval(self, key_set, instances):
+        instances.jwks = {"a": None, "b": None}
+
+        assert await key_set.refresh() == key_set.min_interval
+
+    async def test_unknown_kid_triggers_refresh(self, key_set, instances):
+        """Test that asking for an unknown kid refetches early instead of waiting out max-age."""
+        key_set.start()
+        try:
+            await asyncio.sleep(0.01)
+            rotated = signing_jwk()
+            instances.jwks["a"] = [rotated]
+            requests = instances.requests
+
+            assert key_set.get(rotated["kid"]) is None
+            for _ in range(50):
+                await asyncio.sleep(0.01)
+                if key_set.get(rotated["kid"]) is not None:
+                    break
+
+            assert key_set.get(rotated["kid"]) is not None
+            assert instances.requests > requests
+        finally:
+            await key_set.stop()
@@ -0,0 +1,201 @@
+# Tests for request proxying through the gateway
+import asyncio
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+import config
+import main
+from main import normalize_path, stream_request
+
+TIMEOUT = httpx.Timeout(5.0)
+
+
+class UpstreamBody(httpx.AsyncByteStream):
+    """An upstream response body that records being closed, and can fail or stall after its chunks"""
+
+    def __init__(self, *chunks: bytes, fail: bool = False, stall: bool = False):
+        self.chunks = chunks
+        self.fail = fail
+        self.stall = stall
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+        if self.fail:
+            raise httpx.ReadError("connection reset by upstream")
+        if self.stall:
+            await asyncio.Event().wait()
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeLease:
+    def __init__(self):
+        self.released = False
+
+    def release(self):
+        self.released = True
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Reads request bodies chunk by chunk (MockTransport reads them whole first)"""
+
+    def __init__(self):
+        self.received = []
+
+    async def handle_async_request(self, request):
+        self.received.extend([chunk async for chunk in request.stream if chunk])
+        return httpx.Response(200, stream=UpstreamBody(b"ok"))
+
+
+def upstream(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def client_request(*chunks: bytes, method: str = "POST", headers=()) -> Request:
+    """A request whose body arrives from the client in `chunks`"""
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+
+    async def receive():
+        return messages.pop(0)
+
+    scope = {"type": "http", "method": method, "path": "/", "query_string": b"", "headers": list(headers)}
+    return Request(scope, receive)
+
+
+@pytest.fixture
+def upstream_calls(monkeypatch):
+    """Requests reaching a fake auth_service"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, stream=httpx.ByteStream(b"{}"))
+
+    monkeypatch.setattr(main.service_pools["auth_service"], "client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return calls
+
+
+class TestInternalPaths:
+    @pytest.mark.parametrize("path, normalized", [
+        ("auth/introspect/batch", "auth/introspect/batch"),
+        ("auth/introspect/batch/", "auth/introspect/batch"),
+        ("auth//introspect/./batch", "auth/introspect/batch"),
+        ("auth/x/../introspect/batch", "auth/introspect/batch"),
+        ("../../auth/users", "auth/users"),
+        ("", ""),
+    ])
+    def test_normalize_path(self, path, normalized):
+        assert normalize_path(path) == normalized
+
+    @pytest.mark.parametrize("path", [
+        "/auth/auth/introspect/batch", "/auth/auth/introspect/batch/", "/auth/auth//introspect/batch"
+    ])
+    def test_internal_only_not_proxied(self, upstream_calls, path):
+        """Test that no spelling of an internal-only path reaches upstream."""
+        response = TestClient(main.app).post(path, json={"tokens": []})
+
+        assert response.status_code == 404
+        assert upstream_calls == []
+
+    def test_protected_path_with_trailing_slash(self, upstream_calls):
+        """Test that a trailing slash does not skip edge authentication."""
+        response = TestClient(main.app).get("/auth/auth/users/")
+
+        assert response.status_code == 401
+        assert upstream_calls == []
+
+
+class TestStreaming:
+    async def test_request_body_streamed_upstream(self):
+        """Test that the client's body chunks are sent upstream as they arrive, not joined first."""
+        transport = RecordingTransport()
+
+        response = await stream_request(
+            httpx.AsyncClient(transport=transport), "http://upstream/items", {},
+            client_request(b"one,", b"two,", b"three"), FakeLease(), TIMEOUT
+        )
+
+        assert transport.received == [b"one,", b"two,", b"three"]
+        assert b"".join([chunk async for chunk in response.body_iterator]) == b"ok"
+
+    async def test_fixed_length_body_keeps_content_length(self):
+        seen = {}
+
+        async def handler(request):
+            seen.update(request.headers)
+            await request.aread()
+            return httpx.Response(204, stream=UpstreamBody())
+
+        request = client_request(b"12345", headers=[(b"content-length", b"5")])
+        await stream_request(upstream(handler), "http://upstream/items", {}, request, FakeLease(), TIMEOUT)
+
+        assert seen["content-length"] == "5"
+        assert "transfer-encoding" not in seen
+
+    async def test_response_relayed_in_chunks(self, monkeypatch):
+        """Test that chunks are relayed as they arrive, split at PROXY_CHUNK_SIZE, before upstream has finished."""
+        monkeypatch.setattr(config, "PROXY_CHUNK_SIZE", 4)
+        body = UpstreamBody(b"abcdefghij", b"kl", stall=True)
+        lease = FakeLease()
+        response = await stream_request(
+            upstream(lambda request: httpx.Response(200, stream=body)), "http://upstream/feed", {},
+            client_request(method="GET"), lease, TIMEOUT
+        )
+
+        relayed = response.body_iterator.__aiter__()
+        chunks = [await relayed.__anext__() for _ in range(4)]
+
+        assert chunks == [b"abcd", b"efgh", b"ij", b"kl"]
+        assert not body.closed and not lease.released
+        await relayed.aclose()
+        assert body.closed and lease.released
+
+    async def test_client_disconnect_closes_upstream(self):
+        """Test that the background task closes the upstream response when the client goes away."""
+        body = UpstreamBody(b"first", stall=True)
+        lease = FakeLease()
+        response = await stream_request(
+            upstream(lambda request: httpx.Response(200, stream=body)), "http://upstream/feed", {},
+            client_request(method="GET"), lease, TIMEOUT
+        )
+        sent = []
+        first_chunk = asyncio.Event()
+
+        async def send(message):
+            sent.append(message)
+            if message.get("body"):
+                first_chunk.set()
+
+        async def receive():
+            await first_chunk.wait()
+            return {"type": "http.disconnect"}
+
+        await asyncio.wait_for(response({"type": "http", "method": "GET", "path": "/"}, receive, send), timeout=5)
+
+        assert [message.get("body") for message in sent if message["type"] == "http.response.body"] == [b"first"]
+        assert body.closed and lease.released
+
+    async def test_failed_relay_closes_upstream(self):
+        """Test that an upstream read error mid-body still closes the response and releases the instance."""
+        body = UpstreamBody(b"partial", fail=True)
+        lease = FakeLease()
+        response = await stream_request(
+            upstream(lambda request: httpx.Response(200, stream=body)), "http://upstream/feed", {},
+            client_request(method="GET"), lease, TIMEOUT
+        )
+
+        async def send(message):
+            pass
+
+        async def receive():
+            await asyncio.Event().wait()
+
+        with pytest.raises(Exception):
+            await asyncio.wait_for(response({"type": "http", "method": "GET", "path": "/"}, receive, send), timeout=5)
+
+        assert body.closed and lease.released
@@ -0,0 +1,113 @@
+# Tests for the gateway rate limiter
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from rate_limit import InMemoryRateLimitBackend, RateLimitMiddleware, TokenBucket
+
+
+@pytest.fixture
+def backend(clock):
+    return InMemoryRateLimitBackend(max_keys=3, clock=clock)
+
+
+def make_client(backend, client_limits=None, tenant_limits=None):
+    app = Starlette(routes=[
+        Route("/{path:path}", lambda request: PlainTextResponse("ok"))
+    ])
+    app.add_middleware(
+        RateLimitMiddleware,
+        client_limits=client_limits or {"default": 2, "auth": 1},
+        tenant_limits=tenant_limits or {"default": 3},
+        route_rules={"/auth/": "auth"},
+        backend=backend,
+        exempt_paths=frozenset({"/health"})
+    )
+    return TestClient(app)
+
+
+class TestTokenBucket:
+    def test_burst_then_refill(self):
+        """Test that a full bucket allows `capacity` requests, then refills at `rate` per second."""
+        bucket = TokenBucket(3.0, now=0.0)
+
+        assert [bucket.take(rate=1.0, capacity=3.0, now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.take(rate=1.0, capacity=3.0, now=0.0) == pytest.approx(1.0)
+        assert bucket.take(rate=1.0, capacity=3.0, now=0.25) == pytest.approx(0.75)
+        assert bucket.take(rate=1.0, capacity=3.0, now=1.0) == 0.0
+
+    def test_refill_capped_at_capacity(self):
+        """Test that an idle bucket never holds more than its capacity."""
+        bucket = TokenBucket(2.0, now=0.0)
+        bucket.take(rate=1.0, capacity=2.0, now=0.0)
+
+        results = [bucket.take(rate=1.0, capacity=2.0, now=3600.0) for _ in range(3)]
+
+        assert results[:2] == [0.0, 0.0]
+        assert results[2] == pytest.approx(1.0)
+
+
+class TestInMemoryRateLimitBackend:
+    async def test_limit_per_minute(self, backend, clock):
+        """Test that a limit of N per minute allows a burst of N and one more every 60/N seconds."""
+        assert [await backend.acquire("k", 60) for _ in range(60)] == [0.0] * 60
+        assert await backend.acquire("k", 60) == pytest.approx(1.0)
+
+        clock.advance(0.5)
+        assert await backend.acquire("k", 60) == pytest.approx(0.5)
+        clock.advance(0.5)
+        assert await backend.acquire("k", 60) == 0.0
+
+    async def test_keys_are_isolated(self, backend):
+        """Test that draining one key leaves the others untouched."""
+        await backend.acquire("a", 1)
+
+        assert await backend.acquire("a", 1) > 0
+        assert await backend.acquire("b", 1) == 0.0
+
+    async def test_least_recent_key_evicted(self, backend):
+        """Test that past max_keys the least recently used bucket is forgotten."""
+        for key in ("a", "b", "c"):
+            await backend.acquire(key, 1)
+        await backend.acquire("a", 1)
+
+        await backend.acquire("d", 1)
+
+        assert await backend.acquire("b", 1) == 0.0
+        assert await backend.acquire("a", 1) > 0
+
+
+class TestRateLimitMiddleware:
+    def test_429_with_retry_after(self, backend, clock):
+        """Test that an empty bucket is answered with 429 and the whole seconds until a token."""
+        client = make_client(backend)
+
+        assert [client.get("/tasks").status_code for _ in range(2)] == [200, 200]
+        limited = client.get("/tasks")
+
+        assert limited.status_code == 429
+        assert limited.json() == {"detail": "rate limit exceeded"}
+        assert limited.headers["Retry-After"] == "30"
+        clock.advance(30)
+        assert client.get("/tasks").status_code == 200
+
+    def test_route_rules_and_exempt_paths(self, backend):
+        """Test that prefixed routes use their own bucket and exempt paths are never limited."""
+        client = make_client(backend)
+
+        assert client.get("/auth/login").status_code == 200
+        assert client.get("/auth/login").status_code == 429
+        assert client.get("/tasks").status_code == 200
+        assert all(client.get("/health").status_code == 200 for _ in range(5))
+
+    def test_tenant_bucket_shared_across_clients(self, clock):
+        """Test that a tenant's bucket is shared by every client sending its X-Tenant-Id."""
+        client = make_client(InMemoryRateLimitBackend(clock=clock), client_limits={"default": 100})
+        headers = {"X-Tenant-Id": "acme"}
+
+        statuses = [client.get("/tasks", headers=headers).status_code for _ in range(4)]
+
+        assert statuses == [200, 200, 200, 429]
+        assert client.get("/tasks", headers={"X-Tenant-Id": "other"}).status_code == 200
+        assert client.get("/tasks").status_code == 200
@@ -0,0 +1,248 @@
+# Tests for the gateway response cache
+import asyncio
+import httpx
+import pytest
+from starlette.testclient import TestClient
+import main
+import response_cache
+from response_cache import CachedResponse, ResponseCache, etag_matches, storable_ttl
+
+
+@pytest.fixture
+def cache(clock, monkeypatch):
+    monkeypatch.setattr(response_cache.time, "monotonic", clock)
+    return ResponseCache(max_bytes=1000, max_entry_bytes=400)
+
+
+def entry(body: bytes = b"x" * 100, ttl: float = 60.0, **headers) -> CachedResponse:
+    return CachedResponse(200, {"content-type": "text/plain", **headers}, body, ttl)
+
+
+class TestStorableTtl:
+    @pytest.mark.parametrize("headers, ttl", [
+        ({}, 30.0),
+        ({"cache-control": "public, max-age=120"}, 120.0),
+        ({"cache-control": "max-age=120, s-maxage=10"}, 10.0),
+        ({"cache-control": 'max-age="45"'}, 45.0),
+        ({"cache-control": "max-age=0"}, None),
+        ({"cache-control": "max-age=soon"}, None),
+        ({"cache-control": "no-store"}, None),
+        ({"cache-control": "No-Cache"}, None),
+        ({"cache-control": "private, max-age=60"}, None),
+        ({"set-cookie": "session=1"}, None),
+        ({"content-encoding": "gzip"}, None),
+        ({"vary": "Accept-Encoding"}, 30.0),
+        ({"vary": "Accept-Encoding, Origin"}, None),
+        ({"vary": "Authorization"}, None),
+        ({"vary": "*"}, None),
+    ])
+    def test_cache_control(self, headers, ttl):
+        """Test which upstream responses may be stored and for how long."""
+        assert storable_ttl(headers, default_ttl=30.0) == ttl
+
+    def test_no_default(self):
+        """Test that without Cache-Control or a route default nothing is stored."""
+        assert storable_ttl({}, default_ttl=None) is None
+
+
+class TestCachedResponse:
+    def test_etag_synthesized(self):
+        """Test that a response without an ETag gets a stable strong one from its body."""
+        assert entry().etag == entry().etag
+        assert entry().etag != entry(b"y" * 100).etag
+        assert entry(etag='"v1"').etag == '"v1"'
+
+    @pytest.mark.parametrize("if_none_match, matches", [
+        ('"v1"', True),
+        ('W/"v1"', True),
+        ('"v0", "v1"', True),
+        ("*", True),
+        ('"v2"', False),
+    ])
+    def test_etag_matches(self, if_none_match, matches):
+        """Test weak comparison of If-None-Match against an ETag."""
+        assert etag_matches(if_none_match, '"v1"') is matches
+
+    def test_not_modified(self):
+        """Test that a matching If-None-Match gets a bodyless 304 with the validators."""
+        cached = entry(etag='"v1"', **{"cache-control": "max-age=60", "x-upstream": "a"})
+
+        response = cached.to_response('"v1"', "HIT")
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == '"v1"'
+        assert response.headers["cache-control"] == "max-age=60"
+        assert response.headers["x-cache"] == "HIT"
+        assert "x-upstream" not in response.headers
+
+    def test_full_response(self):
+        """Test that a stale or missing If-None-Match gets the stored body."""
+        cached = entry(etag='"v1"')
+
+        response = cached.to_response('"v0"', "MISS")
+
+        assert response.status_code == 200
+        assert response.body == b"x" * 100
+        assert response.headers["x-cache"] == "MISS"
+
+    def test_compressed_variant_has_weak_etag(self):
+        """Test that a compressed copy is served with a weak ETag, which still revalidates."""
+        cached = CachedResponse(200, {"etag": '"v1"'}, b"x" * 100, 60.0, compressible=True)
+        cached.variants["gzip"] = b"gz"
+
+        response = cached.to_response(None, "HIT", "gzip")
+
+        assert response.body == b"gz"
+        assert response.headers["etag"] == 'W/"v1"'
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert cached.to_response('W/"v1"', "HIT", "gzip").status_code == 304
+
+
+class TestResponseCache:
+    def test_expiry(self, cache, clock):
+        """Test that entries are dropped once their TTL has passed."""
+        cache.put("k", entry(ttl=10))
+
+        clock.advance(9.9)
+        assert cache.get("k") is not None
+        clock.advance(0.1)
+
+        assert cache.get("k") is None
+        assert cache.current_bytes == 0
+
+    def test_lru_eviction_by_bytes(self, cache):
+        """Test that the least recently used entries go once the byte budget is exceeded."""
+        size = entry().size
+        keys = [f"k{i}" for i in range(1000 // size)]
+        for key in keys:
+            cache.put(key, entry())
+        cache.get(keys[0])
+
+        cache.put("new", entry())
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.get("new") is not None
+        assert cache.current_bytes <= cache.max_bytes
+
+    def test_oversized_entry_not_stored(self, cache):
+        """Test that an entry over max_entry_bytes is never stored."""
+        cache.put("big", entry(b"x" * 500))
+
+        assert cache.get("big") is None
+        assert cache.current_bytes == 0
+
+    def test_replacing_entry_keeps_byte_count(self, cache):
+        """Test that storing a key twice counts it once."""
+        cache.put("k", entry())
+        cache.put("k", entry())
+
+        assert cache.current_bytes == entry().size
+
+    async def test_concurrent_misses_fetch_once(self, cache):
+        """Test that concurrent misses for one key share a single fetch."""
+        release = asyncio.Event()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await release.wait()
+            stored = entry()
+            cache.put("k", stored)
+            return stored, None
+
+        waiters = [asyncio.create_task(cache.get_or_fetch("k", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert len(calls) == 1
+        assert sorted(status for _, _, status in results) == ["HIT"] * 4 + ["MISS"]
+        assert len({id(stored) for stored, _, _ in results}) == 1
+        assert cache.stats() == {"entries": 1, "bytes": entry().size, "hits": 0, "misses": 1, "coalesced": 4}
+        assert (await cache.get_or_fetch("k", fetch))[2] == "HIT"
+        assert len(calls) == 1
+
+    async def test_uncacheable_fetch_not_shared(self, cache):
+        """Test that waiters on an uncacheable fetch get nothing and must make their own request."""
+        release = asyncio.Event()
+        uncached = object()
+
+        async def fetch():
+            await release.wait()
+            return None, uncached
+
+        first = asyncio.create_task(cache.get_or_fetch("k", fetch))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get_or_fetch("k", fetch))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await first == (None, uncached, "MISS")
+        assert await second == (None, None, "HIT")
+
+    async def test_failed_fetch_releases_waiters(self, cache):
+        """Test that an exception in the fetch does not leave waiters or the key stuck."""
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            raise httpx.ConnectError("refused")
+
+        first = asyncio.create_task(cache.get_or_fetch("k", fetch))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get_or_fetch("k", fetch))
+        await asyncio.sleep(0)
+        release.set()
+
+        with pytest.raises(httpx.ConnectError):
+            await first
+        assert await second == (None, None, "HIT")
+        assert cache._in_flight == {}
+
+
+class TestGatewayCaching:
+    """Requests through the gateway app against a fake notification_service"""
+
+    @pytest.fixture
+    def gateway(self, monkeypatch):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            body = f"response {len(calls)} for {request.headers.get('authorization') or request.headers.get('cookie')}"
+            return httpx.Response(200, headers={"cache-control": "max-age=60"}, stream=httpx.ByteStream(body.encode()))
+
+        pool = main.service_pools["notification_service"]
+        monkeypatch.setattr(pool, "client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        monkeypatch.setattr(main, "response_cache", ResponseCache(max_bytes=1 << 20, max_entry_bytes=1 << 16))
+        return TestClient(main.app), calls
+
+    def test_anonymous_gets_shared(self, gateway):
+        """Test that anonymous GETs are served from the cache and revalidate with ETags."""
+        client, calls = gateway
+
+        first = client.get("/notifications/feed")
+        second = client.get("/notifications/feed")
+        revalidated = client.get("/notifications/feed", headers={"If-None-Match": first.headers["etag"]})
+
+        assert len(calls) == 1
+        assert [first.headers["x-cache"], second.headers["x-cache"]] == ["MISS", "HIT"]
+        assert second.text == first.text
+        assert revalidated.status_code == 304
+
+    @pytest.mark.parametrize("credential", ["Authorization", "Cookie"])
+    def test_credentialed_requests_never_shared(self, gateway, credential):
+        """Test that requests with credentials neither read nor fill the shared cache."""
+        client, calls = gateway
+
+        alice = client.get("/notifications/feed", headers={credential: "alice"})
+        bob = client.get("/notifications/feed", headers={credential: "bob"})
+        anonymous = client.get("/notifications/feed")
+
+        assert len(calls) == 3
+        assert "alice" in alice.text and "x-cache" not in alice.headers
+        assert "bob" in bob.text and "x-cache" not in bob.headers
+        assert "alice" not in anonymous.text and "bob" not in anonymous.text
+        assert anonymous.headers["x-cache"] == "MISS"
@@ -0,0 +1,117 @@
+# Tests for upstream service pools
+import httpx
+import pytest
+import config
+import upstreams
+from upstreams import HealthChecker, ServicePool
+
+
+@pytest.fixture
+def pool(clock, monkeypatch):
+    monkeypatch.setattr(upstreams.time, "monotonic", clock)
+    settings = config.service_settings({"urls": ["http://a:8000", "http://b:8000", "http://c:8000"]})
+    return ServicePool("svc", settings, ejection_threshold=3, ejection_seconds=30.0)
+
+
+def instance(pool, name):
+    return next(i for i in pool.instances if i.url == f"http://{name}:8000")
+
+
+def probe_client(statuses):
+    """An AsyncClient answering each instance's health check with statuses[host]"""
+    def handler(request):
+        status = statuses[request.url.host]
+        if status is None:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(status, json={"status": "healthy" if status < 400 else "unhealthy"})
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestServicePool:
+    def test_missing_settings_use_defaults(self):
+        """Test that a service configured with only urls gets every other setting."""
+        pool = ServicePool("svc", config.service_settings({"urls": ["http://a:8000"]}), 3, 30.0)
+
+        assert pool.settings["pool_timeout"] == config.SERVICE_DEFAULTS["pool_timeout"]
+        assert pool.settings["retries"] == config.SERVICE_DEFAULTS["retries"]
+        assert pool.health_endpoint == "/health"
+
+    def test_picks_less_loaded_instance(self, pool, monkeypatch):
+        """Test that of the two sampled instances the one with fewer requests in flight wins."""
+        monkeypatch.setattr(upstreams.random, "sample", lambda candidates, k: candidates[:k])
+        busy = pool.acquire()
+        assert busy.instance is instance(pool, "a")
+
+        lease = pool.acquire()
+
+        assert lease.instance is instance(pool, "b")
+        assert [i.outstanding for i in pool.instances] == [1, 1, 0]
+        lease.release()
+        lease.release()
+        assert instance(pool, "b").outstanding == 0
+
+    def test_skips_unavailable_instances(self, pool, clock):
+        """Test that unhealthy and ejected instances are never picked while another is up."""
+        instance(pool, "a").healthy = False
+        instance(pool, "b").ejected_until = clock() + 10
+
+        picked = {pool.acquire().instance.url for _ in range(20)}
+
+        assert picked == {"http://c:8000"}
+
+    def test_ejects_after_consecutive_failures(self, pool, clock):
+        """Test that an instance is ejected after the threshold and re-admitted once it elapses."""
+        b = instance(pool, "b")
+        pool.record_failure(b)
+        pool.record_success(b)
+        pool.record_failure(b)
+        pool.record_failure(b)
+        assert b.is_available(clock())
+
+        pool.record_failure(b)
+
+        assert not b.is_available(clock())
+        assert b.consecutive_failures == 0
+        clock.advance(30)
+        assert b.is_available(clock())
+
+    def test_every_instance_down(self, pool):
+        """Test that with nothing available requests still spread over every instance."""
+        for i in pool.instances:
+            i.healthy = False
+
+        picked = {pool.acquire().instance.url for _ in range(50)}
+
+        assert picked == {"http://a:8000", "http://b:8000", "http://c:8000"}
+
+
+class TestHealthChecker:
+    async def test_probe_marks_down_and_recovers(self, pool):
+        """Test that failed probes take an instance out and a passing probe brings it back."""
+        statuses = {"a": 200, "b": None, "c": 503}
+        pool.client = probe_client(statuses)
+        checker = HealthChecker({"svc": pool}, interval=10.0, timeout=1.0)
+
+        for i in pool.instances:
+            await checker.probe(pool, i)
+        assert [i.healthy for i in pool.instances] == [True, False, False]
+        assert {pool.acquire().instance.url for _ in range(10)} == {"http://a:8000"}
+
+        statuses.update(b=200, c=200)
+        for i in pool.instances:
+            await checker.probe(pool, i)
+
+        assert all(i.healthy for i in pool.instances)
+        await pool.close()
+
+    async def test_unhealthy_body(self, pool):
+        """Test that a 200 reporting status unhealthy counts as down."""
+        def handler(request):
+            return httpx.Response(200, json={"status": "unhealthy"})
+        pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        checker = HealthChecker({"svc": pool}, interval=10.0, timeout=1.0)
+
+        await checker.probe(pool, instance(pool, "a"))
+
+        assert not instance(pool, "a").healthy
+        await pool.close()
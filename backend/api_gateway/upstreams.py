@@ -0,0 +1,192 @@
+"""
+Upstream service pools for the Taskly API Gateway
+Power-of-two-choices balancing with active health checks and passive ejection
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamInstance:
+    """One replica of a service and its load/health bookkeeping"""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.healthy = True
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+    def is_available(self, now: float) -> bool:
+        return self.healthy and self.ejected_until <= now
+
+    def status(self) -> dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "ejected": self.ejected_until > time.monotonic(),
+            "outstanding": self.outstanding
+        }
+
+
+class Lease:
+    """An in-flight request against an instance; release() is safe to call more than once"""
+
+    __slots__ = ("instance", "released")
+
+    def __init__(self, instance: UpstreamInstance):
+        self.instance = instance
+        self.released = False
+        instance.outstanding += 1
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.instance.outstanding -= 1
+
+
+class ServicePool:
+    """Replicas of one service, picked by power-of-two-choices on outstanding requests"""
+
+    def __init__(
+        self,
+        name: str,
+        settings: dict,
+        ejection_threshold: int,
+        ejection_seconds: float
+    ):
+        if not settings["urls"]:
+            raise ValueError(f"Service '{name}' has no upstream instances")
+        self.name = name
+        self.settings = settings
+        self.instances = [UpstreamInstance(url) for url in settings["urls"]]
+        self.health_endpoint = settings["health_endpoint"]
+        self.ejection_threshold = ejection_threshold
+        self.ejection_seconds = ejection_seconds
+        self.client: Optional[httpx.AsyncClient] = None
+        self.requests_total = 0
+        self.pool_timeouts = 0
+
+    def open(self):
+        """Create this service's own connection pool"""
+        settings = self.settings
+        http2 = settings["http2"]
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings["timeout"], pool=settings["pool_timeout"]),
+            limits=httpx.Limits(
+                max_connections=settings["max_connections"],
+                max_keepalive_connections=settings["max_keepalive_connections"],
+                keepalive_expiry=settings["keepalive_expiry"]
+            ),
+            # Plain-http upstreams only speak HTTP/2 with prior knowledge (h2c)
+            http1=not http2,
+            http2=http2,
+            follow_redirects=True
+        )
+
+    async def close(self):
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+    def connection_stats(self) -> dict:
+        """Connection pool usage, for sizing max_connections/max_keepalive_connections"""
+        stats = {
+            "max_connections": self.settings["max_connections"],
+            "max_keepalive_connections": self.settings["max_keepalive_connections"],
+            "http2": self.settings["http2"],
+            "in_flight": sum(instance.outstanding for instance in self.instances),
+            "requests_total": self.requests_total,
+            "pool_timeouts": self.pool_timeouts
+        }
+        # httpx exposes no public pool API; read httpcore's pool when it is there
+        connections = getattr(getattr(getattr(self.client, "_transport", None), "_pool", None), "connections", None)
+        if connections is not None:
+            stats["open_connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for connection in connections if connection.is_idle())
+        return stats
+
+    def acquire(self) -> Lease:
+        """Lease the less loaded of two random available instances"""
+        self.requests_total += 1
+        now = time.monotonic()
+        candidates = [i for i in self.instances if i.is_available(now)]
+        if not candidates:
+            # Every instance looks down: keep trying all of them rather than failing outright
+            candidates = self.instances
+        if len(candidates) == 1:
+            return Lease(candidates[0])
+        first, second = random.sample(candidates, 2)
+        return Lease(first if first.outstanding <= second.outstanding else second)
+
+    def record_success(self, instance: UpstreamInstance):
+        instance.consecutive_failures = 0
+
+    def record_failure(self, instance: UpstreamInstance):
+        """Count a 5xx or connection error, ejecting the instance after too many in a row"""
+        instance.consecutive_failures += 1
+        if instance.consecutive_failures >= self.ejection_threshold:
+            instance.ejected_until = time.monotonic() + self.ejection_seconds
+            instance.consecutive_failures = 0
+            logger.warning(f"⚠️ Ejected {instance.url} from {self.name} for {self.ejection_seconds}s")
+
+    def status(self) -> List[dict]:
+        return [instance.status() for instance in self.instances]
+
+
+def build_service_pools(services: Dict[str, dict], ejection_threshold: int, ejection_seconds: float) -> Dict[str, ServicePool]:
+    """Create one ServicePool per entry of config.SERVICES"""
+    return {
+        name: ServicePool(name, settings, ejection_threshold, ejection_seconds)
+        for name, settings in services.items()
+    }
+
+
+class HealthChecker:
+    """Background task probing every instance's health endpoint"""
+
+    def __init__(self, pools: Dict[str, ServicePool], interval: float, timeout: float):
+        self.pools = pools
+        self.interval = interval
+        self.timeout = timeout
+        self._task: Optional[asyncio.Task] = None
+
+    async def probe(self, pool: ServicePool, instance: UpstreamInstance):
+        try:
+            response = await pool.client.get(f"{instance.url}{pool.health_endpoint}", timeout=self.timeout)
+            healthy = response.status_code < 400
+            if healthy and response.headers.get("content-type", "").startswith("application/json"):
+                healthy = response.json().get("status") != "unhealthy"
+        except (httpx.HTTPError, ValueError):
+            healthy = False
+
+        if healthy != instance.healthy:
+            logger.info(f"{'✅' if healthy else '❌'} {pool.name} instance {instance.url} is {'healthy' if healthy else 'unhealthy'}")
+        instance.healthy = healthy
+
+    async def run(self):
+        while True:
+            await asyncio.gather(*(
+                self.probe(pool, instance)
+                for pool in self.pools.values()
+                for instance in pool.instances
+            ))
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
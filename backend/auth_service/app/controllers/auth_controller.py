@@ -1,26 +1,147 @@
 # app/controllers/auth_controller.py
-from fastapi import APIRouter, Depends, HTTPException, Header
+import asyncio
+import logging
+import orjson
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from fastapi.responses import Response, StreamingResponse
 from app.usecases.auth_usecase import AuthUsecase
-from app.usecases.dtos import RegisterDTO, LoginDTO, TokenResponse
+from app.usecases.dtos import RegisterDTO, BulkRegisterDTO, LoginDTO, RefreshDTO, LogoutDTO, IntrospectBatchDTO, TokenResponse
+from app.infra.unit_of_work import SQLAlchemyUnitOfWork, get_unit_of_work
 from app.infra.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from app.controllers.dependencies import (
+    get_token_claims, internal_service_required, load_principals, rbac_required, token_claims
+)
+from app.security.password_hasher import PasswordHasherBusyError
+
+# NDJSON lines sent per chunk by /users
+LIST_FLUSH_ROWS = 200
+# Tokens verified by /introspect/batch between yields to the event loop
+INTROSPECT_YIELD_EVERY = 100
 
 router = APIRouter()
-user_repo = SQLAlchemyUserRepository()
-auth_uc = AuthUsecase(user_repo)
+logger = logging.getLogger(__name__)
+
+def get_auth_usecase(uow: SQLAlchemyUnitOfWork = Depends(get_unit_of_work)) -> AuthUsecase:
+    """AuthUsecase bound to the request's unit of work"""
+    return AuthUsecase(uow.users, uow=uow, token_repo=uow.tokens)
+
+def busy(e: PasswordHasherBusyError) -> HTTPException:
+    return HTTPException(status_code=503, detail="server busy, retry later", headers={"Retry-After": str(e.retry_after)})
 
 @router.post("/register", response_model=TokenResponse)
-async def register(dto: RegisterDTO):
+async def register(dto: RegisterDTO, auth_uc: AuthUsecase = Depends(get_auth_usecase)):
     try:
         user = await auth_uc.register(dto.username, dto.password, dto.tenant_id, dto.roles)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    token = await auth_uc.issue_token(user)
-    return {"access_token": token}
+    except PasswordHasherBusyError as e:
+        raise busy(e)
+    return await auth_uc.issue_tokens(user)
+
+@router.post("/register/bulk")
+async def bulk_register(dto: BulkRegisterDTO, admin = Depends(rbac_required(["admin"]))):
+    """Create many users in the admin's tenant, streaming one NDJSON result per row"""
+    async def results():
+        # The stream outlives the request's dependencies, so it gets its own unit of work
+        async with SQLAlchemyUnitOfWork() as uow:
+            auth_uc = AuthUsecase(uow.users, uow=uow)
+            try:
+                async for chunk in auth_uc.bulk_register(admin.tenant_id, dto.users):
+                    yield b"".join(orjson.dumps(row) + b"\n" for row in chunk)
+            except Exception:
+                # Earlier chunks are committed; rows not reported were not created
+                logger.exception("bulk registration aborted")
+                yield orjson.dumps({"status": "error", "detail": "bulk registration aborted"}) + b"\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@router.get("/users")
+async def list_users(
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    admin = Depends(rbac_required(["admin"]))
+):
+    """Users of the admin's tenant in id order as NDJSON; pass the last id as `after` to resume"""
+    async def lines():
+        # No unit of work: each keyset page uses a short session, so a slow client
+        # does not hold a pooled connection or a transaction open for the whole listing
+        auth_uc = AuthUsecase(SQLAlchemyUserRepository())
+        buffer = []
+        try:
+            async for user in auth_uc.list_users(admin.tenant_id, after, limit):
+                buffer.append(orjson.dumps(user) + b"\n")
+                if len(buffer) >= LIST_FLUSH_ROWS:
+                    yield b"".join(buffer)
+                    buffer = []
+        except Exception:
+            logger.exception("user listing aborted")
+            buffer.append(orjson.dumps({"status": "error", "detail": "user listing aborted"}) + b"\n")
+        if buffer:
+            yield b"".join(buffer)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers={"Cache-Control": "no-store"})
 
 @router.post("/login", response_model=TokenResponse)
-async def login(dto: LoginDTO):
-    user = await auth_uc.authenticate(dto.username, dto.password, dto.tenant_id)
+async def login(dto: LoginDTO, auth_uc: AuthUsecase = Depends(get_auth_usecase)):
+    try:
+        user = await auth_uc.authenticate(dto.username, dto.password, dto.tenant_id)
+    except PasswordHasherBusyError as e:
+        raise busy(e)
     if not user:
         raise HTTPException(status_code=401, detail="invalid credentials")
-    token = await auth_uc.issue_token(user)
-    return {"access_token": token}
+    return await auth_uc.issue_tokens(user)
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(dto: RefreshDTO, auth_uc: AuthUsecase = Depends(get_auth_usecase)):
+    """New access and refresh tokens for a refresh token, which stops working; no password involved"""
+    tokens = await auth_uc.refresh(dto.refresh_token)
+    if not tokens:
+        raise HTTPException(status_code=401, detail="invalid refresh token")
+    return tokens
+
+@router.post("/logout", status_code=204)
+async def logout(
+    dto: LogoutDTO,
+    claims: Dict[str, Any] = Depends(get_token_claims),
+    auth_uc: AuthUsecase = Depends(get_auth_usecase)
+):
+    """Revoke the bearer token, and the refresh token's whole family when one is given"""
+    await auth_uc.logout(claims, dto.refresh_token)
+    return Response(status_code=204)
+
+@router.post("/introspect/batch", dependencies=[Depends(internal_service_required)])
+async def introspect_batch(dto: IntrospectBatchDTO, uow: SQLAlchemyUnitOfWork = Depends(get_unit_of_work)):
+    """Validate many access tokens for an internal service, one result per token in request order
+
+    Each token gets the checks a bearer token gets on /me, but the users behind
+    all of them are loaded together: from the principal cache, then one query
+    per tenant for the rest.
+    """
+    checked: List[Tuple[Optional[Dict[str, Any]], Optional[str]]] = []
+    for number, token in enumerate(dto.tokens, start=1):
+        try:
+            checked.append((token_claims(token), None))
+        except HTTPException as e:
+            checked.append((None, e.detail))
+        if number % INTROSPECT_YIELD_EVERY == 0:
+            await asyncio.sleep(0)  # let other requests run during a large batch
+
+    keys = [(claims.get("tenant_id"), claims.get("sub")) for claims, _ in checked if claims]
+    users = await load_principals(uow.users, [key for key in keys if None not in key])
+    results = []
+    for claims, error in checked:
+        user = users.get((claims.get("tenant_id"), claims.get("sub"))) if claims else None
+        if user is None:
+            results.append({"active": False, "error": error or "user not found"})
+            continue
+        results.append({
+            "active": True,
+            "sub": user.id,
+            "username": user.username,
+            "tenant_id": user.tenant_id,
+            "roles": list(user.role_names),
+            "exp": claims.get("exp"),
+            "jti": claims.get("jti")
+        })
+    return {"results": results}
@@ -0,0 +1,98 @@
+# app/controllers/dependencies.py
+import hmac
+import os
+from fastapi import Depends, Header, HTTPException
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.domain.models import UserRecord
+from app.interfaces.user_repository import IUserRepository
+from app.security.jwt_manager import verify_token
+from app.infra.principal_cache import principal_cache
+from app.infra.revocation_list import revocation_list
+from app.infra.unit_of_work import SQLAlchemyUnitOfWork, get_unit_of_work
+
+# Let rbac_required authorize from the token's roles without loading the user.
+# Role changes and deleted users then only take effect when the token expires.
+TRUST_TOKEN_CLAIMS = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() == "true"
+
+# Shared secret internal services send as X-Internal-Token; unset disables internal-only endpoints
+INTERNAL_SERVICE_TOKEN = os.getenv("INTERNAL_SERVICE_TOKEN", "")
+
+security = HTTPBearer()
+
+async def internal_service_required(x_internal_token: Optional[str] = Header(None)):
+    if not INTERNAL_SERVICE_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_internal_token or not hmac.compare_digest(x_internal_token.encode(), INTERNAL_SERVICE_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="invalid internal token")
+
+def token_claims(token: str) -> Dict[str, Any]:
+    """Claims of a valid, unrevoked token; HTTPException(401) otherwise"""
+    try:
+        payload = verify_token(token)
+    except Exception as e:
+        raise HTTPException(status_code=401, detail="invalid token")
+    # Checked here rather than in get_current_user so trusted-claims routes honour it too
+    if revocation_list.is_revoked(payload.get("jti")):
+        raise HTTPException(status_code=401, detail="token revoked")
+    return payload
+
+async def get_token_claims(
+    creds: HTTPAuthorizationCredentials = Depends(security),
+    x_tenant_id: str = Header(...)
+) -> Dict[str, Any]:
+    payload = token_claims(creds.credentials)
+    # check tenant
+    token_tenant = payload.get("tenant_id")
+    if token_tenant != x_tenant_id:
+        raise HTTPException(status_code=403, detail="token tenant mismatch")
+    return payload
+
+async def get_current_user(
+    payload: Dict[str, Any] = Depends(get_token_claims),
+    uow: SQLAlchemyUnitOfWork = Depends(get_unit_of_work)
+):
+    user_id, tenant_id = payload.get("sub"), payload.get("tenant_id")
+    user = principal_cache.get(tenant_id, user_id)
+    if user:
+        return user
+    generation = principal_cache.generation
+    user = await uow.users.get_by_id_and_tenant(user_id, tenant_id)
+    if not user:
+        raise HTTPException(status_code=401, detail="user not found")
+    principal_cache.put(user, generation)
+    return user
+
+async def load_principals(users: IUserRepository, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], UserRecord]:
+    """Users by (tenant_id, user_id), from the principal cache or one IN query per tenant for the rest"""
+    found, missing = {}, {}
+    for tenant_id, user_id in set(keys):
+        user = principal_cache.get(tenant_id, user_id)
+        if user:
+            found[(tenant_id, user_id)] = user
+        else:
+            missing.setdefault(tenant_id, []).append(user_id)
+    generation = principal_cache.generation
+    for tenant_id, user_ids in missing.items():
+        for user_id, user in (await users.get_many_by_ids_and_tenant(user_ids, tenant_id)).items():
+            found[(tenant_id, user_id)] = user
+            principal_cache.put(user, generation)
+    return found
+
+async def get_token_principal(payload: Dict[str, Any] = Depends(get_token_claims)) -> UserRecord:
+    """The user as the token describes them, without a database lookup"""
+    return UserRecord(
+        id=payload.get("sub"),
+        username=payload.get("username"),
+        password_hash="",
+        tenant_id=payload.get("tenant_id"),
+        role_names=UserRecord.intern_roles(payload.get("roles", ()))
+    )
+
+def rbac_required(allowed_roles: List[str], trust_claims: bool = TRUST_TOKEN_CLAIMS):
+    principal = get_token_principal if trust_claims else get_current_user
+    async def checker(user = Depends(principal)):
+        if not any(r in allowed_roles for r in user.role_names):
+            raise HTTPException(status_code=403, detail="forbidden")
+        return user
+    return checker
@@ -0,0 +1,7 @@
+# app/domain/exceptions.py
+
+class UserAlreadyExistsError(ValueError):
+    """A user with this username already exists in the tenant"""
+
+    def __init__(self):
+        super().__init__("username already exists for tenant")
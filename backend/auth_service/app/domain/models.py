@@ -1,5 +1,6 @@
 # app/domain/models.py
-from typing import List, Optional
+from sys import intern
+from typing import Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 
 @dataclass
@@ -7,14 +8,57 @@ class Tenant:
     id: str
     name: Optional[str] = None
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Role:
     name: str  # ex: "admin", "user", "billing"
 
-@dataclass
+@dataclass(slots=True)
 class User:
     id: str
     username: str
     password_hash: str
     tenant_id: str
     roles: List[Role]
+
+    @property
+    def role_names(self) -> Tuple[str, ...]:
+        return tuple(r.name for r in self.roles)
+
+@dataclass(frozen=True, slots=True)
+class UserRecord:
+    """A stored user as read back by the repository
+
+    Immutable, so one instance can be cached and shared between requests.
+    Role names are interned: every record holding "admin" points at the same string.
+    """
+    id: str
+    username: str
+    password_hash: str
+    tenant_id: str
+    role_names: Tuple[str, ...] = ()
+
+    @property
+    def roles(self) -> Tuple[Role, ...]:
+        return tuple(Role(name=name) for name in self.role_names)
+
+    @staticmethod
+    def intern_roles(names: Iterable[str]) -> Tuple[str, ...]:
+        return tuple(intern(name) for name in names)
+
+@dataclass(frozen=True, slots=True)
+class RefreshToken:
+    """A stored refresh token; tokens from one login share a family_id
+
+    expires_at and access_expires_at are Unix times. replaced_by is the id of
+    the token it was exchanged for, if it has been.
+    """
+    id: str
+    family_id: str
+    user_id: str
+    tenant_id: str
+    token_hash: str
+    expires_at: int
+    access_jti: str
+    access_expires_at: int
+    replaced_by: Optional[str] = None
+    revoked: bool = False
@@ -1,15 +1,35 @@
 # app/entrypoints/rest.py
-from fastapi import FastAPI, Depends, Header, HTTPException, Security
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import FastAPI, Depends, Header
+from typing import Optional
+from fastapi.responses import ORJSONResponse, Response
+from taskly_common.access_log import configure_logging
+from taskly_common.asgi import AccessLogMiddleware
 from app.controllers.auth_controller import router as auth_router
-from app.security.jwt_manager import verify_token
-from app.infra.db import init_db, sync_engine
-from app.interfaces.user_repository import IUserRepository
-from app.infra.sqlalchemy_user_repository import SQLAlchemyUserRepository
-from typing import List
+from app.controllers.dependencies import get_current_user, rbac_required
+from app.infra.db import init_db, async_engine
+from app.infra.tracing import RequestProfileMiddleware, configure_tracing
+from app.infra.metrics import registry
+from app.infra.revocation_list import REVOCATION_SYNC_SECONDS, revocation_list
+from app.infra.sqlalchemy_token_repository import SQLAlchemyTokenRepository
+from app.security.password_hasher import context_settings, password_hasher
+from app.security.argon2_tuning import MAX_MEMORY_MIB, PARALLELISM, TARGET_MS, calibrate
+from app.security.jwt_manager import JWKS_MAX_AGE, JWT_KEY_REFRESH_SECONDS, key_ring
 from sqlalchemy import text
+import asyncio
+import logging
+import os
+import time
 
-app = FastAPI(title="AuthService - Clean Architecture Example")
+# Seconds between deletions of expired refresh tokens and revocations
+TOKEN_PURGE_SECONDS = 3600
+
+configure_logging()
+configure_tracing()
+
+app = FastAPI(title="AuthService - Clean Architecture Example", default_response_class=ORJSONResponse)
+# Added first so it runs inside the access log and can add its numbers to the record
+app.add_middleware(RequestProfileMiddleware)
+app.add_middleware(AccessLogMiddleware)
 app.include_router(auth_router, prefix="/auth")
 
 @app.get("/")
@@ -21,43 +41,64 @@ async def root():
         "status": "running",
         "endpoints": {
             "health": "/health",
+            "metrics": "/metrics",
+            "jwks": "/.well-known/jwks.json",
             "auth": "/auth",
             "docs": "/docs",
             "openapi": "/openapi.json"
         }
     }
 
-security = HTTPBearer()
-user_repo = SQLAlchemyUserRepository()
+@app.on_event("startup")
+async def startup():
+    # create tables
+    await init_db()
+    if os.getenv("ARGON2_CALIBRATE", "false").lower() == "true":
+        await calibrate_password_hashing()
+    if key_ring is not None:
+        app.state.key_refresh = asyncio.create_task(refresh_signing_keys())
+    # Load every live revocation before serving, then follow new ones
+    await revocation_list.sync(SQLAlchemyTokenRepository())
+    app.state.revocation_sync = asyncio.create_task(sync_revocations())
 
-async def get_current_user(creds: HTTPAuthorizationCredentials = Depends(security), x_tenant_id: str = Header(...)):
-    token = creds.credentials
-    try:
-        payload = verify_token(token)
-    except Exception as e:
-        raise HTTPException(status_code=401, detail="invalid token")
-    # check tenant
-    token_tenant = payload.get("tenant_id")
-    if token_tenant != x_tenant_id:
-        raise HTTPException(status_code=403, detail="token tenant mismatch")
-    user_id = payload.get("sub")
-    user = await user_repo.get_by_id_and_tenant(user_id, x_tenant_id)
-    if not user:
-        raise HTTPException(status_code=401, detail="user not found")
-    return user
+async def refresh_signing_keys():
+    """Pick up new key files, or rotate in-memory keys, for as long as the app runs"""
+    while True:
+        await asyncio.sleep(JWT_KEY_REFRESH_SECONDS)
+        try:
+            await asyncio.to_thread(key_ring.refresh)
+        except Exception:
+            # Keep signing with the keys already loaded
+            logging.getLogger(__name__).exception("signing key refresh failed")
 
-def rbac_required(allowed_roles: List[str]):
-    async def checker(user = Depends(get_current_user)):
-        user_roles = [r.name for r in user.roles]
-        if not any(r in allowed_roles for r in user_roles):
-            raise HTTPException(status_code=403, detail="forbidden")
-        return user
-    return checker
+async def sync_revocations():
+    """Follow revocations made on other replicas, and purge expired tokens now and then"""
+    tokens = SQLAlchemyTokenRepository()
+    last_purge = time.monotonic()
+    while True:
+        await asyncio.sleep(REVOCATION_SYNC_SECONDS)
+        try:
+            await revocation_list.sync(tokens)
+            if time.monotonic() - last_purge >= TOKEN_PURGE_SECONDS:
+                await tokens.purge_expired(int(time.time()))
+                last_purge = time.monotonic()
+        except Exception:
+            # Keep serving with the revocations already loaded
+            logging.getLogger(__name__).exception("revocation sync failed")
 
-@app.on_event("startup")
-async def startup():
-    # create sqlite tables
-    init_db()
+async def calibrate_password_hashing():
+    """Benchmark this host and switch argon2 to the costs that meet the latency target"""
+    params = await asyncio.to_thread(calibrate, TARGET_MS, MAX_MEMORY_MIB * 1024, PARALLELISM)
+    password_hasher.configure(context_settings(params["memory_cost"], params["time_cost"], params["parallelism"]))
+    logging.getLogger(__name__).info("argon2 calibrated", extra={"fields": params})
+
+@app.on_event("shutdown")
+async def shutdown():
+    for task in ("key_refresh", "revocation_sync"):
+        if getattr(app.state, task, None) is not None:
+            getattr(app.state, task).cancel()
+    password_hasher.shutdown()
+    await async_engine.dispose()
 
 # exemplo de rota protegida
 @app.get("/admin-only")
@@ -66,15 +107,15 @@ async def admin_only(user = Depends(rbac_required(["admin"])), x_tenant_id: str
 
 @app.get("/me")
 async def me(user = Depends(get_current_user)):
-    return {"id": user.id, "username": user.username, "roles": [r.name for r in user.roles], "tenant_id": user.tenant_id}
+    return {"id": user.id, "username": user.username, "roles": list(user.role_names), "tenant_id": user.tenant_id}
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     try:
         # Check database connection
-        with sync_engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         
         return {
             "status": "healthy",
@@ -90,3 +131,19 @@ async def health_check():
             "database": "disconnected",
             "error": str(e)
         }
+
+@app.get("/.well-known/jwks.json")
+async def jwks(if_none_match: Optional[str] = Header(None)):
+    """Public keys for verifying access tokens offline; empty while tokens are HS256"""
+    headers = {"Cache-Control": f"public, max-age={JWKS_MAX_AGE}"}
+    if key_ring is None:
+        return ORJSONResponse({"keys": []}, headers=headers)
+    headers["ETag"] = key_ring.etag
+    if if_none_match == key_ring.etag:
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(key_ring.jwks(), headers=headers)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return Response(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,7 +1,9 @@
 # app/infra/db.py
 import os
+from contextlib import asynccontextmanager
+from typing import Callable, Optional
 from sqlalchemy import (
-    create_engine, MetaData, Table, Column, String, ForeignKey, JSON, select
+    MetaData, Table, Column, String, ForeignKey, JSON, Index, Boolean, select, event
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import registry, relationship
@@ -9,7 +11,14 @@ from sqlalchemy import Integer
 from sqlalchemy.sql import func
 from sqlalchemy import Text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+import asyncio
+import time
+from alembic import command
+from alembic.config import Config
+from app.infra.metrics import registry as metrics_registry, DB_POOL_CHECKOUTS, DB_POOL_WAIT, DB_POOL_TIMEOUTS, DB_POOL_CONNECTIONS
 
 # PostgreSQL configuration
 DB_USER = os.getenv("DB_USER", "taskly_user")
@@ -21,23 +30,98 @@ DB_NAME = os.getenv("DB_NAME", "auth_service")
 # Async PostgreSQL URL
 DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-# Sync PostgreSQL URL for migrations
-SYNC_DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Engine / pool configuration
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"  # Logs every statement; debugging only
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))  # Seconds to wait for a free connection
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds; -1 disables
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))  # 0 disables
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "100"))  # 0 disables
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkouts and how long each waited for a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        DB_POOL_CHECKOUTS.inc()
+        DB_POOL_WAIT.observe(time.perf_counter() - started)
+        return connection
 
 # Async engine
-async_engine = create_async_engine(DATABASE_URL, echo=True)
+async_engine = create_async_engine(
+    DATABASE_URL,
+    echo=DB_ECHO,
+    poolclass=InstrumentedPool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    pool_recycle=DB_POOL_RECYCLE,
+    connect_args={
+        "prepared_statement_cache_size": DB_PREPARED_STATEMENT_CACHE_SIZE,
+        "server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+    }
+)
 
-# Sync engine for migrations
-sync_engine = create_engine(SYNC_DATABASE_URL)
+def collect_pool_metrics():
+    """Refresh pool gauges at scrape time"""
+    pool = async_engine.pool
+    DB_POOL_CONNECTIONS.set(pool.checkedout(), "checked_out")
+    DB_POOL_CONNECTIONS.set(pool.checkedin(), "idle")
+    DB_POOL_CONNECTIONS.set(max(0, pool.overflow()), "overflow")
+
+metrics_registry.add_collector(collect_pool_metrics)
 
 # Async session
 AsyncSessionLocal = sessionmaker(
     async_engine, class_=AsyncSession, expire_on_commit=False
 )
 
-# Sync session (for migrations)
-from sqlalchemy.orm import sessionmaker as sync_sessionmaker
-SessionLocal = sync_sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+# Session.info key for callbacks waiting on the current transaction
+AFTER_COMMIT_CALLBACKS = "after_commit_callbacks"
+
+def on_commit(session: AsyncSession, callback: Callable[[], None]):
+    """Run callback once the session's current transaction commits; a rollback drops it"""
+    session.sync_session.info.setdefault(AFTER_COMMIT_CALLBACKS, []).append(callback)
+
+@event.listens_for(Session, "after_commit")
+def _run_commit_callbacks(session: Session):
+    for callback in session.info.pop(AFTER_COMMIT_CALLBACKS, ()):
+        callback()
+
+@event.listens_for(Session, "after_rollback")
+def _drop_commit_callbacks(session: Session):
+    session.info.pop(AFTER_COMMIT_CALLBACKS, None)
+
+class SQLAlchemyRepository:
+    """Base for repositories that run inside a unit of work or on their own sessions"""
+
+    def __init__(self, session: Optional[AsyncSession] = None):
+        self._AsyncSession = AsyncSessionLocal
+        # Set when the repository belongs to a unit of work, which then owns commit/rollback
+        self._session = session
+
+    @asynccontextmanager
+    async def _session_scope(self, write: bool = False):
+        """The unit of work's session, or a short-lived one committed after a write"""
+        if self._session is not None:
+            yield self._session
+            return
+        async with self._AsyncSession() as session:
+            try:
+                yield session
+                if write:
+                    await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
 
 Base = declarative_base()
 
@@ -49,24 +133,77 @@ user_roles = Table(
     Base.metadata,
     Column("user_id", String, ForeignKey("users.id"), primary_key=True),
     Column("role_name", String, ForeignKey("roles.name"), primary_key=True),
+    # Role fan-out; the primary key only serves lookups by user_id
+    Index("ix_user_roles_role_name", "role_name", "user_id"),
 )
 
 class UserORM(Base):
     __tablename__ = "users"
-    id = Column(String, primary_key=True, index=True)
-    username = Column(String, index=True)
+    # Every lookup is tenant-scoped; schema changes go through migrations/ (alembic)
+    __table_args__ = (
+        Index(
+            "ix_users_tenant_id_username", "tenant_id", "username", unique=True,
+            postgresql_include=["id", "password_hash"]
+        ),
+        Index("ix_users_tenant_id_id", "tenant_id", "id", unique=True, postgresql_include=["username"]),
+    )
+    id = Column(String, primary_key=True)
+    username = Column(String)
     password_hash = Column(String)
-    tenant_id = Column(String, index=True)
+    tenant_id = Column(String)
     roles = relationship("RoleORM", secondary=user_roles, back_populates="users")
 
 class RoleORM(Base):
     __tablename__ = "roles"
-    name = Column(String, primary_key=True, index=True)
+    name = Column(String, primary_key=True)
     users = relationship("UserORM", secondary=user_roles, back_populates="roles")
 
-def init_db():
-    """Initialize database tables using sync engine"""
-    Base.metadata.create_all(bind=sync_engine)
+class RefreshTokenORM(Base):
+    """One refresh token; rotation chains tokens of the same login into a family"""
+    __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        Index("ix_refresh_tokens_family_id", "family_id"),
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+    )
+    id = Column(String, primary_key=True)
+    family_id = Column(String, nullable=False)
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    tenant_id = Column(String, nullable=False)
+    # SHA-256 of the token's secret part; the secret itself is never stored
+    token_hash = Column(String, nullable=False)
+    expires_at = Column(Integer, nullable=False)  # Unix time
+    # The access token issued alongside, revoked with the family
+    access_jti = Column(String, nullable=False)
+    access_expires_at = Column(Integer, nullable=False)
+    # Set when the token is exchanged; presenting it again revokes the family
+    replaced_by = Column(String)
+    revoked = Column(Boolean, nullable=False, default=False)
+
+class RevokedTokenORM(Base):
+    """Revoked access token ids; replicas sync new rows by ascending id"""
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        Index("ix_revoked_tokens_jti", "jti", unique=True),
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    jti = Column(String, nullable=False)
+    expires_at = Column(Integer, nullable=False)  # The token's exp; the row is useless after it
+
+MIGRATIONS_CONFIG = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini"))
+
+def run_migrations(url: str = None):
+    """Upgrade the database to the latest migration (blocking; alembic upgrade head)"""
+    config = Config(MIGRATIONS_CONFIG)
+    if url:
+        config.set_main_option("sqlalchemy.url", url)
+    # Keep the service's logging setup
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+async def init_db():
+    """Bring the schema up to date; migrations drive their own event loop, so run them in a thread"""
+    await asyncio.to_thread(run_migrations)
 
 async def get_async_session():
     """Get async database session"""
@@ -0,0 +1,59 @@
+# app/infra/metrics.py
+"""
+The auth service's Prometheus instruments, built on taskly_common.metrics
+"""
+
+from taskly_common.metrics import LATENCY_BUCKETS, Counter, Gauge, Histogram, Registry
+
+# Token decoding takes tens to hundreds of microseconds
+DECODE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+# Request stages range from token checks (microseconds) to argon2 (hundreds of milliseconds)
+STAGE_BUCKETS = DECODE_BUCKETS[:6] + LATENCY_BUCKETS
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+registry = Registry()
+
+PASSWORD_HASH_DURATION = registry.register(Histogram(
+    "auth_password_hash_duration_seconds", "Time spent hashing or verifying a password in a worker", ("operation",)))
+PASSWORD_HASH_WAIT = registry.register(Histogram(
+    "auth_password_hash_wait_seconds", "Time a password operation waited for a free worker", ("operation",)))
+PASSWORD_HASH_IN_FLIGHT = registry.register(Gauge(
+    "auth_password_hash_in_flight", "Password operations queued or running"))
+PASSWORD_HASH_REJECTED = registry.register(Counter(
+    "auth_password_hash_rejected_total", "Password operations refused because the worker queue was full", ("operation",)))
+
+DB_POOL_CHECKOUTS = registry.register(Counter(
+    "auth_db_pool_checkouts_total", "Connections checked out of the database pool"))
+DB_POOL_WAIT = registry.register(Histogram(
+    "auth_db_pool_wait_seconds", "Time to check out a database connection, including waiting for one and connecting"))
+DB_POOL_TIMEOUTS = registry.register(Counter(
+    "auth_db_pool_timeouts_total", "Checkouts that gave up waiting for a database connection"))
+DB_POOL_CONNECTIONS = registry.register(Gauge(
+    "auth_db_pool_connections", "Database pool connections by state", ("state",)))
+
+PRINCIPAL_CACHE_LOOKUPS = registry.register(Counter(
+    "auth_principal_cache_lookups_total", "Authenticated user lookups served from the in-process cache or not", ("result",)))
+PRINCIPAL_CACHE_ENTRIES = registry.register(Gauge(
+    "auth_principal_cache_entries", "Users held in the in-process principal cache"))
+
+JWT_VERIFY_CACHE_LOOKUPS = registry.register(Counter(
+    "auth_jwt_verify_cache_lookups_total", "Access token verifications served from the in-process memo or not", ("result",)))
+JWT_VERIFY_CACHE_ENTRIES = registry.register(Gauge(
+    "auth_jwt_verify_cache_entries", "Verified access tokens held in the in-process memo"))
+JWT_DECODE_DURATION = registry.register(Histogram(
+    "auth_jwt_decode_duration_seconds", "Time to verify and decode an access token that missed the memo",
+    ("backend", "algorithm"), buckets=DECODE_BUCKETS))
+
+REVOKED_TOKENS = registry.register(Gauge(
+    "auth_revoked_tokens", "Unexpired revoked access tokens held in the in-process revocation list"))
+REVOKED_TOKEN_REJECTIONS = registry.register(Counter(
+    "auth_revoked_token_rejections_total", "Requests refused because their access token was revoked"))
+
+AUTH_STAGE_DURATION = registry.register(Histogram(
+    "auth_stage_duration_seconds", "Time spent in each traced stage of a request", ("stage",), buckets=STAGE_BUCKETS))
+DB_QUERY_DURATION = registry.register(Histogram(
+    "auth_db_query_duration_seconds", "Time to execute one SQL statement on behalf of a request", buckets=STAGE_BUCKETS))
+REQUEST_DB_QUERIES = registry.register(Histogram(
+    "auth_request_db_queries", "SQL statements executed per request", ("route",), buckets=QUERY_COUNT_BUCKETS))
+REQUEST_DB_DURATION = registry.register(Histogram(
+    "auth_request_db_seconds", "Time spent executing SQL statements per request", ("route",), buckets=STAGE_BUCKETS))
@@ -0,0 +1,69 @@
+# app/infra/principal_cache.py
+"""
+In-process cache of authenticated users, keyed by (tenant_id, user_id)
+
+get_current_user would otherwise load the user and their roles on every
+protected request. Entries live for a few seconds at most and the cache is
+bounded (least recently used entries go first). Writes that change a user
+invalidate the entry once their transaction commits, so this replica sees
+the change immediately and other replicas within the TTL.
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.domain.models import UserRecord
+from app.infra.metrics import registry, PRINCIPAL_CACHE_LOOKUPS, PRINCIPAL_CACHE_ENTRIES
+
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "30"))  # Seconds; 0 disables
+
+class PrincipalCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, UserRecord]]" = OrderedDict()
+        # Bumped by every invalidation, so a lookup that raced one is not cached
+        self.generation = 0
+
+    def get(self, tenant_id: str, user_id: str) -> Optional[UserRecord]:
+        key = (tenant_id, user_id)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            PRINCIPAL_CACHE_LOOKUPS.inc("miss")
+            return None
+        self._entries.move_to_end(key)
+        PRINCIPAL_CACHE_LOOKUPS.inc("hit")
+        return entry[1]
+
+    def put(self, user: UserRecord, generation: Optional[int] = None):
+        """Cache a user loaded when self.generation was `generation`, unless something changed since"""
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        key = (user.tenant_id, user.id)
+        self._entries[key] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: Optional[str] = None, user_id: Optional[str] = None):
+        """Forget one user, every user of a tenant, or everything"""
+        self.generation += 1
+        if tenant_id is None:
+            self._entries.clear()
+        elif user_id is not None:
+            self._entries.pop((tenant_id, user_id), None)
+        else:
+            for key in [key for key in self._entries if key[0] == tenant_id]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL)
+
+registry.add_collector(lambda: PRINCIPAL_CACHE_ENTRIES.set(len(principal_cache)))
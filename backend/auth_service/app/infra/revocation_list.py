@@ -0,0 +1,75 @@
+# app/infra/revocation_list.py
+"""
+In-process set of revoked access token ids (jti), synced incrementally from revoked_tokens
+
+get_token_claims checks every request against it, so a revocation check is a
+dict lookup rather than a query. A revocation made on this replica applies
+immediately; other replicas pick it up on their next sync, which reads only
+rows with an id above the last one seen. Entries are dropped once the token
+they revoke has expired, since the token's own exp then rejects it.
+
+Ids are allocated when a row is inserted but become visible when its
+transaction commits, so a row may appear after a higher id was already
+synced. Each sync therefore re-reads the rows added in the last
+SYNC_OVERLAP_SECONDS, which the short revocation transactions never outlast.
+"""
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Tuple
+from app.interfaces.token_repository import ITokenRepository
+from app.infra.metrics import registry, REVOKED_TOKENS, REVOKED_TOKEN_REJECTIONS
+
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+SYNC_OVERLAP_SECONDS = 30.0
+SYNC_BATCH_SIZE = 1000
+
+class RevocationList:
+    def __init__(self, overlap: float = SYNC_OVERLAP_SECONDS, batch_size: int = SYNC_BATCH_SIZE):
+        self.overlap = overlap
+        self.batch_size = batch_size
+        self._revoked: Dict[str, int] = {}
+        # (monotonic time, highest id synced by then), oldest first
+        self._synced: Deque[Tuple[float, int]] = deque()
+        self.max_id = 0
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if jti is not None and jti in self._revoked:
+            REVOKED_TOKEN_REJECTIONS.inc()
+            return True
+        return False
+
+    def add(self, tokens: Iterable[Tuple[str, int]]):
+        """Apply (jti, exp) revocations made on this replica without waiting for a sync"""
+        for jti, expires_at in tokens:
+            self._revoked[jti] = expires_at
+
+    def _resync_from(self, now: float) -> int:
+        """The highest id that had been synced `overlap` seconds ago; everything below it has committed"""
+        while len(self._synced) > 1 and self._synced[1][0] <= now - self.overlap:
+            self._synced.popleft()
+        if self._synced and self._synced[0][0] <= now - self.overlap:
+            return self._synced[0][1]
+        return 0
+
+    async def sync(self, tokens: ITokenRepository):
+        """Load revocations added since the last sync and forget expired ones"""
+        now = int(time.time())
+        after_id = self._resync_from(time.monotonic())
+        while True:
+            rows = await tokens.revocations_after(after_id, now, self.batch_size)
+            for row_id, jti, expires_at in rows:
+                self._revoked[jti] = expires_at
+                after_id = row_id
+            if len(rows) < self.batch_size:
+                break
+        self.max_id = max(self.max_id, after_id)
+        self._synced.append((time.monotonic(), self.max_id))
+        self._revoked = {jti: expires_at for jti, expires_at in self._revoked.items() if expires_at > now}
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+revocation_list = RevocationList()
+
+registry.add_collector(lambda: REVOKED_TOKENS.set(len(revocation_list)))
@@ -0,0 +1,37 @@
+# app/infra/role_cache.py
+"""
+In-process cache of role names known to exist in the roles table
+
+The role set is tiny and almost never changes, so create_user only upserts
+roles the cache has not seen recently. Names are cached once the transaction
+that upserted them commits; a rollback forgets them.
+"""
+import os
+import time
+from typing import Dict, Iterable, Optional, Set
+
+ROLE_CACHE_TTL = float(os.getenv("ROLE_CACHE_TTL", "300"))  # Seconds
+
+class RoleCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._expires_at: Dict[str, float] = {}
+
+    def missing(self, names: Iterable[str]) -> Set[str]:
+        """Names not known to exist (never seen, or seen longer than ttl ago)"""
+        now = time.monotonic()
+        return {name for name in names if self._expires_at.get(name, 0.0) <= now}
+
+    def add(self, names: Iterable[str]):
+        expires_at = time.monotonic() + self.ttl
+        for name in names:
+            self._expires_at[name] = expires_at
+
+    def invalidate(self, name: Optional[str] = None):
+        """Forget one role, e.g. after deleting it, or all of them"""
+        if name is None:
+            self._expires_at.clear()
+        else:
+            self._expires_at.pop(name, None)
+
+role_cache = RoleCache(ROLE_CACHE_TTL)
@@ -0,0 +1,89 @@
+# app/infra/sqlalchemy_token_repository.py
+from typing import List, Optional, Tuple
+from sqlalchemy import bindparam, delete, select, update
+from app.interfaces.token_repository import ITokenRepository
+from app.domain.models import RefreshToken
+from app.infra.db import SQLAlchemyRepository, RefreshTokenORM, RevokedTokenORM, on_commit
+from app.infra.sqlalchemy_user_repository import UPSERT_INSERTS
+from app.infra.revocation_list import revocation_list
+
+refresh_tokens = RefreshTokenORM.__table__
+revoked_tokens = RevokedTokenORM.__table__
+
+GET_REFRESH_TOKEN = select(refresh_tokens).where(refresh_tokens.c.id == bindparam("token_id"))
+REVOCATIONS_AFTER = (
+    select(revoked_tokens.c.id, revoked_tokens.c.jti, revoked_tokens.c.expires_at)
+    .where(revoked_tokens.c.id > bindparam("after_id"), revoked_tokens.c.expires_at > bindparam("now"))
+    .order_by(revoked_tokens.c.id)
+    .limit(bindparam("limit"))
+)
+
+class SQLAlchemyTokenRepository(SQLAlchemyRepository, ITokenRepository):
+    async def create_refresh_token(self, token: RefreshToken) -> None:
+        async with self._session_scope(write=True) as session:
+            await session.execute(refresh_tokens.insert().values(
+                id=token.id,
+                family_id=token.family_id,
+                user_id=token.user_id,
+                tenant_id=token.tenant_id,
+                token_hash=token.token_hash,
+                expires_at=token.expires_at,
+                access_jti=token.access_jti,
+                access_expires_at=token.access_expires_at,
+                replaced_by=token.replaced_by,
+                revoked=token.revoked
+            ))
+
+    async def get_refresh_token(self, token_id: str) -> Optional[RefreshToken]:
+        async with self._session_scope() as session:
+            row = (await session.execute(GET_REFRESH_TOKEN, {"token_id": token_id})).first()
+            return RefreshToken(**row._mapping) if row else None
+
+    async def mark_refresh_token_replaced(self, token_id: str, replaced_by: str) -> bool:
+        async with self._session_scope(write=True) as session:
+            # Conditional on the current state, so of two concurrent exchanges only one wins
+            result = await session.execute(
+                update(refresh_tokens)
+                .where(
+                    refresh_tokens.c.id == token_id,
+                    refresh_tokens.c.replaced_by.is_(None),
+                    refresh_tokens.c.revoked.is_(False)
+                )
+                .values(replaced_by=replaced_by)
+            )
+            return result.rowcount == 1
+
+    async def revoke_family(self, family_id: str, now: int) -> List[Tuple[str, int]]:
+        async with self._session_scope(write=True) as session:
+            await session.execute(
+                update(refresh_tokens).where(refresh_tokens.c.family_id == family_id).values(revoked=True)
+            )
+            result = await session.execute(
+                select(refresh_tokens.c.access_jti, refresh_tokens.c.access_expires_at).where(
+                    refresh_tokens.c.family_id == family_id,
+                    refresh_tokens.c.access_expires_at > now
+                )
+            )
+            return [tuple(row) for row in result.all()]
+
+    async def revoke_access_tokens(self, tokens: List[Tuple[str, int]]) -> None:
+        if not tokens:
+            return
+        async with self._session_scope(write=True) as session:
+            insert = UPSERT_INSERTS[session.bind.dialect.name]
+            await session.execute(
+                insert(revoked_tokens)
+                .values([{"jti": jti, "expires_at": expires_at} for jti, expires_at in tokens])
+                .on_conflict_do_nothing(index_elements=["jti"])
+            )
+            on_commit(session, lambda: revocation_list.add(tokens))
+
+    async def revocations_after(self, after_id: int, now: int, limit: int) -> List[Tuple[int, str, int]]:
+        async with self._session_scope() as session:
+            result = await session.execute(REVOCATIONS_AFTER, {"after_id": after_id, "now": now, "limit": limit})
+            return [tuple(row) for row in result.all()]
+
+    async def purge_expired(self, now: int) -> None:
+        async with self._session_scope(write=True) as session:
+            await session.execute(delete(refresh_tokens).where(refresh_tokens.c.expires_at <= now))
+            await session.execute(delete(revoked_tokens).where(revoked_tokens.c.expires_at <= now))
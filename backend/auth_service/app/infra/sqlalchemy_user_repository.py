@@ -1,78 +1,185 @@
 # app/infra/sqlalchemy_user_repository.py
 import uuid
-from typing import Optional, List
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from typing import AsyncIterator, Dict, Optional, List, Sequence, Set
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.interfaces.user_repository import IUserRepository
-from app.domain.models import User, Role
-from app.infra.db import AsyncSessionLocal, UserORM, RoleORM
+from app.domain.exceptions import UserAlreadyExistsError
+from app.domain.models import User, UserRecord
+from app.infra.db import SQLAlchemyRepository, UserORM, RoleORM, user_roles, on_commit
+from app.infra.role_cache import role_cache
+from app.infra.principal_cache import principal_cache
+from app.infra.tracing import traced
 
-class SQLAlchemyUserRepository(IUserRepository):
-    def __init__(self):
-        self._AsyncSession = AsyncSessionLocal
+# Dialects with INSERT ... ON CONFLICT support
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
 
+# Reads go through Core rather than the ORM: one query joining the user to their
+# role names, mapped straight to a UserRecord with no ORM instances in between
+users_table = UserORM.__table__
+USER_COLUMNS = (users_table.c.id, users_table.c.username, users_table.c.password_hash, users_table.c.tenant_id)
+
+def user_with_roles(*criteria):
+    return (
+        select(*USER_COLUMNS, user_roles.c.role_name)
+        .select_from(users_table.outerjoin(user_roles, user_roles.c.user_id == users_table.c.id))
+        .where(*criteria)
+        .order_by(user_roles.c.role_name)
+    )
+
+GET_BY_USERNAME = user_with_roles(users_table.c.username == bindparam("username"), users_table.c.tenant_id == bindparam("tenant_id"))
+GET_BY_ID = user_with_roles(users_table.c.id == bindparam("user_id"), users_table.c.tenant_id == bindparam("tenant_id"))
+GET_MANY_BY_IDS = user_with_roles(
+    users_table.c.id.in_(bindparam("user_ids", expanding=True)), users_table.c.tenant_id == bindparam("tenant_id")
+)
+
+def to_record(rows) -> Optional[UserRecord]:
+    """Fold one user's (user columns, role_name) rows into a UserRecord"""
+    if not rows:
+        return None
+    first = rows[0]
+    return UserRecord(
+        id=first.id, username=first.username, password_hash=first.password_hash, tenant_id=first.tenant_id,
+        role_names=UserRecord.intern_roles(row.role_name for row in rows if row.role_name is not None)
+    )
+
+# Ids per IN (...) list, within every backend's bound parameter limit
+IN_CHUNK_SIZE = 500
+
+# Rows per keyset page, and per round trip on the streaming cursor within a page
+STREAM_PAGE_SIZE = 10_000
+STREAM_BATCH_SIZE = 500
+
+class SQLAlchemyUserRepository(SQLAlchemyRepository, IUserRepository):
+    async def _ensure_roles(self, session: AsyncSession, names: Set[str]) -> None:
+        """Upsert the roles the cache does not know about, in one statement"""
+        missing = role_cache.missing(names)
+        if missing:
+            insert = UPSERT_INSERTS[session.bind.dialect.name]
+            await session.execute(
+                insert(RoleORM.__table__)
+                .values([{"name": name} for name in sorted(missing)])
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            on_commit(session, lambda: role_cache.add(missing))
+
+    @traced("db.create_user")
     async def create_user(self, user: User) -> None:
-        async with self._AsyncSession() as session:
+        async with self._session_scope(write=True) as session:
+            role_names = {r.name for r in user.roles}
+            await self._ensure_roles(session, role_names)
+            # (tenant_id, username) is unique; the insert fails right here on a
+            # duplicate and surfaces as a domain error
             try:
-                # ensure roles exist
-                role_objs = []
-                for r in user.roles:
-                    stmt = select(RoleORM).where(RoleORM.name == r.name)
-                    result = await session.execute(stmt)
-                    role = result.scalar_one_or_none()
-                    if not role:
-                        role = RoleORM(name=r.name)
-                        session.add(role)
-                    role_objs.append(role)
-
-                user_orm = UserORM(
+                await session.execute(UserORM.__table__.insert().values(
                     id=user.id,
                     username=user.username,
                     password_hash=user.password_hash,
-                    tenant_id=user.tenant_id,
-                    roles=role_objs
-                )
-                session.add(user_orm)
-                await session.commit()
-            except Exception:
-                await session.rollback()
-                raise
-
-    async def get_by_username_and_tenant(self, username: str, tenant_id: str) -> Optional[User]:
-        async with self._AsyncSession() as session:
-            stmt = select(UserORM).options(selectinload(UserORM.roles)).where(
-                UserORM.username == username, 
-                UserORM.tenant_id == tenant_id
-            )
-            result = await session.execute(stmt)
-            u = result.scalar_one_or_none()
-            if not u:
-                return None
-            roles = [Role(name=r.name) for r in u.roles]
-            return User(id=u.id, username=u.username, password_hash=u.password_hash, tenant_id=u.tenant_id, roles=roles)
-
-    async def get_by_id_and_tenant(self, user_id: str, tenant_id: str) -> Optional[User]:
-        async with self._AsyncSession() as session:
-            stmt = select(UserORM).options(selectinload(UserORM.roles)).where(
-                UserORM.id == user_id, 
-                UserORM.tenant_id == tenant_id
+                    tenant_id=user.tenant_id
+                ))
+            except IntegrityError as e:
+                raise UserAlreadyExistsError() from e
+            if role_names:
+                await session.execute(user_roles.insert().values(
+                    [{"user_id": user.id, "role_name": name} for name in sorted(role_names)]
+                ))
+
+    @traced("db.bulk_create_users")
+    async def bulk_create_users(self, users: List[User]) -> List[bool]:
+        if not users:
+            return []
+        async with self._session_scope(write=True) as session:
+            insert = UPSERT_INSERTS[session.bind.dialect.name]
+            # One statement each for (uncached) roles, users and their role links
+            await self._ensure_roles(session, {r.name for u in users for r in u.roles})
+            result = await session.execute(
+                insert(UserORM.__table__)
+                .values([
+                    {"id": u.id, "username": u.username, "password_hash": u.password_hash, "tenant_id": u.tenant_id}
+                    for u in users
+                ])
+                .on_conflict_do_nothing(index_elements=["tenant_id", "username"])
+                .returning(UserORM.__table__.c.id)
             )
-            result = await session.execute(stmt)
-            u = result.scalar_one_or_none()
-            if not u:
-                return None
-            roles = [Role(name=r.name) for r in u.roles]
-            return User(id=u.id, username=u.username, password_hash=u.password_hash, tenant_id=u.tenant_id, roles=roles)
-
-    async def list_users_by_tenant(self, tenant_id: str) -> List[User]:
-        async with self._AsyncSession() as session:
-            stmt = select(UserORM).options(selectinload(UserORM.roles)).where(
+            created = set(result.scalars().all())
+            links = [{"user_id": u.id, "role_name": r.name} for u in users if u.id in created for r in u.roles]
+            if links:
+                await session.execute(insert(user_roles).values(links).on_conflict_do_nothing())
+            return [u.id in created for u in users]
+
+    @traced("db.get_by_username_and_tenant")
+    async def get_by_username_and_tenant(self, username: str, tenant_id: str) -> Optional[UserRecord]:
+        async with self._session_scope() as session:
+            result = await session.execute(GET_BY_USERNAME, {"username": username, "tenant_id": tenant_id})
+            return to_record(result.all())
+
+    @traced("db.get_by_id_and_tenant")
+    async def get_by_id_and_tenant(self, user_id: str, tenant_id: str) -> Optional[UserRecord]:
+        async with self._session_scope() as session:
+            result = await session.execute(GET_BY_ID, {"user_id": user_id, "tenant_id": tenant_id})
+            return to_record(result.all())
+
+    @traced("db.get_many_by_ids_and_tenant")
+    async def get_many_by_ids_and_tenant(self, user_ids: Sequence[str], tenant_id: str) -> Dict[str, UserRecord]:
+        ids = sorted(set(user_ids))
+        rows_by_id: Dict[str, list] = {}
+        async with self._session_scope() as session:
+            for i in range(0, len(ids), IN_CHUNK_SIZE):
+                result = await session.execute(GET_MANY_BY_IDS, {"user_ids": ids[i:i + IN_CHUNK_SIZE], "tenant_id": tenant_id})
+                for row in result:
+                    rows_by_id.setdefault(row.id, []).append(row)
+        return {user_id: to_record(rows) for user_id, rows in rows_by_id.items()}
+
+    @traced("db.update_password_hash")
+    async def update_password_hash(self, user_id: str, tenant_id: str, password_hash: str) -> None:
+        async with self._session_scope(write=True) as session:
+            stmt = update(UserORM).where(
+                UserORM.id == user_id,
                 UserORM.tenant_id == tenant_id
+            ).values(password_hash=password_hash)
+            await session.execute(stmt)
+            on_commit(session, lambda: principal_cache.invalidate(tenant_id, user_id))
+
+    async def list_users_by_tenant(self, tenant_id: str) -> List[UserRecord]:
+        return [user async for user in self.stream_users_by_tenant(tenant_id)]
+
+    async def stream_users_by_tenant(
+        self, tenant_id: str, after_id: Optional[str] = None, limit: Optional[int] = None,
+        page_size: int = STREAM_PAGE_SIZE
+    ) -> AsyncIterator[UserRecord]:
+        """Users of a tenant in id order, fetched a page at a time (keyset on id) and
+        streamed from a server-side cursor, so memory stays flat however many there are.
+        Each page runs in its own short session unless the repository belongs to a unit of work."""
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            page = select(*USER_COLUMNS).where(users_table.c.tenant_id == tenant_id)
+            if after_id is not None:
+                page = page.where(users_table.c.id > after_id)
+            page = page.order_by(users_table.c.id).limit(size).subquery()
+            stmt = (
+                select(page, user_roles.c.role_name)
+                .select_from(page.outerjoin(user_roles, user_roles.c.user_id == page.c.id))
+                .order_by(page.c.id, user_roles.c.role_name)
+                .execution_options(yield_per=STREAM_BATCH_SIZE)
             )
-            result = await session.execute(stmt)
-            rows = result.scalars().all()
-            users = []
-            for u in rows:
-                roles = [Role(name=r.name) for r in u.roles]
-                users.append(User(id=u.id, username=u.username, password_hash=u.password_hash, tenant_id=u.tenant_id, roles=roles))
-            return users
+            fetched = 0
+            async with self._session_scope() as session:
+                # One row per (user, role): collect each user's rows, emit when the id changes
+                rows = []
+                async for row in await session.stream(stmt):
+                    if rows and row.id != rows[0].id:
+                        fetched += 1
+                        yield to_record(rows)
+                        rows = []
+                    rows.append(row)
+                if rows:
+                    fetched += 1
+                    after_id = rows[0].id
+                    yield to_record(rows)
+            if fetched < size:
+                return
+            if remaining is not None:
+                remaining -= fetched
@@ -0,0 +1,188 @@
+# app/infra/tracing.py
+"""
+Stage timing for requests: spans, per-stage latency histograms and a per-request breakdown
+
+Code marks a stage with `with span("auth.verify_password"):` (or the
+@traced decorator on a coroutine function). Every span is timed into
+auth_stage_duration_seconds and added to the current request's profile,
+and is also opened on the configured tracer. The tracer is a no-op unless
+TRACING=otel, in which case spans go to OpenTelemetry (opentelemetry-api,
+with whatever SDK and exporter the deployment sets up). set_tracer() takes
+any object with OpenTelemetry's start_as_current_span.
+
+SQLAlchemy cursor events count each request's queries and their time. With
+DEBUG_TIMING_HEADER=true, a request sent with `X-Debug-Timing: 1` gets the
+breakdown back in a Server-Timing header. It is off by default because
+stage timings (argon2 runs only for existing users) tell clients more than
+they should know.
+"""
+import functools
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.infra.metrics import AUTH_STAGE_DURATION, DB_QUERY_DURATION, REQUEST_DB_QUERIES, REQUEST_DB_DURATION
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # opentelemetry-api is optional; only TRACING=otel needs it
+    otel_trace = None
+
+DEBUG_TIMING_HEADER = os.getenv("DEBUG_TIMING_HEADER", "false").lower() == "true"
+
+class NoopTracer:
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: Optional[Dict[str, Any]] = None, **kwargs) -> Iterator[None]:
+        yield None
+
+_tracer = NoopTracer()
+
+def set_tracer(tracer) -> None:
+    global _tracer
+    _tracer = tracer
+
+def configure_tracing(backend: Optional[str] = None) -> None:
+    """Pick the tracer named by TRACING: none (default) or otel"""
+    backend = backend or os.getenv("TRACING", "none")
+    if backend == "otel":
+        if otel_trace is None:
+            raise RuntimeError("TRACING=otel needs opentelemetry-api installed")
+        set_tracer(otel_trace.get_tracer("taskly-auth-service"))
+    elif backend == "none":
+        set_tracer(NoopTracer())
+    else:
+        raise ValueError(f"unknown TRACING {backend!r}; expected none or otel")
+
+class RequestProfile:
+    """Stage timings and database work of one request"""
+    __slots__ = ("stages", "queries", "query_seconds")
+
+    def __init__(self):
+        self.stages: Dict[str, List[float]] = {}  # name -> [calls, seconds]
+        self.queries = 0
+        self.query_seconds = 0.0
+
+    def add_stage(self, name: str, seconds: float):
+        stage = self.stages.get(name)
+        if stage is None:
+            self.stages[name] = [1, seconds]
+        else:
+            stage[0] += 1
+            stage[1] += seconds
+
+    def server_timing(self) -> str:
+        """The breakdown as a Server-Timing header value, durations in milliseconds"""
+        entries = [f'db;dur={self.query_seconds * 1000:.3f};desc="{self.queries} queries"']
+        for name, (calls, seconds) in self.stages.items():
+            entry = f"{name};dur={seconds * 1000:.3f}"
+            entries.append(entry if calls == 1 else f'{entry};desc="{calls} calls"')
+        return ", ".join(entries)
+
+_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+def current_profile() -> Optional[RequestProfile]:
+    return _profile.get()
+
+@contextmanager
+def span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        with _tracer.start_as_current_span(name, attributes=attributes):
+            yield
+    finally:
+        seconds = time.perf_counter() - started
+        AUTH_STAGE_DURATION.observe(seconds, name)
+        profile = _profile.get()
+        if profile is not None:
+            profile.add_stage(name, seconds)
+
+def traced(name: str):
+    """Run a coroutine function inside span(name)"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Only statements run on behalf of a request are counted; background work and
+# migrations (which run in another thread) have no profile and are skipped
+@event.listens_for(Engine, "before_cursor_execute")
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    if _profile.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    profile = _profile.get()
+    started = conn.info.get("query_started")
+    if profile is None or not started:
+        return
+    seconds = time.perf_counter() - started.pop()
+    DB_QUERY_DURATION.observe(seconds)
+    profile.queries += 1
+    profile.query_seconds += seconds
+
+@event.listens_for(Engine, "handle_error")
+def _query_failed(context):
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template with any router prefix, e.g. /auth/login; a small label set"""
+    route = scope.get("route")
+    if not getattr(route, "path", None):
+        return "unmatched"
+    # Depending on the FastAPI version, routes of an included router may not carry
+    # its prefix; recover it from the request path
+    try:
+        tail = route.path_format.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, AttributeError):
+        return route.path
+    path = scope["path"]
+    return path[:len(path) - len(tail)] + route.path if path.endswith(tail) else route.path
+
+class RequestProfileMiddleware:
+    """ASGI middleware giving each HTTP request a RequestProfile
+
+    Records the request's query count and database time per route, adds
+    them to the access log record, and answers `X-Debug-Timing: 1` with a
+    Server-Timing header when DEBUG_TIMING_HEADER is on.
+    """
+
+    def __init__(self, app: ASGIApp, debug_header: bool = DEBUG_TIMING_HEADER):
+        self.app = app
+        self.debug_header = debug_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _profile.set(profile)
+        wants_timing = self.debug_header and (b"x-debug-timing", b"1") in scope.get("headers", ())
+
+        async def timing_send(message: Message):
+            if wants_timing and message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timing_send)
+        finally:
+            _profile.reset(token)
+            route = route_template(scope)
+            REQUEST_DB_QUERIES.observe(profile.queries, route)
+            REQUEST_DB_DURATION.observe(profile.query_seconds, route)
+            scope.setdefault("state", {}).setdefault("access_log", {}).update(
+                {"db_queries": profile.queries, "db_ms": round(profile.query_seconds * 1000, 2)}
+            )
@@ -0,0 +1,36 @@
+# app/infra/unit_of_work.py
+from typing import AsyncIterator
+from app.interfaces.unit_of_work import IUnitOfWork
+from app.infra.db import AsyncSessionLocal
+from app.infra.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from app.infra.sqlalchemy_token_repository import SQLAlchemyTokenRepository
+
+class SQLAlchemyUnitOfWork(IUnitOfWork):
+    """One AsyncSession, and so at most one pooled connection, per unit of work"""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self._session_factory = session_factory
+
+    async def __aenter__(self):
+        self.session = self._session_factory()
+        self.users = SQLAlchemyUserRepository(self.session)
+        self.tokens = SQLAlchemyTokenRepository(self.session)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # Anything not committed explicitly is discarded
+        try:
+            await self.session.rollback()
+        finally:
+            await self.session.close()
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+async def get_unit_of_work() -> AsyncIterator[SQLAlchemyUnitOfWork]:
+    """FastAPI dependency: one unit of work per request"""
+    async with SQLAlchemyUnitOfWork() as uow:
+        yield uow
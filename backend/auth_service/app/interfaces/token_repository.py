@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from app.domain.models import RefreshToken
+
+class ITokenRepository(ABC):
+    @abstractmethod
+    async def create_refresh_token(self, token: RefreshToken) -> None:
+        pass
+
+    @abstractmethod
+    async def get_refresh_token(self, token_id: str) -> Optional[RefreshToken]:
+        pass
+
+    @abstractmethod
+    async def mark_refresh_token_replaced(self, token_id: str, replaced_by: str) -> bool:
+        """Record the exchange unless the token was already exchanged or revoked; False if it was"""
+        pass
+
+    @abstractmethod
+    async def revoke_family(self, family_id: str, now: int) -> List[Tuple[str, int]]:
+        """Revoke every refresh token of a family; returns the (jti, exp) of their unexpired access tokens"""
+        pass
+
+    @abstractmethod
+    async def revoke_access_tokens(self, tokens: List[Tuple[str, int]]) -> None:
+        """Add (jti, exp) pairs to the revocation list; already revoked ones are skipped"""
+        pass
+
+    @abstractmethod
+    async def revocations_after(self, after_id: int, now: int, limit: int) -> List[Tuple[int, str, int]]:
+        """(id, jti, exp) of unexpired revocations with id > after_id, in id order"""
+        pass
+
+    @abstractmethod
+    async def purge_expired(self, now: int) -> None:
+        """Delete refresh tokens and revocations that expired before now"""
+        pass
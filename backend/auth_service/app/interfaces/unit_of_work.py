@@ -0,0 +1,17 @@
+# app/interfaces/unit_of_work.py
+from abc import ABC, abstractmethod
+from app.interfaces.token_repository import ITokenRepository
+from app.interfaces.user_repository import IUserRepository
+
+class IUnitOfWork(ABC):
+    """One transaction shared by every repository used while handling a request"""
+    users: IUserRepository
+    tokens: ITokenRepository
+
+    @abstractmethod
+    async def commit(self) -> None:
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        pass
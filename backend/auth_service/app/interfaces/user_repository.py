@@ -1,7 +1,7 @@
 # app/interfaces/user_repository.py
 from abc import ABC, abstractmethod
-from typing import Optional, List
-from app.domain.models import User
+from typing import AsyncIterator, Dict, Optional, List, Sequence
+from app.domain.models import User, UserRecord
 
 class IUserRepository(ABC):
     @abstractmethod
@@ -9,13 +9,34 @@ class IUserRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_by_username_and_tenant(self, username: str, tenant_id: str) -> Optional[User]:
+    async def bulk_create_users(self, users: List[User]) -> List[bool]:
+        """Insert many users at once, skipping taken usernames; True for each user created"""
         pass
 
     @abstractmethod
-    async def get_by_id_and_tenant(self, user_id: str, tenant_id: str) -> Optional[User]:
+    async def get_by_username_and_tenant(self, username: str, tenant_id: str) -> Optional[UserRecord]:
         pass
 
     @abstractmethod
-    async def list_users_by_tenant(self, tenant_id: str) -> List[User]:
+    async def get_by_id_and_tenant(self, user_id: str, tenant_id: str) -> Optional[UserRecord]:
+        pass
+
+    @abstractmethod
+    async def get_many_by_ids_and_tenant(self, user_ids: Sequence[str], tenant_id: str) -> Dict[str, UserRecord]:
+        """The tenant's users among user_ids, by id; ids not found are left out"""
+        pass
+
+    @abstractmethod
+    async def update_password_hash(self, user_id: str, tenant_id: str, password_hash: str) -> None:
+        pass
+
+    @abstractmethod
+    async def list_users_by_tenant(self, tenant_id: str) -> List[UserRecord]:
+        pass
+
+    @abstractmethod
+    def stream_users_by_tenant(
+        self, tenant_id: str, after_id: Optional[str] = None, limit: Optional[int] = None
+    ) -> AsyncIterator[UserRecord]:
+        """Users of a tenant in id order, starting after after_id, yielded as they are read"""
         pass
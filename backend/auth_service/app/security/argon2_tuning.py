@@ -0,0 +1,87 @@
+# app/security/argon2_tuning.py
+"""
+Argon2 cost calibration
+
+Picks argon2id parameters for this host: the largest memory cost within the
+budget, then as many passes as fit in the target verify latency. Run it once
+per hardware class and pin the output in the environment:
+
+    python -m app.security.argon2_tuning --target-ms 250 --max-memory-mib 64
+
+or set ARGON2_CALIBRATE=true to calibrate at startup. Replicas on different
+hardware would then pick different parameters and rehash each other's
+hashes on login, so pinned values are preferred in production.
+"""
+import argparse
+import os
+import statistics
+import time
+from typing import Dict
+
+from argon2.low_level import Type, hash_secret_raw
+
+# OWASP's floor for argon2id memory cost
+MIN_MEMORY_KIB = 19 * 1024
+MAX_TIME_COST = 10
+
+TARGET_MS = float(os.getenv("ARGON2_TARGET_MS", "250"))
+MAX_MEMORY_MIB = int(os.getenv("ARGON2_MAX_MEMORY_MIB", "64"))
+PARALLELISM = int(os.getenv("ARGON2_PARALLELISM") or 0) or min(os.cpu_count() or 1, 4)
+
+
+def measure(memory_cost: int, time_cost: int, parallelism: int, samples: int = 3) -> float:
+    """Median milliseconds to hash (and so to verify) one password with these parameters"""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hash_secret_raw(
+            b"calibration password", os.urandom(16),
+            time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism,
+            hash_len=32, type=Type.ID
+        )
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, max_memory_kib: int, parallelism: int) -> Dict[str, float]:
+    """argon2id parameters whose verify latency on this host stays within target_ms"""
+    floor = min(MIN_MEMORY_KIB, max_memory_kib)
+    memory_cost = max_memory_kib
+    elapsed = measure(memory_cost, 1, parallelism)
+    # Too slow even with one pass: give up memory, down to the floor
+    while elapsed > target_ms and memory_cost > floor:
+        memory_cost = max(memory_cost // 2, floor)
+        elapsed = measure(memory_cost, 1, parallelism)
+
+    time_cost = 1
+    while time_cost < MAX_TIME_COST:
+        next_elapsed = measure(memory_cost, time_cost + 1, parallelism)
+        if next_elapsed > target_ms:
+            break
+        time_cost += 1
+        elapsed = next_elapsed
+
+    return {
+        "memory_cost": memory_cost,
+        "time_cost": time_cost,
+        "parallelism": parallelism,
+        "verify_ms": round(elapsed, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate argon2id parameters for this host")
+    parser.add_argument("--target-ms", type=float, default=TARGET_MS)
+    parser.add_argument("--max-memory-mib", type=int, default=MAX_MEMORY_MIB)
+    parser.add_argument("--parallelism", type=int, default=PARALLELISM)
+    args = parser.parse_args()
+
+    params = calibrate(args.target_ms, args.max_memory_mib * 1024, args.parallelism)
+    print(f"# verify takes ~{params['verify_ms']} ms on this host (target {args.target_ms} ms)")
+    print(f"ARGON2_MEMORY_COST={params['memory_cost']}")
+    print(f"ARGON2_TIME_COST={params['time_cost']}")
+    print(f"ARGON2_PARALLELISM={params['parallelism']}")
+
+
+if __name__ == "__main__":
+    main()
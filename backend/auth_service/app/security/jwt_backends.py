@@ -0,0 +1,132 @@
+# app/security/jwt_backends.py
+"""
+Interchangeable implementations of HS256/HS384/HS512 token encoding and decoding
+
+JWT_BACKEND picks one, so libraries can be compared (benchmarks/bench_jwt_verify.py)
+and swapped without touching jwt_manager:
+
+- jose: python-jose, the default
+- pyjwt: PyJWT, when installed (`pip install pyjwt`)
+- native: hmac + orjson, with the same checks as taskly_common.jws
+
+Every backend raises jose's JWTError family, so callers handle one set of errors.
+ES256/EdDSA tokens always go through taskly_common.jws.
+"""
+import hashlib
+import hmac
+from abc import ABC, abstractmethod
+import os
+import time
+from typing import Any, Dict, Optional
+
+import orjson
+from jose import jwt as jose_jwt
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
+
+from taskly_common.jws import b64url_decode, b64url_encode
+
+try:
+    import jwt as pyjwt
+except ImportError:  # PyJWT is optional; only the pyjwt backend needs it
+    pyjwt = None
+
+HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+
+class JwtBackend(ABC):
+    name = ""
+
+    @abstractmethod
+    def encode(self, claims: Dict[str, Any], secret: str, algorithm: str) -> str:
+        pass
+
+    @abstractmethod
+    def decode(self, token: str, secret: str, algorithm: str) -> Dict[str, Any]:
+        """Verify the signature, then exp and nbf, and return the claims"""
+        pass
+
+
+class JoseBackend(JwtBackend):
+    name = "jose"
+
+    def encode(self, claims: Dict[str, Any], secret: str, algorithm: str) -> str:
+        return jose_jwt.encode(claims, secret, algorithm=algorithm)
+
+    def decode(self, token: str, secret: str, algorithm: str) -> Dict[str, Any]:
+        return jose_jwt.decode(token, secret, algorithms=[algorithm])
+
+
+class PyJWTBackend(JwtBackend):
+    name = "pyjwt"
+
+    def __init__(self):
+        if pyjwt is None:
+            raise RuntimeError("JWT_BACKEND=pyjwt needs PyJWT installed")
+
+    def encode(self, claims: Dict[str, Any], secret: str, algorithm: str) -> str:
+        return pyjwt.encode(claims, secret, algorithm=algorithm)
+
+    def decode(self, token: str, secret: str, algorithm: str) -> Dict[str, Any]:
+        try:
+            return pyjwt.decode(token, secret, algorithms=[algorithm], options={"verify_aud": False})
+        except pyjwt.ExpiredSignatureError as e:
+            raise ExpiredSignatureError(str(e)) from e
+        except pyjwt.ImmatureSignatureError as e:
+            raise JWTClaimsError(str(e)) from e
+        except pyjwt.PyJWTError as e:
+            raise JWTError(str(e)) from e
+
+
+class NativeBackend(JwtBackend):
+    name = "native"
+
+    def encode(self, claims: Dict[str, Any], secret: str, algorithm: str) -> str:
+        header = {"alg": algorithm, "typ": "JWT"}
+        signing_input = f"{b64url_encode(orjson.dumps(header))}.{b64url_encode(orjson.dumps(claims))}"
+        return f"{signing_input}.{b64url_encode(self._sign(secret, algorithm, signing_input.encode()))}"
+
+    def decode(self, token: str, secret: str, algorithm: str, now: Optional[float] = None) -> Dict[str, Any]:
+        try:
+            signing_input, _, signature = token.rpartition(".")
+            header_segment, _, payload_segment = signing_input.partition(".")
+            header = orjson.loads(b64url_decode(header_segment))
+            signature = b64url_decode(signature)
+        except (ValueError, orjson.JSONDecodeError) as e:
+            raise JWTError("malformed token") from e
+        if not isinstance(header, dict) or header.get("alg") != algorithm:
+            raise JWTError("token algorithm does not match")
+        if not hmac.compare_digest(signature, self._sign(secret, algorithm, signing_input.encode())):
+            raise JWTError("signature verification failed")
+
+        try:
+            claims = orjson.loads(b64url_decode(payload_segment))
+        except (ValueError, orjson.JSONDecodeError) as e:
+            raise JWTError("malformed token payload") from e
+        if not isinstance(claims, dict):
+            raise JWTError("malformed token payload")
+        now = time.time() if now is None else now
+        try:
+            if "exp" in claims and not float(claims["exp"]) > now:
+                raise ExpiredSignatureError("signature has expired")
+            if "nbf" in claims and float(claims["nbf"]) > now:
+                raise JWTClaimsError("the token is not yet valid")
+        except (TypeError, ValueError) as e:
+            raise JWTClaimsError("exp and nbf must be numeric dates") from e
+        return claims
+
+    @staticmethod
+    def _sign(secret: str, algorithm: str, data: bytes) -> bytes:
+        digest = HMAC_DIGESTS.get(algorithm)
+        if digest is None:
+            raise JWTError(f"unsupported algorithm: {algorithm}")
+        return hmac.new(secret.encode(), data, digest).digest()
+
+
+BACKENDS = {backend.name: backend for backend in (JoseBackend, PyJWTBackend, NativeBackend)}
+
+
+def get_backend(name: Optional[str] = None) -> JwtBackend:
+    name = name or os.getenv("JWT_BACKEND", "jose")
+    if name not in BACKENDS:
+        raise ValueError(f"unknown JWT_BACKEND {name!r}; expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
@@ -1,25 +1,86 @@
 # app/security/jwt_manager.py
-from jose import jwt, JWTError
+import calendar
+import os
+import time
+import uuid
+from jose import JWTError
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
+from taskly_common import jws
+from app.infra.metrics import JWT_DECODE_DURATION
+from app.infra.tracing import span
+from app.security.jwt_backends import get_backend
+from app.security.key_ring import KeyRing
+from app.security.token_cache import token_cache
 
-SECRET_KEY = "CHANGE_ME_TO_A_STRONG_SECRET"
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60
+SECRET_KEY = os.getenv("JWT_SECRET_KEY", "CHANGE_ME_TO_A_STRONG_SECRET")
+# HS256 (shared secret), or ES256 / EdDSA (key ring, public keys served as a JWKS)
+ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+# Also accepted when verifying, e.g. HS256 for a while after switching to ES256
+ACCEPTED_ALGORITHMS = {ALGORITHM} | {a.strip() for a in os.getenv("JWT_ACCEPTED_ALGORITHMS", "").split(",") if a.strip()}
+# Short, since refresh tokens (app/security/refresh_tokens.py) renew them without a password
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_MINUTES", "15"))
+# jose (default), pyjwt or native; encodes and decodes the HS* tokens
+backend = get_backend()
+
+JWT_KEYS_DIR = os.getenv("JWT_KEYS_DIR") or None
+# Development only: without JWT_KEYS_DIR each replica would sign with keys of its own
+JWT_EPHEMERAL_KEYS = os.getenv("JWT_EPHEMERAL_KEYS", "false").lower() == "true"
+JWT_KEY_ROTATION_SECONDS = float(os.getenv("JWT_KEY_ROTATION_SECONDS", str(7 * 24 * 3600)))
+JWT_KEY_REFRESH_SECONDS = float(os.getenv("JWT_KEY_REFRESH_SECONDS", "60"))  # How often the key ring reloads or rotates
+JWKS_MAX_AGE = int(os.getenv("JWKS_MAX_AGE", "300"))  # Seconds verifiers may cache the JWKS
+# Longer than verifiers may cache the JWKS, so they see a key before its tokens
+JWT_KEY_PUBLISH_AHEAD_SECONDS = float(os.getenv("JWT_KEY_PUBLISH_AHEAD_SECONDS", str(3 * JWKS_MAX_AGE)))
+
+if ALGORITHM in jws.ASYMMETRIC_ALGORITHMS and JWT_KEYS_DIR is None and not JWT_EPHEMERAL_KEYS:
+    raise RuntimeError(
+        f"JWT_ALGORITHM={ALGORITHM} needs JWT_KEYS_DIR, a key directory shared by every replica; "
+        "set JWT_EPHEMERAL_KEYS=true to generate keys in memory for local development"
+    )
+
+key_ring = KeyRing(
+    ALGORITHM,
+    JWT_KEYS_DIR,
+    rotate_every=JWT_KEY_ROTATION_SECONDS,
+    publish_ahead=JWT_KEY_PUBLISH_AHEAD_SECONDS,
+    # A superseded key stays published until the last token it signed expires
+    retain=ACCESS_TOKEN_EXPIRE_MINUTES * 60 + JWKS_MAX_AGE
+) if ALGORITHM in jws.ASYMMETRIC_ALGORITHMS else None
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    if "exp" not in to_encode:
+        if expires_delta:
+            expire = datetime.utcnow() + expires_delta
+        else:
+            expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        to_encode["exp"] = calendar.timegm(expire.utctimetuple())
+    # jti identifies the token when it has to be revoked or dropped from the memo
+    to_encode.setdefault("jti", uuid.uuid4().hex)
+    with span("jwt.encode", {"jwt.algorithm": ALGORITHM}):
+        if key_ring is not None:
+            key = key_ring.signing_key
+            return jws.encode(to_encode, key.private_key, key.kid)
+        return backend.encode(to_encode, SECRET_KEY, ALGORITHM)
 
 def verify_token(token: str) -> Dict[str, Any]:
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    payload = token_cache.get(token)
+    if payload is not None:
         return payload
-    except JWTError as e:
-        raise e
+    header = jws.unverified_header(token)
+    algorithm = header.get("alg")
+    if algorithm not in ACCEPTED_ALGORITHMS:
+        raise JWTError(f"token algorithm {algorithm} is not accepted")
+    started = time.perf_counter()
+    with span("jwt.decode", {"jwt.algorithm": algorithm}):
+        if algorithm in jws.ASYMMETRIC_ALGORITHMS:
+            key = key_ring.get(header.get("kid")) if key_ring is not None else None
+            if key is None:
+                raise JWTError("unknown signing key")
+            payload = jws.decode(token, key.public_key)
+            JWT_DECODE_DURATION.observe(time.perf_counter() - started, "jws", algorithm)
+        else:
+            payload = backend.decode(token, SECRET_KEY, algorithm)
+            JWT_DECODE_DURATION.observe(time.perf_counter() - started, backend.name, algorithm)
+    token_cache.put(token, payload)
+    return payload
@@ -0,0 +1,160 @@
+# app/security/key_ring.py
+"""
+Rotating asymmetric signing keys for access tokens
+
+Keys move through three states, all derived from their creation time:
+
+- published: in the JWKS but not yet signing, for `publish_ahead` seconds,
+  so verifiers that cached the previous JWKS learn the key before they
+  see tokens signed with it
+- active: the newest published key signs every new token
+- retired: dropped from the JWKS `retain` seconds after its successor took
+  over, by which time every token it signed has expired
+
+With JWT_KEYS_DIR set the ring reads PEM private keys from that directory
+(mount the same secret on every replica) and rotation means adding a file:
+
+    python -m app.security.key_ring generate --dir /run/secrets/jwt-keys --algorithm ES256
+
+Without it the ring generates and rotates keys in memory. Every replica
+then has its own keys, which only suits local development with a single
+replica, so the service refuses to start that way unless JWT_EPHEMERAL_KEYS
+is set.
+"""
+import argparse
+import os
+import time
+from typing import Dict, List, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from taskly_common.jws import ASYMMETRIC_ALGORITHMS, PrivateKey, algorithm_for, public_jwk, thumbprint
+
+
+class SigningKey:
+    __slots__ = ("private_key", "public_key", "algorithm", "kid", "jwk", "created_at")
+
+    def __init__(self, private_key: PrivateKey, created_at: float):
+        self.private_key = private_key
+        self.public_key = private_key.public_key()
+        self.algorithm = algorithm_for(private_key)
+        jwk = public_jwk(self.public_key)
+        self.kid = thumbprint(jwk)
+        self.jwk = {**jwk, "kid": self.kid, "alg": self.algorithm, "use": "sig"}
+        self.created_at = created_at
+
+    def to_pem(self) -> bytes:
+        return self.private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+
+
+def generate_key(algorithm: str, created_at: Optional[float] = None) -> SigningKey:
+    if algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    elif algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        raise ValueError(f"unsupported signing algorithm: {algorithm}")
+    return SigningKey(private_key, time.time() if created_at is None else created_at)
+
+
+def load_keys(directory: str) -> List[SigningKey]:
+    """Every *.pem in directory; files named <unix time>.pem date from then, others from their mtime"""
+    keys = []
+    for name in os.listdir(directory):
+        stem, extension = os.path.splitext(name)
+        if extension != ".pem":
+            continue
+        path = os.path.join(directory, name)
+        with open(path, "rb") as f:
+            private_key = serialization.load_pem_private_key(f.read(), password=None)
+        created_at = float(stem) if stem.isdigit() else os.path.getmtime(path)
+        keys.append(SigningKey(private_key, created_at))
+    return keys
+
+
+class KeyRing:
+    def __init__(
+        self,
+        algorithm: str,
+        directory: Optional[str] = None,
+        rotate_every: float = 7 * 24 * 3600,
+        publish_ahead: float = 900,
+        retain: float = 3600
+    ):
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"unsupported signing algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.directory = directory
+        self.rotate_every = rotate_every
+        self.publish_ahead = publish_ahead
+        self.retain = retain
+        self._keys: List[SigningKey] = []
+        self._by_kid: Dict[str, SigningKey] = {}
+        self._active: Optional[SigningKey] = None
+        self._jwks: dict = {"keys": []}
+        self.etag = ""
+        self.refresh()
+
+    def refresh(self, now: Optional[float] = None):
+        """Reload or rotate keys and recompute which one signs; call periodically"""
+        now = time.time() if now is None else now
+        if self.directory is not None:
+            keys = [key for key in load_keys(self.directory) if key.algorithm == self.algorithm]
+            if not keys:
+                raise RuntimeError(f"no {self.algorithm} signing keys in {self.directory}")
+        else:
+            keys = list(self._keys)
+            # Create the successor early enough that it is published for publish_ahead first
+            if not keys or keys[-1].created_at + self.rotate_every - self.publish_ahead <= now:
+                keys.append(generate_key(self.algorithm, now))
+        keys.sort(key=lambda key: key.created_at)
+
+        matured = [key for key in keys if key.created_at + self.publish_ahead <= now]
+        # A brand new ring signs with its first key straight away
+        active = matured[-1] if matured else keys[0]
+        published = []
+        for key, successor in zip(keys, keys[1:] + [None]):
+            if key is not active and successor is not None and successor.created_at <= active.created_at:
+                # Superseded: keep it while tokens it signed may still be valid
+                if successor.created_at + self.publish_ahead + self.retain <= now:
+                    continue
+            published.append(key)
+
+        self._keys = published
+        self._by_kid = {key.kid: key for key in published}
+        self._active = active
+        self._jwks = {"keys": [key.jwk for key in published]}
+        self.etag = f'"{thumbprint({"kids": ",".join(self._by_kid)})}"'
+
+    @property
+    def signing_key(self) -> SigningKey:
+        return self._active
+
+    def get(self, kid: Optional[str]) -> Optional[SigningKey]:
+        return self._by_kid.get(kid)
+
+    def jwks(self) -> dict:
+        return self._jwks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage access token signing keys")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="write a new private key to the key directory")
+    generate.add_argument("--dir", required=True)
+    generate.add_argument("--algorithm", choices=ASYMMETRIC_ALGORITHMS, default="ES256")
+    args = parser.parse_args()
+
+    key = generate_key(args.algorithm)
+    path = os.path.join(args.dir, f"{int(key.created_at)}.pem")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key.to_pem())
+    print(f"{path} kid={key.kid}")
+
+
+if __name__ == "__main__":
+    main()
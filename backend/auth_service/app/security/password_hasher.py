@@ -0,0 +1,164 @@
+# app/security/password_hasher.py
+"""
+Argon2 hashing off the event loop
+
+Each hash/verify costs tens of milliseconds of CPU, so it runs in a thread
+pool (argon2-cffi releases the GIL) or a process pool, with a cap on the
+operations queued for it. Past the cap callers get PasswordHasherBusyError
+instead of waiting, so a login spike turns into fast 503s rather than
+every request timing out.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.infra.metrics import (
+    PASSWORD_HASH_DURATION, PASSWORD_HASH_WAIT, PASSWORD_HASH_IN_FLIGHT, PASSWORD_HASH_REJECTED
+)
+
+HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # "thread" or "process"
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "0")) or os.cpu_count() or 1
+HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "0")) or HASH_WORKERS * 4
+
+
+def context_settings(memory_cost: int = None, time_cost: int = None, parallelism: int = None) -> dict:
+    """CryptContext settings for argon2; unset costs keep passlib's defaults"""
+    settings = {"schemes": ["argon2"], "deprecated": "auto"}
+    for name, value in (("memory_cost", memory_cost), ("rounds", time_cost), ("parallelism", parallelism)):
+        if value:
+            settings[f"argon2__{name}"] = int(value)
+    return settings
+
+
+# Costs pinned from `python -m app.security.argon2_tuning`; stored hashes with
+# other costs are rehashed on the next successful login
+CONTEXT_SETTINGS = context_settings(
+    os.getenv("ARGON2_MEMORY_COST"),
+    os.getenv("ARGON2_TIME_COST"),
+    os.getenv("ARGON2_PARALLELISM")
+)
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when too many password operations are already queued"""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("password hashing is saturated")
+        self.retry_after = retry_after
+
+
+# Set in each worker process by _init_worker
+_worker_context: Optional[CryptContext] = None
+
+
+def _init_worker(settings: dict):
+    global _worker_context
+    _worker_context = CryptContext(**settings)
+
+
+def _hash_in_worker(password: str) -> str:
+    return _worker_context.hash(password)
+
+
+def _verify_in_worker(password: str, password_hash: str) -> bool:
+    return _worker_context.verify(password, password_hash)
+
+
+def _timed(func: Callable, *args) -> Tuple[object, float]:
+    """Run func and return (result, seconds it took), measured where it ran"""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        settings: dict = CONTEXT_SETTINGS,
+        executor: str = HASH_EXECUTOR,
+        workers: int = HASH_WORKERS,
+        max_pending: int = HASH_MAX_PENDING
+    ):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"unknown password hash executor: {executor}")
+        self.settings = settings
+        self.context = CryptContext(**settings)
+        self.executor_kind = executor
+        self.workers = workers
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self._executor: Optional[Executor] = None
+
+    def configure(self, settings: dict):
+        """Switch to new argon2 settings, e.g. after calibration"""
+        self.settings = settings
+        self.context = CryptContext(**settings)
+        # Worker processes hold their own copy of the settings
+        if self.executor_kind == "process":
+            self.shutdown()
+
+    def needs_update(self, password_hash: str) -> bool:
+        """Whether a stored hash was made with different settings than the current ones"""
+        return self.context.needs_update(password_hash)
+
+    def _get_executor(self) -> Executor:
+        # Created on first use so importing the module never forks or spawns
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(
+                    self.workers, initializer=_init_worker, initargs=(self.settings,)
+                )
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="argon2")
+        return self._executor
+
+    async def _run(self, operation: str, thread_func: Callable, process_func: Callable, *args):
+        if self.in_flight >= self.max_pending:
+            PASSWORD_HASH_REJECTED.inc(operation)
+            raise PasswordHasherBusyError()
+
+        func = process_func if self.executor_kind == "process" else thread_func
+        self.in_flight += 1
+        PASSWORD_HASH_IN_FLIGHT.inc()
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, seconds = await loop.run_in_executor(self._get_executor(), _timed, func, *args)
+        finally:
+            self.in_flight -= 1
+            PASSWORD_HASH_IN_FLIGHT.dec()
+        PASSWORD_HASH_DURATION.observe(seconds, operation)
+        PASSWORD_HASH_WAIT.observe(max(0.0, time.perf_counter() - submitted - seconds), operation)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self.context.hash, _hash_in_worker, password)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """Hash a batch in parallel, one call per worker at a time so logins keep queue room"""
+        limit = asyncio.Semaphore(max(1, min(self.workers, self.max_pending // 2)))
+
+        async def hash_one(password: str) -> str:
+            async with limit:
+                while True:
+                    try:
+                        return await self.hash(password)
+                    except PasswordHasherBusyError:
+                        await asyncio.sleep(0.05)
+
+        return await asyncio.gather(*(hash_one(password) for password in passwords))
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run("verify", self.context.verify, _verify_in_worker, password, password_hash)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,35 @@
+# app/security/refresh_tokens.py
+"""
+Opaque refresh tokens: "<id>.<secret>"
+
+The id is the refresh_tokens primary key; only a SHA-256 of the secret is
+stored, so a leaked table cannot be replayed. The secret has 256 bits of
+entropy, so a plain hash is enough, and checking it costs microseconds where
+a login costs an argon2 verify.
+"""
+import hashlib
+import hmac
+import os
+import secrets
+import uuid
+from typing import Optional, Tuple
+
+REFRESH_TOKEN_EXPIRE_DAYS = float(os.getenv("JWT_REFRESH_TOKEN_DAYS", "14"))
+
+def hash_secret(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+def new_refresh_token() -> Tuple[str, str, str]:
+    """(id, token to hand to the client, hash to store)"""
+    token_id, secret = uuid.uuid4().hex, secrets.token_urlsafe(32)
+    return token_id, f"{token_id}.{secret}", hash_secret(secret)
+
+def parse_refresh_token(token: str) -> Optional[Tuple[str, str]]:
+    """(id, secret), or None if the token is malformed"""
+    token_id, _, secret = token.partition(".")
+    if not token_id or not secret:
+        return None
+    return token_id, secret
+
+def secret_matches(secret: str, token_hash: str) -> bool:
+    return hmac.compare_digest(hash_secret(secret), token_hash)
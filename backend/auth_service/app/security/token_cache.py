@@ -0,0 +1,88 @@
+# app/security/token_cache.py
+"""
+In-process memo of verified access tokens, keyed by a SHA-256 digest of the token
+
+Clients send the same token on every request until it expires, and
+verify_token would otherwise check its signature and claims each time.
+Entries live until the token's exp or the configured TTL, whichever comes
+first, and the memo is bounded (least recently used entries go first).
+Entries are indexed by jti as well, so a revoked token can be dropped
+without knowing the token itself. Cached claims are shared between
+requests and must not be modified.
+"""
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+from app.infra.metrics import registry, JWT_VERIFY_CACHE_LOOKUPS, JWT_VERIFY_CACHE_ENTRIES
+
+JWT_VERIFY_CACHE_SIZE = int(os.getenv("JWT_VERIFY_CACHE_SIZE", "10000"))
+JWT_VERIFY_CACHE_TTL = float(os.getenv("JWT_VERIFY_CACHE_TTL", "300"))  # Seconds; 0 disables
+
+class VerifiedTokenCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._by_jti: Dict[str, Set[bytes]] = {}
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self.digest(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            JWT_VERIFY_CACHE_LOOKUPS.inc("miss")
+            return None
+        self._entries.move_to_end(key)
+        JWT_VERIFY_CACHE_LOOKUPS.inc("hit")
+        return entry[1]
+
+    def put(self, token: str, claims: Dict[str, Any]):
+        """Remember claims that token was just verified to carry"""
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        lifetime = self.ttl
+        if "exp" in claims:
+            lifetime = min(lifetime, float(claims["exp"]) - time.time())
+            if lifetime <= 0:
+                return
+        key = self.digest(token)
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + lifetime, claims)
+        jti = claims.get("jti")
+        if jti is not None:
+            self._by_jti.setdefault(jti, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, jti: Optional[str] = None):
+        """Forget every token carrying jti, or everything"""
+        if jti is None:
+            self._entries.clear()
+            self._by_jti.clear()
+            return
+        for key in self._by_jti.pop(jti, ()):
+            self._entries.pop(key, None)
+
+    def _remove(self, key: bytes):
+        entry = self._entries.pop(key, None)
+        jti = entry[1].get("jti") if entry is not None else None
+        if jti is not None:
+            keys = self._by_jti.get(jti)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_jti[jti]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+token_cache = VerifiedTokenCache(JWT_VERIFY_CACHE_SIZE, JWT_VERIFY_CACHE_TTL)
+
+registry.add_collector(lambda: JWT_VERIFY_CACHE_ENTRIES.set(len(token_cache)))
@@ -1,42 +1,213 @@
 # app/usecases/auth_usecase.py
+import asyncio
+import time
 import uuid
-from passlib.context import CryptContext
-from typing import Optional
-from app.domain.models import User, Role
+from dataclasses import replace
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from app.domain.models import RefreshToken, User, UserRecord, Role
+from app.interfaces.token_repository import ITokenRepository
 from app.interfaces.user_repository import IUserRepository
-from app.security.jwt_manager import create_access_token
+from app.interfaces.unit_of_work import IUnitOfWork
+from app.security.jwt_manager import ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token
+from app.security.refresh_tokens import REFRESH_TOKEN_EXPIRE_DAYS, new_refresh_token, parse_refresh_token, secret_matches
+from app.security.token_cache import token_cache
+from app.infra.tracing import span
+from app.usecases.dtos import BulkUserDTO
+from app.security.password_hasher import PasswordHasher, PasswordHasherBusyError, password_hasher
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Users hashed and inserted per transaction by bulk_register
+BULK_CHUNK_SIZE = 500
 
 class AuthUsecase:
-    def __init__(self, user_repo: IUserRepository):
+    def __init__(
+        self,
+        user_repo: IUserRepository,
+        hasher: Optional[PasswordHasher] = None,
+        uow: Optional[IUnitOfWork] = None,
+        token_repo: Optional[ITokenRepository] = None
+    ):
         self.user_repo = user_repo
+        self.hasher = hasher or password_hasher
+        self.uow = uow
+        self.token_repo = token_repo
 
-    async def register(self, username: str, password: str, tenant_id: str, roles: list):
-        existing = await self.user_repo.get_by_username_and_tenant(username, tenant_id)
-        if existing:
-            raise ValueError("username already exists for tenant")
+    async def _commit(self):
+        """Commit the request's unit of work; repositories without one commit on their own"""
+        if self.uow is not None:
+            await self.uow.commit()
 
+    async def register(self, username: str, password: str, tenant_id: str, roles: list):
         uid = str(uuid.uuid4())
-        hashed = pwd_context.hash(password)
+        with span("auth.hash_password"):
+            hashed = await self.hasher.hash(password)
         user = User(id=uid, username=username, password_hash=hashed, tenant_id=tenant_id, roles=[Role(name=r) for r in roles])
-        await self.user_repo.create_user(user)
+        # One transaction; the unique (tenant_id, username) constraint rejects
+        # duplicates with UserAlreadyExistsError, with no separate existence check
+        with span("auth.create_user"):
+            await self.user_repo.create_user(user)
+            await self._commit()
         return user
 
-    async def authenticate(self, username: str, password: str, tenant_id: str) -> Optional[User]:
-        user = await self.user_repo.get_by_username_and_tenant(username, tenant_id)
+    async def bulk_register(self, tenant_id: str, rows: List[BulkUserDTO]) -> AsyncIterator[List[dict]]:
+        """Create users chunk by chunk, yielding the chunk's per-row results once it commits
+
+        The next chunk's passwords are hashed while the current one is inserted.
+        Usernames already taken in the tenant are reported, not overwritten.
+        """
+        chunks = [rows[i:i + BULK_CHUNK_SIZE] for i in range(0, len(rows), BULK_CHUNK_SIZE)]
+        if not chunks:
+            return
+        hashing = asyncio.ensure_future(self.hasher.hash_many([row.password for row in chunks[0]]))
+        try:
+            for number, chunk in enumerate(chunks):
+                hashes = await hashing
+                if number + 1 < len(chunks):
+                    hashing = asyncio.ensure_future(self.hasher.hash_many([row.password for row in chunks[number + 1]]))
+                users = [
+                    User(id=str(uuid.uuid4()), username=row.username, password_hash=hashed,
+                         tenant_id=tenant_id, roles=[Role(name=r) for r in row.roles])
+                    for row, hashed in zip(chunk, hashes)
+                ]
+                created = await self.user_repo.bulk_create_users(users)
+                await self._commit()
+                offset = number * BULK_CHUNK_SIZE
+                yield [
+                    {"index": index, "username": user.username, "status": "created", "id": user.id} if ok
+                    else {"index": index, "username": user.username, "status": "exists"}
+                    for index, (user, ok) in enumerate(zip(users, created), start=offset)
+                ]
+        finally:
+            hashing.cancel()
+
+    async def list_users(self, tenant_id: str, after_id: Optional[str] = None, limit: Optional[int] = None) -> AsyncIterator[dict]:
+        """Public fields of a tenant's users in id order; pass the last id seen as after_id to resume"""
+        async for user in self.user_repo.stream_users_by_tenant(tenant_id, after_id, limit):
+            yield {"id": user.id, "username": user.username, "tenant_id": user.tenant_id, "roles": list(user.role_names)}
+
+    async def authenticate(self, username: str, password: str, tenant_id: str) -> Optional[UserRecord]:
+        with span("auth.lookup_user"):
+            user = await self.user_repo.get_by_username_and_tenant(username, tenant_id)
+            # End the read so the connection goes back to the pool during the argon2 verify
+            await self._commit()
         if not user:
             return None
-        if not pwd_context.verify(password, user.password_hash):
+        with span("auth.verify_password"):
+            verified = await self.hasher.verify(password, user.password_hash)
+        if not verified:
             return None
+        if self.hasher.needs_update(user.password_hash):
+            with span("auth.rehash_password"):
+                user = await self._rehash(user, password)
         return user
 
-    async def issue_token(self, user: User):
-        claims = {
+    async def _rehash(self, user: UserRecord, password: str) -> UserRecord:
+        """Migrate a hash made with older argon2 costs while the plaintext is at hand"""
+        try:
+            hashed = await self.hasher.hash(password)
+        except PasswordHasherBusyError:
+            return user  # the login still succeeds; retry on a later one
+        await self.user_repo.update_password_hash(user.id, user.tenant_id, hashed)
+        await self._commit()
+        return replace(user, password_hash=hashed)
+
+    @staticmethod
+    def _claims(user: User) -> Dict[str, Any]:
+        return {
             "sub": user.id,
             "username": user.username,
             "tenant_id": user.tenant_id,
-            "roles": [r.name for r in user.roles]
+            "roles": list(user.role_names)
         }
-        token = create_access_token(claims)
+
+    async def issue_token(self, user: User):
+        token = create_access_token(self._claims(user))
         return token
+
+    def _new_tokens(self, user: User, family_id: Optional[str] = None) -> Tuple[Dict[str, Any], RefreshToken]:
+        """An access token and the refresh token that renews it, not yet stored"""
+        now = int(time.time())
+        jti = uuid.uuid4().hex
+        access_expires_at = now + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        access_token = create_access_token({**self._claims(user), "jti": jti, "exp": access_expires_at})
+        token_id, refresh_token, token_hash = new_refresh_token()
+        stored = RefreshToken(
+            id=token_id,
+            family_id=family_id or token_id,
+            user_id=user.id,
+            tenant_id=user.tenant_id,
+            token_hash=token_hash,
+            expires_at=now + int(REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600),
+            access_jti=jti,
+            access_expires_at=access_expires_at
+        )
+        tokens = {"access_token": access_token, "refresh_token": refresh_token, "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60}
+        return tokens, stored
+
+    async def issue_tokens(self, user: User) -> Dict[str, Any]:
+        """Access and refresh tokens for a user who just proved who they are"""
+        with span("auth.issue_tokens"):
+            tokens, stored = self._new_tokens(user)
+            await self.token_repo.create_refresh_token(stored)
+            await self._commit()
+        return tokens
+
+    async def refresh(self, refresh_token: str) -> Optional[Dict[str, Any]]:
+        """Exchange a refresh token for new access and refresh tokens; None if it is not valid
+
+        Each refresh token works once. Presenting one that was already exchanged
+        means it was stolen or replayed, so every token of its family is revoked,
+        access tokens included, and the user has to log in again.
+        """
+        parsed = parse_refresh_token(refresh_token)
+        if parsed is None:
+            return None
+        token_id, secret = parsed
+        with span("auth.lookup_refresh_token"):
+            stored = await self.token_repo.get_refresh_token(token_id)
+        if stored is None or not secret_matches(secret, stored.token_hash):
+            return None
+        if stored.revoked or stored.expires_at <= time.time():
+            return None
+        if stored.replaced_by is not None:
+            await self.revoke_family(stored.family_id)
+            return None
+        with span("auth.lookup_user"):
+            user = await self.user_repo.get_by_id_and_tenant(stored.user_id, stored.tenant_id)
+        if user is None:
+            return None
+        with span("auth.issue_tokens"):
+            tokens, successor = self._new_tokens(user, stored.family_id)
+            exchanged = await self.token_repo.mark_refresh_token_replaced(stored.id, successor.id)
+            if exchanged:
+                await self.token_repo.create_refresh_token(successor)
+                await self._commit()
+        if not exchanged:
+            # A concurrent exchange of the same token got there first: a replay
+            await self.revoke_family(stored.family_id)
+            return None
+        return tokens
+
+    async def revoke_family(self, family_id: str) -> None:
+        """Revoke a login's refresh tokens and the access tokens issued with them"""
+        access_tokens = await self.token_repo.revoke_family(family_id, int(time.time()))
+        await self._revoke(access_tokens)
+
+    async def logout(self, claims: Dict[str, Any], refresh_token: Optional[str] = None) -> None:
+        """Revoke the caller's access token and, if given, the refresh token family it came from"""
+        access_tokens = []
+        if claims.get("jti") and "exp" in claims:
+            access_tokens.append((claims["jti"], int(claims["exp"])))
+        parsed = parse_refresh_token(refresh_token) if refresh_token else None
+        if parsed is not None:
+            stored = await self.token_repo.get_refresh_token(parsed[0])
+            # Only the owner can revoke a refresh token
+            if (stored is not None and secret_matches(parsed[1], stored.token_hash)
+                    and (stored.user_id, stored.tenant_id) == (claims.get("sub"), claims.get("tenant_id"))):
+                access_tokens += await self.token_repo.revoke_family(stored.family_id, int(time.time()))
+        await self._revoke(access_tokens)
+
+    async def _revoke(self, access_tokens: List[Tuple[str, int]]) -> None:
+        await self.token_repo.revoke_access_tokens(access_tokens)
+        await self._commit()
+        for jti, _ in access_tokens:
+            token_cache.invalidate(jti)
@@ -1,6 +1,6 @@
 # app/usecases/dtos.py
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class RegisterDTO(BaseModel):
     username: str
@@ -8,11 +8,30 @@ class RegisterDTO(BaseModel):
     tenant_id: str
     roles: List[str] = ["user"]
 
+class BulkUserDTO(BaseModel):
+    username: str
+    password: str
+    roles: List[str] = ["user"]
+
+class BulkRegisterDTO(BaseModel):
+    users: List[BulkUserDTO] = Field(..., max_length=100_000)
+
 class LoginDTO(BaseModel):
     username: str
     password: str
     tenant_id: str
 
+class IntrospectBatchDTO(BaseModel):
+    tokens: List[str] = Field(..., max_length=1000)
+
+class RefreshDTO(BaseModel):
+    refresh_token: str
+
+class LogoutDTO(BaseModel):
+    refresh_token: Optional[str] = None
+
 class TokenResponse(BaseModel):
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
+    expires_in: Optional[int] = None
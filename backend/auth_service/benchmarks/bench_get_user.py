@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of get_by_id_and_tenant, the lookup behind every authenticated request
+
+Compares the ORM read path the repository used to take (select UserORM with
+selectinload of its roles, copied into a User with a Role per role name)
+with the Core path it takes now (one joined select mapped straight to a
+frozen UserRecord with interned role names). For each it reports latency,
+the memory allocated while serving one lookup (peak, via tracemalloc) and
+the memory each result keeps alive, which is what the principal cache pays
+per cached user.
+
+Each lookup gets its own session, as a request's unit of work would. Runs
+against an in-memory SQLite database, so the numbers are the Python side of
+the lookup; the database round trips are the same for both paths except
+that the ORM path makes two.
+
+Usage (from auth_service/):
+    python benchmarks/bench_get_user.py [lookups] [users]
+"""
+
+import asyncio
+import gc
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# taskly_common, when it has not been pip-installed
+sys.path.insert(1, str(Path(__file__).resolve().parent.parent.parent / "common"))
+from app.domain.models import Role, User  # noqa: E402
+from app.infra.db import Base, RoleORM, UserORM, user_roles  # noqa: E402
+from app.infra.sqlalchemy_user_repository import SQLAlchemyUserRepository  # noqa: E402
+
+TENANT = "bench"
+
+
+async def orm_get_by_id_and_tenant(session, user_id: str, tenant_id: str):
+    """The previous ORM-based implementation"""
+    stmt = select(UserORM).options(selectinload(UserORM.roles)).where(
+        UserORM.id == user_id,
+        UserORM.tenant_id == tenant_id
+    )
+    result = await session.execute(stmt)
+    u = result.scalar_one_or_none()
+    if not u:
+        return None
+    roles = [Role(name=r.name) for r in u.roles]
+    return User(id=u.id, username=u.username, password_hash=u.password_hash, tenant_id=u.tenant_id, roles=roles)
+
+
+async def core_get_by_id_and_tenant(session, user_id: str, tenant_id: str):
+    return await SQLAlchemyUserRepository(session).get_by_id_and_tenant(user_id, tenant_id)
+
+
+async def setup(users: int):
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(RoleORM.__table__), [{"name": "user"}, {"name": "admin"}, {"name": "billing"}])
+        await conn.execute(insert(UserORM.__table__), [
+            {"id": f"user-{i}", "username": f"user{i}", "password_hash": "$argon2id$bench", "tenant_id": TENANT}
+            for i in range(users)
+        ])
+        await conn.execute(insert(user_roles), [
+            {"user_id": f"user-{i}", "role_name": name}
+            for i in range(users) for name in (("user", "admin") if i % 10 == 0 else ("user", "billing"))
+        ])
+    return engine, sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def lookup(session_factory, get, user_id: str):
+    async with session_factory() as session:
+        return await get(session, user_id, TENANT)
+
+
+async def bench(session_factory, get, ids):
+    for user_id in ids[:200]:  # warm up statement caches
+        await lookup(session_factory, get, user_id)
+
+    timings = []
+    for user_id in ids:
+        started = time.perf_counter()
+        await lookup(session_factory, get, user_id)
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    peaks = []
+    for user_id in ids[:500]:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await lookup(session_factory, get, user_id)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [await lookup(session_factory, get, user_id) for user_id in ids[:1000]]
+    gc.collect()
+    retained = (tracemalloc.get_traced_memory()[0] - before) / len(kept)
+    tracemalloc.stop()
+
+    return statistics.median(timings) * 1e6, statistics.mean(timings) * 1e6, statistics.median(peaks), retained
+
+
+async def main(lookups: int, users: int):
+    engine, session_factory = await setup(users)
+    ids = [f"user-{random.randrange(users)}" for _ in range(lookups)]
+    print(f"users: {users}, lookups: {lookups}")
+    print(f"{'path':<8}{'p50 us':>10}{'mean us':>10}{'alloc peak B':>14}{'retained B':>12}")
+    try:
+        for name, get in (("orm", orm_get_by_id_and_tenant), ("core", core_get_by_id_and_tenant)):
+            p50, mean, peak, retained = await bench(session_factory, get, ids)
+            print(f"{name:<8}{p50:>10.1f}{mean:>10.1f}{peak:>14.0f}{retained:>12.0f}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    u = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    asyncio.run(main(n, u))
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark access token signing and verification per algorithm
+
+Signs and verifies the claims issue_token puts in a token with HS256
+through each JWT_BACKEND (app/security/jwt_backends.py; pyjwt only when
+installed) and with ES256 and EdDSA (the key ring's keys, through
+taskly_common.jws). ES256 through python-jose is included for reference,
+since that is what a verifier using jose with the JWKS would run. The last
+row is a verification answered by the verified token memo. Single thread;
+verifications scale with cores.
+
+Usage (from auth_service/):
+    python benchmarks/bench_jwt_verify.py [iterations]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from jose import jwt
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# taskly_common, when it has not been pip-installed
+sys.path.insert(1, str(Path(__file__).resolve().parent.parent.parent / "common"))
+from taskly_common import jws  # noqa: E402
+from app.security.jwt_backends import BACKENDS, get_backend, pyjwt  # noqa: E402
+from app.security.key_ring import generate_key  # noqa: E402
+from app.security.token_cache import VerifiedTokenCache  # noqa: E402
+
+CLAIMS = {
+    "sub": "6f1c2a9e-0000-4000-8000-000000000001",
+    "username": "alice@example.com",
+    "tenant_id": "acme",
+    "roles": ["user", "admin"],
+    "exp": int(time.time()) + 3600,
+    "jti": "2b0c8a3e4f5d4e7a9c1b6d8e0f2a4c6e"
+}
+SECRET = "bench-secret-0123456789abcdef0123456789abcdef"
+
+
+def rate(func, iterations: int) -> float:
+    """Calls per second"""
+    for _ in range(min(100, iterations)):
+        func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+
+def main(iterations: int):
+    es256, eddsa = generate_key("ES256"), generate_key("EdDSA")
+    es256_pem = es256.to_pem().decode()
+    es256_jwk = es256.jwk
+
+    cases = {
+        f"HS256 ({name})": (
+            lambda backend=get_backend(name): backend.encode(CLAIMS, SECRET, "HS256"),
+            lambda token, backend=get_backend(name): backend.decode(token, SECRET, "HS256")
+        )
+        for name in BACKENDS if name != "pyjwt" or pyjwt is not None
+    }
+    cases.update({
+        "ES256 (jose)": (
+            lambda: jwt.encode(CLAIMS, es256_pem, algorithm="ES256", headers={"kid": es256.kid}),
+            lambda token: jwt.decode(token, es256_jwk, algorithms=["ES256"])
+        ),
+        "ES256": (
+            lambda: jws.encode(CLAIMS, es256.private_key, es256.kid),
+            lambda token: jws.decode(token, es256.public_key)
+        ),
+        "EdDSA": (
+            lambda: jws.encode(CLAIMS, eddsa.private_key, eddsa.kid),
+            lambda token: jws.decode(token, eddsa.public_key)
+        ),
+    })
+
+    print(f"iterations: {iterations}")
+    print(f"{'algorithm':<14}{'sign/s':>12}{'verify/s':>12}{'token bytes':>13}")
+    for name, (encode, decode) in cases.items():
+        token = encode()
+        assert decode(token)["sub"] == CLAIMS["sub"]
+        sign_rate = rate(encode, iterations)
+        verify_rate = rate(lambda: decode(token), iterations)
+        print(f"{name:<14}{sign_rate:>12.0f}{verify_rate:>12.0f}{len(token):>13}")
+
+    memo = VerifiedTokenCache(maxsize=10000, ttl=300)
+    token = jwt.encode(CLAIMS, SECRET, algorithm="HS256")
+    memo.put(token, jwt.decode(token, SECRET, algorithms=["HS256"]))
+    print(f"{'memo hit':<14}{'':>12}{rate(lambda: memo.get(token), iterations):>12.0f}{len(token):>13}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
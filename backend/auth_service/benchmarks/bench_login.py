@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for password verification during login
+
+Runs concurrent AuthUsecase.authenticate calls against an in-memory user
+store, first with argon2 verify called inline on the event loop (how login
+used to work), then through PasswordHasher thread and process pools with
+1, 2, 4, ... workers up to the host's core count. Inline verification
+serializes every login; the pools should scale close to linearly with
+workers until they run out of cores.
+
+Usage (from auth_service/):
+    python benchmarks/bench_login.py [logins] [concurrency]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# taskly_common, when it has not been pip-installed
+sys.path.insert(1, str(Path(__file__).resolve().parent.parent.parent / "common"))
+from app.domain.models import Role, User  # noqa: E402
+from app.security.password_hasher import CONTEXT_SETTINGS, PasswordHasher  # noqa: E402
+from app.usecases.auth_usecase import AuthUsecase  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+
+
+class InMemoryUsers:
+    """Just enough of IUserRepository for authenticate()"""
+
+    def __init__(self, user: User):
+        self.user = user
+
+    async def get_by_username_and_tenant(self, username, tenant_id):
+        return self.user
+
+
+class InlineHasher(PasswordHasher):
+    """Verifies on the event loop thread, blocking it like the old code did"""
+
+    async def verify(self, password, password_hash):
+        return self.context.verify(password, password_hash)
+
+
+async def run(usecase: AuthUsecase, logins: int, concurrency: int) -> float:
+    """Logins per second for `logins` calls, `concurrency` at a time"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            assert await usecase.authenticate("bench", PASSWORD, "bench") is not None
+
+    await asyncio.gather(*(login() for _ in range(concurrency)))  # warm up the pool
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return logins / (time.perf_counter() - start)
+
+
+async def main(logins: int, concurrency: int):
+    hasher = PasswordHasher(CONTEXT_SETTINGS, executor="thread", workers=1)
+    user = User(id="1", username="bench", password_hash=await hasher.hash(PASSWORD), tenant_id="bench", roles=[Role(name="user")])
+    hasher.shutdown()
+    users = InMemoryUsers(user)
+
+    cores = os.cpu_count() or 1
+    print(f"cores: {cores}, logins: {logins}, concurrency: {concurrency}")
+    inline = await run(AuthUsecase(users, InlineHasher(workers=1)), logins, concurrency)
+    print(f"{'inline':<10}{'-':>8}{inline:>12.1f} logins/s")
+
+    workers = 1
+    while True:
+        for kind in ("thread", "process"):
+            hasher = PasswordHasher(CONTEXT_SETTINGS, executor=kind, workers=workers, max_pending=concurrency)
+            try:
+                rate = await run(AuthUsecase(users, hasher), logins, concurrency)
+            finally:
+                hasher.shutdown()
+            print(f"{kind:<10}{workers:>8}{rate:>12.1f} logins/s  ({rate / inline:.2f}x inline)")
+        if workers >= cores:
+            break
+        workers = min(workers * 2, cores)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    c = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    asyncio.run(main(n, c))
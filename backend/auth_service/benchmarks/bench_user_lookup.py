@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark user lookups as the users table grows
+
+Migrates an empty database, then grows the users table step by step (spread
+over many tenants, every user with a role) and after each step times the two
+lookups on the request path: get_by_username_and_tenant (login) and
+get_by_id_and_tenant (every authenticated request), both through the
+repository. With the tenant-scoped composite indexes both stay flat from
+thousands to millions of users; --revision 0001 runs the same steps against
+the old single-column indexes for comparison.
+
+Point it at PostgreSQL for numbers that mean anything in production; the
+default is a throwaway SQLite file.
+
+Usage (from auth_service/):
+    python benchmarks/bench_user_lookup.py [--url URL] [--sizes 10000,100000,1000000,3000000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# taskly_common, when it has not been pip-installed
+sys.path.insert(1, str(Path(__file__).resolve().parent.parent.parent / "common"))
+from app.infra.db import MIGRATIONS_CONFIG, RoleORM, UserORM, user_roles  # noqa: E402
+from app.infra.sqlalchemy_user_repository import SQLAlchemyUserRepository  # noqa: E402
+
+TENANTS = 1000
+BATCH = 10_000
+# Any argon2 hash will do, lookups never verify it
+PASSWORD_HASH = "$argon2id$v=19$m=65536,t=3,p=4$c2FsdHNhbHRzYWx0$aGFzaGhhc2hoYXNoaGFzaGhhc2hoYXNo"
+
+
+def migrate(url: str, revision: str):
+    config = Config(MIGRATIONS_CONFIG)
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, revision)
+
+
+def user_id(i: int) -> str:
+    return f"00000000-0000-4000-8000-{i:012d}"
+
+
+def tenant_of(i: int) -> str:
+    return f"tenant{i % TENANTS}"
+
+
+async def populate(engine, start: int, stop: int):
+    """Insert users start..stop-1 in batches"""
+    for first in range(start, stop, BATCH):
+        last = min(first + BATCH, stop)
+        async with engine.begin() as conn:
+            await conn.execute(insert(UserORM.__table__), [
+                {"id": user_id(i), "username": f"user{i}", "password_hash": PASSWORD_HASH, "tenant_id": tenant_of(i)}
+                for i in range(first, last)
+            ])
+            await conn.execute(insert(user_roles), [
+                {"user_id": user_id(i), "role_name": "admin" if i % 10 == 0 else "user"}
+                for i in range(first, last)
+            ])
+
+
+async def time_lookups(session_factory, size: int, lookups: int):
+    """(p50, p99) milliseconds for each lookup, on random existing users"""
+    timings = {"by username": [], "by id": []}
+    async with session_factory() as session:
+        repo = SQLAlchemyUserRepository(session)
+        for _ in range(lookups):
+            i = random.randrange(size)
+            started = time.perf_counter()
+            assert await repo.get_by_username_and_tenant(f"user{i}", tenant_of(i)) is not None
+            timings["by username"].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            assert await repo.get_by_id_and_tenant(user_id(i), tenant_of(i)) is not None
+            timings["by id"].append(time.perf_counter() - started)
+            # Keep the identity map from growing with every user looked up
+            session.expunge_all()
+    return {
+        name: (statistics.median(values) * 1000, statistics.quantiles(values, n=100)[98] * 1000)
+        for name, values in timings.items()
+    }
+
+
+async def main(url: str, sizes, lookups: int):
+    engine = create_async_engine(url)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.execute(insert(RoleORM.__table__), [{"name": "user"}, {"name": "admin"}])
+
+    print(f"{'users':>10}{'lookup':>14}{'p50 ms':>10}{'p99 ms':>10}")
+    populated = 0
+    try:
+        for size in sizes:
+            await populate(engine, populated, size)
+            populated = size
+            if engine.dialect.name == "postgresql":
+                async with engine.connect() as conn:
+                    await conn.execute(text("ANALYZE users"))
+                    await conn.execute(text("ANALYZE user_roles"))
+            for name, (p50, p99) in (await time_lookups(session_factory, size, lookups)).items():
+                print(f"{size:>10}{name:>14}{p50:>10.3f}{p99:>10.3f}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="User lookup latency vs. table size")
+    parser.add_argument("--url", help="empty database to migrate and fill (default: a temporary SQLite file)")
+    parser.add_argument("--sizes", default="10000,100000,1000000,3000000", help="comma-separated user counts")
+    parser.add_argument("--lookups", type=int, default=2000, help="lookups of each kind per size")
+    parser.add_argument("--revision", default="head", help="migrate to this revision, e.g. 0001 for the old indexes")
+    args = parser.parse_args()
+
+    url = args.url
+    if url is None:
+        url = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_users.db')}"
+    migrate(url, args.revision)
+    asyncio.run(main(url, sorted(int(size) for size in args.sizes.split(",")), args.lookups))
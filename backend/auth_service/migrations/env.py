@@ -0,0 +1,98 @@
+# migrations/env.py
+"""
+Alembic environment for the auth service
+
+Migrations run on their own NullPool engine built from DATABASE_URL in
+app/infra/db.py (or sqlalchemy.url when set on the Alembic config, as the
+tests do), so the service's statement timeout does not cut index builds
+short. On PostgreSQL an advisory lock makes replicas that start together
+take turns; the ones that wait find the schema already at head. Waiters poll
+for the lock with no transaction open, since CREATE INDEX CONCURRENTLY in
+the lock holder waits for every older snapshot to end.
+
+Databases created by the old create_all startup have the tables but no
+alembic_version (or an empty one, if their first upgrade failed); they are
+stamped at the baseline revision first so an upgrade only applies what came
+after it.
+"""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import inspect, pool, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.infra.db import DATABASE_URL, Base
+
+# Revision matching the schema init_db used to create
+BASELINE_REVISION = "0001"
+# Arbitrary, but fixed: every replica must ask for the same lock
+MIGRATION_LOCK_ID = 7_305_021
+MIGRATION_LOCK_POLL_SECONDS = 1.0
+
+config = context.config
+# The service calls upgrade at startup and has configured logging already
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or DATABASE_URL
+
+
+def run_migrations_offline():
+    """Emit the SQL instead of running it (alembic upgrade head --sql)"""
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"}
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def stamp_legacy_schema(connection):
+    # An empty alembic_version is left behind when a first upgrade fails
+    migration_context = context.get_context()
+    if "users" in inspect(connection).get_table_names() and migration_context.get_current_revision() is None:
+        migration_context.stamp(context.script, BASELINE_REVISION)
+
+
+def do_run_migrations(connection):
+    context.configure(connection=connection, target_metadata=target_metadata)
+    stamp_legacy_schema(connection)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def acquire_migration_lock(connection):
+    """Take the session-level lock, released when the connection closes"""
+    while True:
+        result = await connection.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        acquired = result.scalar()
+        # End the transaction (and its snapshot) before waiting
+        await connection.commit()
+        if acquired:
+            return
+        await asyncio.sleep(MIGRATION_LOCK_POLL_SECONDS)
+
+
+async def run_migrations_online():
+    engine = create_async_engine(database_url(), poolclass=pool.NullPool)
+    try:
+        async with engine.connect() as connection:
+            if connection.dialect.name == "postgresql":
+                await acquire_migration_lock(connection)
+            await connection.run_sync(do_run_migrations)
+            await connection.commit()
+    finally:
+        await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
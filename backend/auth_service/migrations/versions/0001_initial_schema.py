@@ -0,0 +1,55 @@
+"""Initial schema, as created by init_db's create_all
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "roles",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("name")
+    )
+    op.create_index("ix_roles_name", "roles", ["name"])
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=True),
+        sa.Column("password_hash", sa.String(), nullable=True),
+        sa.Column("tenant_id", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("tenant_id", "username", name="uq_users_tenant_username")
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"])
+    op.create_index("ix_users_tenant_id", "users", ["tenant_id"])
+
+    op.create_table(
+        "user_roles",
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("role_name", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(["role_name"], ["roles.name"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "role_name")
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_roles")
+    op.drop_index("ix_users_tenant_id", table_name="users")
+    op.drop_index("ix_users_username", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
+    op.drop_index("ix_roles_name", table_name="roles")
+    op.drop_table("roles")
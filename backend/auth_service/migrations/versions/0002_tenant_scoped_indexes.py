@@ -0,0 +1,129 @@
+"""Tenant-scoped composite indexes
+
+Every user lookup filters on tenant_id plus username or id, and role fan-out
+("who has role X") reads user_roles by role_name, which the (user_id,
+role_name) primary key cannot serve. Replaces the single-column indexes with:
+
+- ix_users_tenant_id_username: unique (tenant_id, username), also covering
+  id and password_hash on PostgreSQL so the login lookup never visits the
+  heap; it takes over from uq_users_tenant_username as the ON CONFLICT target
+- ix_users_tenant_id_id: unique (tenant_id, id) for token -> user lookups
+- ix_user_roles_role_name: (role_name, user_id)
+
+ix_users_id duplicated the primary key index and ix_roles_name the roles
+primary key, so both are dropped. Databases stamped at 0001 from the old
+create_all startup never had uq_users_tenant_username, so it is only dropped
+where it exists. On PostgreSQL the indexes are built
+CONCURRENTLY, outside a transaction, so a large users table stays writable
+while they build. A build that failed part way leaves an INVALID index,
+which the next run drops and rebuilds.
+
+The old check-then-insert registration could race and store the same
+(tenant_id, username) twice. The unique index cannot be built over such rows,
+so the migration stops before changing anything and lists them; they have to
+be merged or renamed by hand, since other rows reference the user ids.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+NEW_INDEXES = ("ix_users_tenant_id_username", "ix_users_tenant_id_id", "ix_user_roles_role_name")
+
+
+def create_indexes(concurrently: bool):
+    # if_not_exists skips indexes a previous, interrupted run already built
+    options = {"postgresql_concurrently": True, "if_not_exists": True} if concurrently else {}
+    op.create_index(
+        "ix_users_tenant_id_username", "users", ["tenant_id", "username"], unique=True,
+        postgresql_include=["id", "password_hash"], **options
+    )
+    op.create_index(
+        "ix_users_tenant_id_id", "users", ["tenant_id", "id"], unique=True,
+        postgresql_include=["username"], **options
+    )
+    op.create_index("ix_user_roles_role_name", "user_roles", ["role_name", "user_id"], **options)
+
+
+def offline() -> bool:
+    """alembic upgrade --sql: nothing can be read, so the checks assume a schema made by 0001"""
+    return op.get_context().as_sql
+
+
+def check_duplicate_usernames(limit: int = 5):
+    if offline():
+        return
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT tenant_id, username, COUNT(*) FROM users"
+        " WHERE tenant_id IS NOT NULL AND username IS NOT NULL"
+        " GROUP BY tenant_id, username HAVING COUNT(*) > 1 LIMIT :limit"
+    ), {"limit": limit}).fetchall()
+    if duplicates:
+        listed = ", ".join(f"{tenant_id}/{username} ({count} rows)" for tenant_id, username, count in duplicates)
+        raise RuntimeError(
+            f"users has duplicate (tenant_id, username) rows, e.g. {listed}; "
+            "merge or rename them, then run the migration again"
+        )
+
+
+def drop_invalid_indexes():
+    """Drop indexes a failed CONCURRENTLY build left INVALID, so they are built again"""
+    if offline():
+        return
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+        " WHERE NOT i.indisvalid AND c.relname = ANY(:names)"
+    ), {"names": list(NEW_INDEXES)}).scalars().all()
+    for name in invalid:
+        op.drop_index(name, postgresql_concurrently=True)
+
+
+def has_unique_constraint(table: str, name: str) -> bool:
+    if offline():
+        return True
+    return any(c["name"] == name for c in sa.inspect(op.get_bind()).get_unique_constraints(table))
+
+
+def upgrade() -> None:
+    check_duplicate_usernames()
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            drop_invalid_indexes()
+            create_indexes(concurrently=True)
+        if has_unique_constraint("users", "uq_users_tenant_username"):
+            op.drop_constraint("uq_users_tenant_username", "users", type_="unique")
+    else:
+        create_indexes(concurrently=False)
+        if has_unique_constraint("users", "uq_users_tenant_username"):
+            with op.batch_alter_table("users") as batch:
+                batch.drop_constraint("uq_users_tenant_username", type_="unique")
+
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_index("ix_users_username", table_name="users")
+    op.drop_index("ix_users_tenant_id", table_name="users")
+    op.drop_index("ix_roles_name", table_name="roles")
+
+
+def downgrade() -> None:
+    op.create_index("ix_roles_name", "roles", ["name"])
+    op.create_index("ix_users_tenant_id", "users", ["tenant_id"])
+    op.create_index("ix_users_username", "users", ["username"])
+    op.create_index("ix_users_id", "users", ["id"])
+    if op.get_context().dialect.name == "postgresql":
+        op.create_unique_constraint("uq_users_tenant_username", "users", ["tenant_id", "username"])
+    else:
+        with op.batch_alter_table("users") as batch:
+            batch.create_unique_constraint("uq_users_tenant_username", ["tenant_id", "username"])
+
+    op.drop_index("ix_user_roles_role_name", table_name="user_roles")
+    op.drop_index("ix_users_tenant_id_id", table_name="users")
+    op.drop_index("ix_users_tenant_id_username", table_name="users")
@@ -11,6 +11,8 @@ from sqlalchemy.pool import StaticPool
 # Adicionar o diretório do projeto ao path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+# taskly_common, when it has not been pip-installed
+sys.path.insert(1, str(project_root.parent / "common"))
 
 try:
     from app.infra.db import Base
@@ -128,4 +130,55 @@ def test_client():
     def login():
         return {"access_token": "test_token", "token_type": "bearer"}
     
-    return TestClient(test_app)
\ No newline at end of file
+    return TestClient(test_app)
+
+@pytest.fixture
+def session_factory(test_engine):
+    """Sessions on the test database, for units of work made by the code under test"""
+    return sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+@pytest.fixture
+async def api_client(session_factory, monkeypatch):
+    """HTTP client for the /auth router, backed by the test database"""
+    import httpx
+    from fastapi import FastAPI
+    from app.controllers import auth_controller
+    from app.infra import db
+    from app.infra.principal_cache import principal_cache
+    from app.infra.unit_of_work import SQLAlchemyUnitOfWork, get_unit_of_work
+
+    async def test_unit_of_work():
+        async with SQLAlchemyUnitOfWork(session_factory) as uow:
+            yield uow
+
+    test_app = FastAPI()
+    test_app.include_router(auth_controller.router, prefix="/auth")
+    test_app.dependency_overrides[get_unit_of_work] = test_unit_of_work
+    # Streaming endpoints open their own unit of work or repository sessions
+    monkeypatch.setattr(auth_controller, "SQLAlchemyUnitOfWork", lambda: SQLAlchemyUnitOfWork(session_factory))
+    monkeypatch.setattr(db, "AsyncSessionLocal", session_factory)
+    principal_cache.invalidate()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=test_app), base_url="http://test") as client:
+        yield client
+    principal_cache.invalidate()
+
+@pytest.fixture
+def add_user(session_factory):
+    """Store a user and return it with an access token for them"""
+    import uuid
+    from app.domain.models import Role, User
+    from app.infra.unit_of_work import SQLAlchemyUnitOfWork
+    from app.usecases.auth_usecase import AuthUsecase
+    from app.security.jwt_manager import create_access_token
+
+    async def add(tenant_id: str, username: str, roles=("user",)):
+        user = User(
+            id=str(uuid.uuid4()), username=username, password_hash="hashed_password",
+            tenant_id=tenant_id, roles=[Role(name=role) for role in roles]
+        )
+        async with SQLAlchemyUnitOfWork(session_factory) as uow:
+            await uow.users.create_user(user)
+            await uow.commit()
+        return user, create_access_token({**AuthUsecase._claims(user), "jti": str(uuid.uuid4())})
+
+    return add
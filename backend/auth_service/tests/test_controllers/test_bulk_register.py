@@ -0,0 +1,95 @@
+# Tests for POST /auth/register/bulk
+import uuid
+import orjson
+import pytest
+from app.infra.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from app.infra.unit_of_work import SQLAlchemyUnitOfWork
+from app.security.password_hasher import PasswordHasher, context_settings
+from app.usecases import auth_usecase
+
+
+@pytest.fixture(autouse=True)
+def fast_hasher(monkeypatch):
+    """Cheap argon2 costs on a thread, so rows hash quickly"""
+    hasher = PasswordHasher(context_settings(memory_cost=1024, time_cost=1, parallelism=1), executor="thread", workers=1)
+    monkeypatch.setattr(auth_usecase, "password_hasher", hasher)
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.fixture
+async def admin(add_user):
+    tenant_id = f"tenant_bulk_{uuid.uuid4().hex[:8]}"
+    _, token = await add_user(tenant_id, "admin@example.com", ("admin",))
+    return tenant_id, {"Authorization": f"Bearer {token}", "X-Tenant-ID": tenant_id}
+
+
+def rows(*usernames: str) -> dict:
+    return {"users": [{"username": username, "password": "secret", "roles": ["user"]} for username in usernames]}
+
+
+def ndjson(response) -> list:
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [orjson.loads(line) for line in response.content.splitlines()]
+
+
+async def usernames(session_factory, tenant_id: str) -> set:
+    async with SQLAlchemyUnitOfWork(session_factory) as uow:
+        return {user.username async for user in uow.users.stream_users_by_tenant(tenant_id)}
+
+
+class TestBulkRegister:
+    async def test_created_and_exists_lines(self, api_client, admin, session_factory, monkeypatch):
+        """Test one NDJSON line per row, in order across chunks, with taken usernames reported as exists."""
+        monkeypatch.setattr(auth_usecase, "BULK_CHUNK_SIZE", 2)
+        tenant_id, headers = admin
+
+        response = await api_client.post(
+            "/auth/register/bulk", json=rows("a@example.com", "admin@example.com", "b@example.com"), headers=headers
+        )
+
+        assert response.status_code == 200
+        lines = ndjson(response)
+        assert [(line["index"], line["username"], line["status"]) for line in lines] == [
+            (0, "a@example.com", "created"), (1, "admin@example.com", "exists"), (2, "b@example.com", "created")
+        ]
+        assert "id" in lines[0] and "id" not in lines[1]
+        assert await usernames(session_factory, tenant_id) == {"admin@example.com", "a@example.com", "b@example.com"}
+
+    async def test_error_trailer_after_failed_chunk(self, api_client, admin, session_factory, monkeypatch):
+        """Test that a failing chunk ends the stream with an error line, keeping earlier chunks committed."""
+        monkeypatch.setattr(auth_usecase, "BULK_CHUNK_SIZE", 2)
+        tenant_id, headers = admin
+        insert = SQLAlchemyUserRepository.bulk_create_users
+        calls = []
+
+        async def fail_second_chunk(self, users):
+            calls.append(users)
+            if len(calls) == 2:
+                raise RuntimeError("database went away")
+            return await insert(self, users)
+
+        monkeypatch.setattr(SQLAlchemyUserRepository, "bulk_create_users", fail_second_chunk)
+
+        response = await api_client.post(
+            "/auth/register/bulk", json=rows("c@example.com", "d@example.com", "e@example.com", "f@example.com"),
+            headers=headers
+        )
+
+        lines = ndjson(response)
+        assert [line.get("username") for line in lines[:-1]] == ["c@example.com", "d@example.com"]
+        assert lines[-1] == {"status": "error", "detail": "bulk registration aborted"}
+        assert await usernames(session_factory, tenant_id) == {"admin@example.com", "c@example.com", "d@example.com"}
+
+    async def test_requires_admin(self, api_client, admin, add_user, session_factory):
+        """Test that a user without the admin role cannot create users."""
+        tenant_id, _ = admin
+        _, token = await add_user(tenant_id, "plain@example.com")
+
+        response = await api_client.post(
+            "/auth/register/bulk", json=rows("g@example.com"),
+            headers={"Authorization": f"Bearer {token}", "X-Tenant-ID": tenant_id}
+        )
+
+        assert response.status_code == 403
+        assert "g@example.com" not in await usernames(session_factory, tenant_id)
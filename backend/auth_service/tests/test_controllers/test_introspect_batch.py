@@ -0,0 +1,82 @@
+# Tests for POST /auth/introspect/batch
+import uuid
+import pytest
+from app.controllers import dependencies
+from app.infra.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from app.security.jwt_manager import create_access_token
+
+INTERNAL_TOKEN = "internal-secret"
+
+
+@pytest.fixture
+def internal_token(monkeypatch):
+    monkeypatch.setattr(dependencies, "INTERNAL_SERVICE_TOKEN", INTERNAL_TOKEN)
+    return {"X-Internal-Token": INTERNAL_TOKEN}
+
+
+@pytest.fixture
+def tenant_queries(monkeypatch):
+    """Tenants of the user lookups the endpoint makes, one entry per query"""
+    queries = []
+    lookup = SQLAlchemyUserRepository.get_many_by_ids_and_tenant
+
+    async def counted(self, user_ids, tenant_id):
+        queries.append(tenant_id)
+        return await lookup(self, user_ids, tenant_id)
+
+    monkeypatch.setattr(SQLAlchemyUserRepository, "get_many_by_ids_and_tenant", counted)
+    return queries
+
+
+class TestIntrospectBatch:
+    @pytest.mark.parametrize("headers", [{}, {"X-Internal-Token": "wrong"}])
+    async def test_requires_internal_token(self, api_client, internal_token, headers):
+        """Test that callers without the shared internal token get a 401."""
+        response = await api_client.post("/auth/introspect/batch", json={"tokens": []}, headers=headers)
+
+        assert response.status_code == 401
+
+    async def test_disabled_without_internal_token(self, api_client, monkeypatch):
+        """Test that the endpoint does not exist while INTERNAL_SERVICE_TOKEN is unset."""
+        monkeypatch.setattr(dependencies, "INTERNAL_SERVICE_TOKEN", "")
+
+        response = await api_client.post("/auth/introspect/batch", json={"tokens": []}, headers={"X-Internal-Token": ""})
+
+        assert response.status_code == 404
+
+    async def test_results_in_request_order(self, api_client, internal_token, add_user):
+        """Test one result per token, in order, with inactive results for bad or orphaned tokens."""
+        alice, alice_token = await add_user("tenant_introspect_1", "alice@example.com", ("user", "admin"))
+        bob, bob_token = await add_user("tenant_introspect_1", "bob@example.com")
+        ghost_token = create_access_token({"sub": str(uuid.uuid4()), "tenant_id": "tenant_introspect_1"})
+
+        response = await api_client.post(
+            "/auth/introspect/batch",
+            json={"tokens": [bob_token, "not-a-jwt", alice_token, ghost_token]},
+            headers=internal_token
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["active"] for result in results] == [True, False, True, False]
+        assert (results[0]["sub"], results[0]["username"], results[0]["roles"]) == (bob.id, "bob@example.com", ["user"])
+        assert results[1] == {"active": False, "error": "invalid token"}
+        assert results[2]["sub"] == alice.id and sorted(results[2]["roles"]) == ["admin", "user"]
+        assert results[3] == {"active": False, "error": "user not found"}
+
+    async def test_one_query_per_tenant(self, api_client, internal_token, add_user, tenant_queries):
+        """Test that users are loaded with one query per tenant, then from the principal cache."""
+        tokens = [
+            (await add_user("tenant_introspect_2", "carol@example.com"))[1],
+            (await add_user("tenant_introspect_2", "dave@example.com"))[1],
+            (await add_user("tenant_introspect_3", "erin@example.com"))[1],
+        ]
+
+        first = await api_client.post("/auth/introspect/batch", json={"tokens": tokens}, headers=internal_token)
+        queried = sorted(tenant_queries)
+        second = await api_client.post("/auth/introspect/batch", json={"tokens": tokens}, headers=internal_token)
+
+        assert queried == ["tenant_introspect_2", "tenant_introspect_3"]
+        assert len(tenant_queries) == 2
+        assert first.json() == second.json()
+        assert all(result["active"] for result in second.json()["results"])
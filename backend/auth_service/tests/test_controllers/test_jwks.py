@@ -0,0 +1,66 @@
+# Tests for GET /.well-known/jwks.json
+import httpx
+import pytest
+from app.entrypoints import rest
+from app.security.jwt_manager import JWKS_MAX_AGE
+from app.security.key_ring import KeyRing
+
+DAY = 24 * 3600
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=rest.app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def key_ring(monkeypatch):
+    ring = KeyRing("ES256", rotate_every=DAY, publish_ahead=600, retain=3600)
+    monkeypatch.setattr(rest, "key_ring", ring)
+    return ring
+
+
+class TestJwksEndpoint:
+    async def test_empty_for_hs256(self, client, monkeypatch):
+        """Test that HS256 deployments publish an empty, cacheable key set."""
+        monkeypatch.setattr(rest, "key_ring", None)
+
+        response = await client.get("/.well-known/jwks.json")
+
+        assert response.status_code == 200
+        assert response.json() == {"keys": []}
+        assert response.headers["cache-control"] == f"public, max-age={JWKS_MAX_AGE}"
+
+    async def test_publishes_ring_keys(self, client, key_ring):
+        """Test that the ring's public keys are served with Cache-Control and ETag."""
+        response = await client.get("/.well-known/jwks.json")
+
+        assert response.status_code == 200
+        assert response.json() == key_ring.jwks()
+        assert [key["kid"] for key in response.json()["keys"]] == [key_ring.signing_key.kid]
+        assert "d" not in response.json()["keys"][0]
+        assert response.headers["cache-control"] == f"public, max-age={JWKS_MAX_AGE}"
+        assert response.headers["etag"] == key_ring.etag
+
+    async def test_not_modified(self, client, key_ring):
+        """Test that a matching If-None-Match gets a bodiless 304 that keeps the caching headers."""
+        etag = (await client.get("/.well-known/jwks.json")).headers["etag"]
+
+        response = await client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == f"public, max-age={JWKS_MAX_AGE}"
+
+    async def test_rotation_changes_etag(self, client, key_ring):
+        """Test that publishing a new key invalidates cached copies of the old set."""
+        etag = (await client.get("/.well-known/jwks.json")).headers["etag"]
+        key_ring.refresh(now=key_ring.signing_key.created_at + DAY)
+
+        response = await client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert len(response.json()["keys"]) == 2
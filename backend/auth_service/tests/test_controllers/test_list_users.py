@@ -0,0 +1,85 @@
+# Tests for GET /auth/users
+import uuid
+import orjson
+import pytest
+
+
+def auth(token: str, tenant_id: str) -> dict:
+    return {"Authorization": f"Bearer {token}", "X-Tenant-ID": tenant_id}
+
+
+def ndjson(response) -> list:
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.content.endswith(b"\n")
+    return [orjson.loads(line) for line in response.content.splitlines()]
+
+
+@pytest.fixture
+async def tenant(add_user):
+    """A tenant with an admin and four users (sorted by id), next to another tenant's user"""
+    tenant_id = f"tenant_listing_{uuid.uuid4().hex[:8]}"
+    admin, token = await add_user(tenant_id, "admin@example.com", ("admin",))
+    users = [admin] + [(await add_user(tenant_id, f"user{i}@example.com"))[0] for i in range(4)]
+    await add_user(f"{tenant_id}_other", "outsider@example.com")
+    return tenant_id, token, sorted(users, key=lambda user: user.id)
+
+
+class TestListUsers:
+    async def test_ndjson_lines(self, api_client, tenant):
+        """Test one JSON object per line for every user of the admin's tenant, in id order."""
+        tenant_id, token, users = tenant
+
+        response = await api_client.get("/auth/users", headers=auth(token, tenant_id))
+
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "no-store"
+        rows = ndjson(response)
+        assert [row["id"] for row in rows] == [user.id for user in users]
+        assert {row["tenant_id"] for row in rows} == {tenant_id}
+        assert set(rows[0]) == {"id", "username", "tenant_id", "roles"}
+
+    async def test_keyset_paging(self, api_client, tenant):
+        """Test that limit and after page through the listing without gaps or repeats."""
+        tenant_id, token, users = tenant
+        pages, params = [], {"limit": 2}
+
+        while True:
+            page = ndjson(await api_client.get("/auth/users", params=params, headers=auth(token, tenant_id)))
+            pages.append(page)
+            if len(page) < params["limit"]:
+                break
+            params["after"] = page[-1]["id"]
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [row["id"] for page in pages for row in page] == [user.id for user in users]
+
+    async def test_invalid_limit(self, api_client, tenant):
+        tenant_id, token, _ = tenant
+
+        response = await api_client.get("/auth/users", params={"limit": 0}, headers=auth(token, tenant_id))
+
+        assert response.status_code == 422
+
+    async def test_requires_admin(self, api_client, tenant, add_user):
+        """Test that a user without the admin role is refused."""
+        tenant_id, _, _ = tenant
+        _, token = await add_user(tenant_id, "plain@example.com")
+
+        response = await api_client.get("/auth/users", headers=auth(token, tenant_id))
+
+        assert response.status_code == 403
+
+    async def test_tenant_header_must_match_token(self, api_client, tenant):
+        """Test that an admin cannot list another tenant by changing X-Tenant-ID."""
+        tenant_id, token, _ = tenant
+
+        response = await api_client.get("/auth/users", headers=auth(token, f"{tenant_id}_other"))
+
+        assert response.status_code == 403
+
+    async def test_requires_token(self, api_client, tenant):
+        tenant_id, _, _ = tenant
+
+        response = await api_client.get("/auth/users", headers={"X-Tenant-ID": tenant_id})
+
+        assert response.status_code in (401, 403)
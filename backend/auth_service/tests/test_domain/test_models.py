@@ -1,6 +1,7 @@
 # Tests for User domain model
+import dataclasses
 import pytest
-from app.domain.models import User, Role
+from app.domain.models import User, UserRecord, Role
 
 class TestUser:
     def test_user_creation(self):
@@ -36,4 +37,32 @@ class TestRole:
         role3 = Role(name="user")
         
         assert role1.name == role2.name
-        assert role1.name != role3.name
\ No newline at end of file
+        assert role1.name != role3.name
+
+class TestUserRecord:
+    def test_record_is_immutable(self):
+        """Test that records cannot be changed or given new attributes."""
+        record = UserRecord(id="test-id", username="test@example.com", password_hash="h", tenant_id="tenant_1")
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            record.password_hash = "other"
+        assert not hasattr(record, "__dict__")
+        
+    def test_role_names_are_interned(self):
+        """Test that equal role names from different sources share one string."""
+        first = UserRecord.intern_roles(["".join(["ad", "min"])])
+        second = UserRecord.intern_roles(["".join(["adm", "in"])])
+        
+        assert first == ("admin",)
+        assert first[0] is second[0]
+        
+    def test_roles_view(self):
+        """Test that records expose Role objects like User does."""
+        record = UserRecord(id="test-id", username="test@example.com", password_hash="h",
+                            tenant_id="tenant_1", role_names=("admin", "user"))
+        user = User(id="test-id", username="test@example.com", password_hash="h",
+                    tenant_id="tenant_1", roles=[Role(name="admin"), Role(name="user")])
+        
+        assert list(record.roles) == user.roles
+        assert record.role_names == user.role_names
+
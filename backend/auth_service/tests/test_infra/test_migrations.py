@@ -0,0 +1,107 @@
+# Tests for the Alembic migrations
+import sqlite3
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Column, ForeignKey, MetaData, String, Table, create_engine
+from app.infra.db import MIGRATIONS_CONFIG, Base, run_migrations
+
+
+def legacy_schema():
+    """The tables init_db's create_all made before migrations, with no unique (tenant_id, username)"""
+    metadata = MetaData()
+    Table("roles", metadata, Column("name", String, primary_key=True, index=True))
+    Table(
+        "users", metadata,
+        Column("id", String, primary_key=True, index=True),
+        Column("username", String, index=True),
+        Column("password_hash", String),
+        Column("tenant_id", String, index=True)
+    )
+    Table(
+        "user_roles", metadata,
+        Column("user_id", String, ForeignKey("users.id"), primary_key=True),
+        Column("role_name", String, ForeignKey("roles.name"), primary_key=True)
+    )
+    return metadata
+
+
+def indexes(path, table):
+    with sqlite3.connect(path) as conn:
+        return {row[1]: bool(row[2]) for row in conn.execute(f"PRAGMA index_list({table})") if row[3] == "c"}
+
+
+def version(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT version_num FROM alembic_version").fetchone()[0]
+
+
+class TestMigrations:
+    def test_upgrade_matches_models(self, tmp_path):
+        """Test that a fresh database ends up with the indexes the models declare."""
+        path = tmp_path / "auth.db"
+        run_migrations(f"sqlite+aiosqlite:///{path}")
+
+        assert version(path) == "0003"
+        assert indexes(path, "users") == {"ix_users_tenant_id_username": True, "ix_users_tenant_id_id": True}
+        assert indexes(path, "user_roles") == {"ix_user_roles_role_name": False}
+        assert indexes(path, "roles") == {}
+        assert indexes(path, "revoked_tokens") == {"ix_revoked_tokens_jti": True, "ix_revoked_tokens_expires_at": False}
+        for table in ("users", "user_roles", "roles", "refresh_tokens", "revoked_tokens"):
+            declared = {index.name for index in Base.metadata.tables[table].indexes}
+            assert set(indexes(path, table)) == declared
+
+    def test_legacy_schema_is_stamped(self, tmp_path):
+        """Test that a database made by the old create_all startup is upgraded in place."""
+        path = tmp_path / "legacy.db"
+        engine = create_engine(f"sqlite:///{path}")
+        legacy_schema().create_all(engine)
+        engine.dispose()
+        with sqlite3.connect(path) as conn:
+            conn.execute("INSERT INTO users (id, username, password_hash, tenant_id) VALUES ('1', 'alice', 'x', 't1')")
+
+        run_migrations(f"sqlite+aiosqlite:///{path}")
+
+        assert version(path) == "0003"
+        assert indexes(path, "users") == {"ix_users_tenant_id_username": True, "ix_users_tenant_id_id": True}
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("SELECT username FROM users WHERE tenant_id = 't1'").fetchall() == [("alice",)]
+            with pytest.raises(sqlite3.IntegrityError):
+                conn.execute("INSERT INTO users (id, username, password_hash, tenant_id) VALUES ('2', 'alice', 'y', 't1')")
+
+    def test_legacy_duplicates_stop_the_upgrade(self, tmp_path):
+        """Test that duplicate (tenant_id, username) rows stop the upgrade before any index is built, and a rerun finishes once they are fixed."""
+        path = tmp_path / "legacy.db"
+        engine = create_engine(f"sqlite:///{path}")
+        legacy_schema().create_all(engine)
+        engine.dispose()
+        with sqlite3.connect(path) as conn:
+            conn.executemany(
+                "INSERT INTO users (id, username, password_hash, tenant_id) VALUES (?, ?, 'x', ?)",
+                [("1", "alice", "t1"), ("2", "alice", "t1"), ("3", "alice", "t2")]
+            )
+
+        with pytest.raises(RuntimeError, match="t1/alice \\(2 rows\\)"):
+            run_migrations(f"sqlite+aiosqlite:///{path}")
+
+        assert set(indexes(path, "users")) == {"ix_users_id", "ix_users_username", "ix_users_tenant_id"}
+
+        with sqlite3.connect(path) as conn:
+            conn.execute("UPDATE users SET username = 'alice2' WHERE id = '2'")
+        run_migrations(f"sqlite+aiosqlite:///{path}")
+
+        assert version(path) == "0003"
+
+    def test_downgrade_to_baseline(self, tmp_path):
+        """Test that 0002 can be rolled back."""
+        path = tmp_path / "auth.db"
+        config = Config(MIGRATIONS_CONFIG)
+        config.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{path}")
+        config.attributes["configure_logger"] = False
+        command.upgrade(config, "head")
+
+        command.downgrade(config, "0001")
+
+        assert version(path) == "0001"
+        assert set(indexes(path, "users")) == {"ix_users_id", "ix_users_username", "ix_users_tenant_id"}
@@ -0,0 +1,84 @@
+# Tests for the Principal Cache
+import time
+import pytest
+from app.infra.principal_cache import PrincipalCache, principal_cache
+from app.domain.models import User, Role
+
+
+def make_user(user_id, tenant_id="tenant_1"):
+    return User(id=user_id, username=f"{user_id}@example.com", password_hash="h",
+                tenant_id=tenant_id, roles=[Role(name="user")])
+
+
+class TestPrincipalCache:
+    def test_get_after_put(self):
+        """Test that a cached user is returned for its tenant only."""
+        cache = PrincipalCache(maxsize=10, ttl=60)
+        user = make_user("u1")
+        cache.put(user)
+        
+        assert cache.get("tenant_1", "u1") is user
+        assert cache.get("tenant_2", "u1") is None
+        
+    def test_entries_expire(self):
+        """Test that users are reloaded after the TTL."""
+        cache = PrincipalCache(maxsize=10, ttl=0.001)
+        cache.put(make_user("u1"))
+        time.sleep(0.01)
+        
+        assert cache.get("tenant_1", "u1") is None
+        assert len(cache) == 0
+        
+    def test_least_recently_used_evicted(self):
+        """Test that the cache stays bounded, evicting the least recently used user."""
+        cache = PrincipalCache(maxsize=2, ttl=60)
+        cache.put(make_user("u1"))
+        cache.put(make_user("u2"))
+        cache.get("tenant_1", "u1")
+        
+        cache.put(make_user("u3"))
+        
+        assert cache.get("tenant_1", "u2") is None
+        assert cache.get("tenant_1", "u1") is not None
+        assert cache.get("tenant_1", "u3") is not None
+        
+    def test_invalidate(self):
+        """Test forgetting one user, a tenant, or everything."""
+        cache = PrincipalCache(maxsize=10, ttl=60)
+        for user in (make_user("u1"), make_user("u2"), make_user("u3", "tenant_2")):
+            cache.put(user)
+        
+        cache.invalidate("tenant_1", "u1")
+        assert cache.get("tenant_1", "u1") is None
+        assert cache.get("tenant_1", "u2") is not None
+        
+        cache.invalidate("tenant_1")
+        assert cache.get("tenant_1", "u2") is None
+        assert cache.get("tenant_2", "u3") is not None
+        
+        cache.invalidate()
+        assert len(cache) == 0
+        
+    def test_stale_load_not_cached(self):
+        """Test that a user loaded before an invalidation is not cached after it."""
+        cache = PrincipalCache(maxsize=10, ttl=60)
+        generation = cache.generation
+        
+        cache.invalidate("tenant_1", "u1")
+        cache.put(make_user("u1"), generation)
+        
+        assert cache.get("tenant_1", "u1") is None
+
+
+@pytest.mark.asyncio
+class TestPrincipalCacheWithRepository:
+    async def test_password_change_invalidates(self, user_repository):
+        """Test that updating a user's password hash drops their cached principal."""
+        user = make_user("principal-cache-id")
+        user.username = "principalcache@example.com"
+        await user_repository.create_user(user)
+        principal_cache.put(user)
+        
+        await user_repository.update_password_hash(user.id, user.tenant_id, "new_hash")
+        
+        assert principal_cache.get(user.tenant_id, user.id) is None
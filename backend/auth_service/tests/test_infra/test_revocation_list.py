@@ -0,0 +1,59 @@
+# Tests for the Revocation List
+import time
+from app.infra.revocation_list import RevocationList
+
+
+class FakeTokens:
+    """revocations_after over an in-memory list of (id, jti, exp) rows"""
+
+    def __init__(self):
+        self.rows = []
+        self.reads = []
+
+    async def revocations_after(self, after_id, now, limit):
+        self.reads.append(after_id)
+        rows = [row for row in self.rows if row[0] > after_id and row[2] > now]
+        return rows[:limit]
+
+
+class TestRevocationList:
+    async def test_sync_is_incremental(self):
+        """Test that each sync only asks for rows past the last one seen."""
+        tokens = FakeTokens()
+        revoked = RevocationList(overlap=0, batch_size=2)
+        exp = int(time.time()) + 60
+        tokens.rows = [(1, "a", exp), (2, "b", exp), (3, "c", exp)]
+        
+        await revoked.sync(tokens)
+        tokens.rows.append((4, "d", exp))
+        await revoked.sync(tokens)
+        
+        assert tokens.reads == [0, 2, 3]
+        assert all(revoked.is_revoked(jti) for jti in "abcd")
+        assert not revoked.is_revoked("e")
+        assert not revoked.is_revoked(None)
+        
+    async def test_late_commits_are_picked_up(self):
+        """Test that a row committed after a higher id was synced is still loaded."""
+        tokens = FakeTokens()
+        revoked = RevocationList(overlap=60)
+        exp = int(time.time()) + 60
+        tokens.rows = [(2, "b", exp)]
+        await revoked.sync(tokens)
+        
+        tokens.rows.insert(0, (1, "a", exp))
+        await revoked.sync(tokens)
+        
+        assert revoked.is_revoked("a")
+        
+    async def test_expired_entries_dropped(self):
+        """Test that revocations of expired tokens are forgotten."""
+        tokens = FakeTokens()
+        revoked = RevocationList(overlap=0)
+        revoked.add([("old", int(time.time()) - 1), ("new", int(time.time()) + 60)])
+        
+        await revoked.sync(tokens)
+        
+        assert not revoked.is_revoked("old")
+        assert revoked.is_revoked("new")
+        assert len(revoked) == 1
@@ -0,0 +1,66 @@
+# Tests for the Role Cache
+import pytest
+from app.infra.role_cache import RoleCache, role_cache
+from app.domain.models import User, Role
+
+
+class TestRoleCache:
+    def test_missing_until_added(self):
+        """Test that only added, unexpired names count as known."""
+        cache = RoleCache(ttl=60)
+        assert cache.missing({"user", "admin"}) == {"user", "admin"}
+        
+        cache.add({"user"})
+        
+        assert cache.missing({"user", "admin"}) == {"admin"}
+        
+    def test_entries_expire(self):
+        """Test that names are re-checked after the TTL."""
+        cache = RoleCache(ttl=0)
+        cache.add({"user"})
+        
+        assert cache.missing({"user"}) == {"user"}
+        
+    def test_invalidate(self):
+        """Test forgetting one role or all of them."""
+        cache = RoleCache(ttl=60)
+        cache.add({"user", "admin", "billing"})
+        
+        cache.invalidate("admin")
+        assert cache.missing({"user", "admin", "billing"}) == {"admin"}
+        
+        cache.invalidate()
+        assert cache.missing({"user", "billing"}) == {"user", "billing"}
+
+
+@pytest.mark.asyncio
+class TestRoleCacheWithRepository:
+    async def test_roles_cached_after_commit(self, user_repository):
+        """Test that create_user caches the roles it upserted once committed."""
+        role_cache.invalidate()
+        user = User(
+            id="role-cache-id",
+            username="rolecache@example.com",
+            password_hash="hashed_password",
+            tenant_id="tenant_1",
+            roles=[Role(name="cached-role")]
+        )
+        
+        await user_repository.create_user(user)
+        
+        assert role_cache.missing({"cached-role"}) == set()
+        
+    async def test_roles_not_cached_after_rollback(self, user_repository):
+        """Test that a failed registration does not leave its roles cached."""
+        role_cache.invalidate()
+        first = User(id="role-rb-1", username="rolerb@example.com", password_hash="h",
+                     tenant_id="tenant_1", roles=[Role(name="user")])
+        await user_repository.create_user(first)
+        role_cache.invalidate()
+        
+        duplicate = User(id="role-rb-2", username="rolerb@example.com", password_hash="h",
+                         tenant_id="tenant_1", roles=[Role(name="rolled-back-role")])
+        with pytest.raises(ValueError):
+            await user_repository.create_user(duplicate)
+        
+        assert role_cache.missing({"rolled-back-role"}) == {"rolled-back-role"}
@@ -0,0 +1,124 @@
+# Tests for request tracing and profiling
+from contextlib import contextmanager
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.infra import tracing
+from app.infra.metrics import REQUEST_DB_QUERIES
+from app.infra.tracing import RequestProfile, RequestProfileMiddleware, span, traced
+
+
+class RecordingTracer:
+    """Stands in for an OpenTelemetry tracer"""
+
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None, **kwargs):
+        self.spans.append((name, attributes))
+        yield None
+
+
+@pytest.fixture
+def profile():
+    profile = RequestProfile()
+    token = tracing._profile.set(profile)
+    yield profile
+    tracing._profile.reset(token)
+
+
+class TestSpans:
+    async def test_span_reaches_tracer_and_profile(self, profile, monkeypatch):
+        """Test that a span is opened on the tracer and timed into the request's profile."""
+        tracer = RecordingTracer()
+        monkeypatch.setattr(tracing, "_tracer", tracer)
+
+        @traced("db.lookup")
+        async def lookup():
+            with span("jwt.decode", {"jwt.algorithm": "HS256"}):
+                pass
+
+        await lookup()
+        await lookup()
+
+        assert tracer.spans == [("db.lookup", None), ("jwt.decode", {"jwt.algorithm": "HS256"})] * 2
+        assert list(profile.stages) == ["jwt.decode", "db.lookup"]
+        assert profile.stages["db.lookup"][0] == 2
+        assert 'db.lookup;dur=' in profile.server_timing()
+        assert 'desc="2 calls"' in profile.server_timing()
+
+    def test_span_without_request(self):
+        """Test that spans outside a request are only measured."""
+        with span("auth.background"):
+            pass
+
+    def test_unknown_tracing_backend(self):
+        """Test that a misspelt TRACING fails at startup."""
+        with pytest.raises(ValueError):
+            tracing.configure_tracing("zipkin")
+
+
+class TestQueryCounting:
+    async def test_queries_counted_per_request(self, test_engine, profile):
+        """Test that statements run inside a request are counted and timed."""
+        async with test_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+
+        assert profile.queries == 2
+        assert profile.query_seconds > 0
+
+    async def test_failed_queries_not_counted(self, test_engine, profile):
+        """Test that a failing statement does not leave its start time behind."""
+        async with test_engine.connect() as conn:
+            with pytest.raises(Exception):
+                await conn.execute(text("SELECT * FROM missing_table"))
+            await conn.execute(text("SELECT 1"))
+
+        assert profile.queries == 1
+
+
+class TestRequestProfileMiddleware:
+    def make_client(self, debug_header):
+        router = APIRouter()
+
+        @router.get("/items/{item_id}")
+        def item(item_id: str):
+            with span("app.load_item"):
+                return {"id": item_id}
+
+        app = FastAPI()
+        app.include_router(router, prefix="/api")
+        app.add_middleware(RequestProfileMiddleware, debug_header=debug_header)
+        return TestClient(app)
+
+    def test_server_timing_on_request(self):
+        """Test that X-Debug-Timing: 1 returns the breakdown when the header is enabled."""
+        client = self.make_client(debug_header=True)
+
+        timed = client.get("/api/items/1", headers={"X-Debug-Timing": "1"})
+        plain = client.get("/api/items/1")
+
+        assert timed.headers["server-timing"].startswith('db;dur=0.000;desc="0 queries", app.load_item;dur=')
+        assert "server-timing" not in plain.headers
+
+    def test_server_timing_disabled(self):
+        """Test that the breakdown is never sent unless enabled."""
+        client = self.make_client(debug_header=False)
+
+        response = client.get("/api/items/1", headers={"X-Debug-Timing": "1"})
+
+        assert "server-timing" not in response.headers
+
+    def test_route_label(self):
+        """Test that per-route metrics use the path template, with the router prefix."""
+        client = self.make_client(debug_header=False)
+
+        client.get("/api/items/42")
+        client.get("/nowhere")
+
+        assert ("/api/items/{item_id}",) in REQUEST_DB_QUERIES._series
+        assert ("/api/items/42",) not in REQUEST_DB_QUERIES._series
+        assert ("unmatched",) in REQUEST_DB_QUERIES._series
@@ -0,0 +1,56 @@
+# Tests for SQLAlchemy Unit of Work
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.infra.unit_of_work import SQLAlchemyUnitOfWork
+from app.domain.exceptions import UserAlreadyExistsError
+from app.domain.models import User, Role
+
+
+def make_user(user_id: str, username: str) -> User:
+    return User(
+        id=user_id,
+        username=username,
+        password_hash="hashed_password",
+        tenant_id="tenant_uow",
+        roles=[Role(name="user")]
+    )
+
+
+@pytest.mark.asyncio
+class TestSQLAlchemyUnitOfWork:
+    @pytest.fixture
+    def session_factory(self, test_engine):
+        return sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def test_commit_persists(self, session_factory):
+        """Test that committed writes are visible to the next unit of work."""
+        async with SQLAlchemyUnitOfWork(session_factory) as uow:
+            await uow.users.create_user(make_user("uow-id-1", "commit@example.com"))
+            await uow.commit()
+        
+        async with SQLAlchemyUnitOfWork(session_factory) as uow:
+            user = await uow.users.get_by_username_and_tenant("commit@example.com", "tenant_uow")
+        
+        assert user is not None
+        assert user.id == "uow-id-1"
+        
+    async def test_uncommitted_work_is_discarded(self, session_factory):
+        """Test that leaving a unit of work without commit rolls it back."""
+        async with SQLAlchemyUnitOfWork(session_factory) as uow:
+            await uow.users.create_user(make_user("uow-id-2", "discarded@example.com"))
+        
+        async with SQLAlchemyUnitOfWork(session_factory) as uow:
+            user = await uow.users.get_by_username_and_tenant("discarded@example.com", "tenant_uow")
+        
+        assert user is None
+        
+    async def test_duplicate_username_rejected_by_constraint(self, session_factory):
+        """Test that the unique (tenant_id, username) constraint reports duplicates."""
+        async with SQLAlchemyUnitOfWork(session_factory) as uow:
+            await uow.users.create_user(make_user("uow-id-3", "dup@example.com"))
+            await uow.commit()
+        
+        async with SQLAlchemyUnitOfWork(session_factory) as uow:
+            with pytest.raises(UserAlreadyExistsError):
+                await uow.users.create_user(make_user("uow-id-4", "dup@example.com"))
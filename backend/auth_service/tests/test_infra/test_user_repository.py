@@ -1,7 +1,7 @@
 # Tests for SQLAlchemy User Repository
 import pytest
 from app.infra.sqlalchemy_user_repository import SQLAlchemyUserRepository
-from app.domain.models import User, Role
+from app.domain.models import User, UserRecord, Role
 
 @pytest.mark.asyncio
 class TestSQLAlchemyUserRepository:
@@ -74,7 +74,25 @@ class TestSQLAlchemyUserRepository:
         user = await user_repository.get_by_id_and_tenant("nonexistent-id", "tenant_1")
         
         assert user is None
-        
+
+    async def test_get_many_by_ids_and_tenant(self, user_repository, monkeypatch):
+        """Test loading many users in chunked IN queries, scoped to the tenant."""
+        monkeypatch.setattr("app.infra.sqlalchemy_user_repository.IN_CHUNK_SIZE", 2)
+        for i in range(3):
+            await user_repository.create_user(User(id=f"many-{i}", username=f"many{i}@example.com", password_hash="h",
+                                                   tenant_id="tenant_many", roles=[Role(name="user"), Role(name="admin")]))
+        await user_repository.create_user(User(id="many-other", username="many@example.com", password_hash="h",
+                                               tenant_id="tenant_other", roles=[]))
+
+        users = await user_repository.get_many_by_ids_and_tenant(
+            ["many-0", "many-1", "many-2", "many-0", "many-other", "missing"], "tenant_many"
+        )
+
+        assert sorted(users) == ["many-0", "many-1", "many-2"]
+        assert users["many-1"].username == "many1@example.com"
+        assert users["many-1"].role_names == ("admin", "user")
+        assert await user_repository.get_many_by_ids_and_tenant([], "tenant_many") == {}
+
     async def test_list_users_by_tenant(self, user_repository):
         """Test listing users by tenant."""
         # Create multiple users for same tenant
@@ -139,4 +157,99 @@ class TestSQLAlchemyUserRepository:
         role_names = [role.name for role in retrieved_user.roles]
         assert "user" in role_names
         assert "admin" in role_names
-        assert "moderator" in role_names
\ No newline at end of file
+        assert "moderator" in role_names
+
+    async def test_update_password_hash(self, user_repository):
+        """Test replacing a user's stored password hash."""
+        user = User(
+            id="rehash-id",
+            username="rehashrepo@example.com",
+            password_hash="old_hash",
+            tenant_id="tenant_1",
+            roles=[Role(name="user")]
+        )
+        await user_repository.create_user(user)
+        
+        await user_repository.update_password_hash("rehash-id", "tenant_1", "new_hash")
+        
+        retrieved_user = await user_repository.get_by_id_and_tenant("rehash-id", "tenant_1")
+        assert retrieved_user.password_hash == "new_hash"
+        
+    async def test_bulk_create_users(self, user_repository):
+        """Test inserting many users at once, skipping usernames already taken."""
+        existing = User(
+            id="bulk-existing-id",
+            username="bulk-existing@example.com",
+            password_hash="hashed_password",
+            tenant_id="tenant_bulk",
+            roles=[Role(name="user")]
+        )
+        await user_repository.create_user(existing)
+        
+        users = [
+            User(id=f"bulk-id-{i}", username=f"bulk{i}@example.com", password_hash="hashed_password",
+                 tenant_id="tenant_bulk", roles=[Role(name="user"), Role(name="bulk-role")])
+            for i in range(3)
+        ]
+        users.append(User(id="bulk-dup-id", username="bulk-existing@example.com", password_hash="other",
+                          tenant_id="tenant_bulk", roles=[Role(name="admin")]))
+        
+        created = await user_repository.bulk_create_users(users)
+        
+        assert created == [True, True, True, False]
+        retrieved_user = await user_repository.get_by_username_and_tenant("bulk1@example.com", "tenant_bulk")
+        assert sorted(r.name for r in retrieved_user.roles) == ["bulk-role", "user"]
+        untouched = await user_repository.get_by_username_and_tenant("bulk-existing@example.com", "tenant_bulk")
+        assert untouched.id == "bulk-existing-id"
+        assert [r.name for r in untouched.roles] == ["user"]
+        
+    async def test_stream_users_by_tenant_pages(self, user_repository):
+        """Test streaming a tenant's users in id order across keyset pages."""
+        users = [
+            User(id=f"stream-id-{i:02d}", username=f"stream{i}@example.com", password_hash="hashed_password",
+                 tenant_id="tenant_stream", roles=[Role(name="user")])
+            for i in range(7)
+        ]
+        await user_repository.bulk_create_users(users)
+        await user_repository.bulk_create_users([
+            User(id="stream-other-id", username="stream0@example.com", password_hash="hashed_password",
+                 tenant_id="tenant_stream_other", roles=[Role(name="user")])
+        ])
+        
+        streamed = [u async for u in user_repository.stream_users_by_tenant("tenant_stream", page_size=3)]
+        
+        assert [u.id for u in streamed] == [u.id for u in users]
+        assert all([r.name for r in u.roles] == ["user"] for u in streamed)
+        
+    async def test_stream_users_by_tenant_cursor(self, user_repository):
+        """Test resuming after an id and stopping at a limit."""
+        users = [
+            User(id=f"cursor-id-{i:02d}", username=f"cursor{i}@example.com", password_hash="hashed_password",
+                 tenant_id="tenant_cursor", roles=[Role(name="user")])
+            for i in range(5)
+        ]
+        await user_repository.bulk_create_users(users)
+        
+        streamed = [u async for u in user_repository.stream_users_by_tenant(
+            "tenant_cursor", after_id="cursor-id-01", limit=2, page_size=1)]
+        
+        assert [u.id for u in streamed] == ["cursor-id-02", "cursor-id-03"]
+        
+    async def test_reads_return_records(self, user_repository):
+        """Test that lookups map rows straight to records with interned role names."""
+        user = User(id="record-id", username="record@example.com", password_hash="hashed_password",
+                    tenant_id="tenant_record", roles=[Role(name="user"), Role(name="admin")])
+        no_roles = User(id="record-none-id", username="recordnone@example.com", password_hash="hashed_password",
+                        tenant_id="tenant_record", roles=[])
+        await user_repository.create_user(user)
+        await user_repository.create_user(no_roles)
+        
+        by_id = await user_repository.get_by_id_and_tenant("record-id", "tenant_record")
+        by_name = await user_repository.get_by_username_and_tenant("record@example.com", "tenant_record")
+        
+        assert isinstance(by_id, UserRecord)
+        assert by_id == by_name
+        assert by_id.role_names == ("admin", "user")
+        assert by_id.role_names[0] is by_name.role_names[0]
+        assert (await user_repository.get_by_id_and_tenant("record-none-id", "tenant_record")).role_names == ()
+
@@ -0,0 +1,19 @@
+# Tests for Argon2 calibration
+from app.security.argon2_tuning import calibrate, MAX_TIME_COST
+
+
+class TestArgon2Tuning:
+    def test_calibrate_within_budget(self):
+        """Test that calibration keeps memory within budget and picks at least one pass."""
+        params = calibrate(target_ms=50, max_memory_kib=1024, parallelism=1)
+        
+        assert params["memory_cost"] <= 1024
+        assert 1 <= params["time_cost"] <= MAX_TIME_COST
+        assert params["parallelism"] == 1
+        
+    def test_calibrate_tiny_target_uses_single_pass(self):
+        """Test that an unreachable target falls back to the cheapest parameters."""
+        params = calibrate(target_ms=0.0001, max_memory_kib=2048, parallelism=1)
+        
+        assert params["time_cost"] == 1
+        assert params["memory_cost"] == 2048
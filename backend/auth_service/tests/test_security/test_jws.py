@@ -0,0 +1,53 @@
+# Tests for ES256/EdDSA token signing
+import time
+import pytest
+from jose.exceptions import ExpiredSignatureError, JWTError
+from taskly_common import jws
+from app.security.key_ring import generate_key
+
+
+@pytest.mark.parametrize("algorithm", jws.ASYMMETRIC_ALGORITHMS)
+class TestJws:
+    def test_round_trip(self, algorithm):
+        """Test that a signed token verifies against the key's JWK."""
+        key = generate_key(algorithm)
+        token = jws.encode({"sub": "user-1", "exp": time.time() + 60}, key.private_key, key.kid)
+        
+        assert jws.unverified_header(token) == {"alg": algorithm, "kid": key.kid, "typ": "JWT"}
+        assert jws.decode(token, jws.public_key_from_jwk(key.jwk))["sub"] == "user-1"
+        
+    def test_rejects_other_key(self, algorithm):
+        """Test that a token signed by another key of the same type fails."""
+        key, other = generate_key(algorithm), generate_key(algorithm)
+        token = jws.encode({"sub": "user-1"}, key.private_key, key.kid)
+        
+        with pytest.raises(JWTError):
+            jws.decode(token, other.public_key)
+            
+    def test_rejects_tampered_claims(self, algorithm):
+        """Test that changing the payload breaks the signature."""
+        key = generate_key(algorithm)
+        header, _, signature = jws.encode({"sub": "user-1"}, key.private_key, key.kid).split(".")
+        forged = jws.b64url_encode(b'{"sub":"admin"}')
+        
+        with pytest.raises(JWTError):
+            jws.decode(f"{header}.{forged}.{signature}", key.public_key)
+            
+    def test_rejects_expired(self, algorithm):
+        """Test that exp is enforced after the signature checks out."""
+        key = generate_key(algorithm)
+        token = jws.encode({"sub": "user-1", "exp": time.time() - 1}, key.private_key, key.kid)
+        
+        with pytest.raises(ExpiredSignatureError):
+            jws.decode(token, key.public_key)
+
+
+def test_rejects_algorithm_mismatch():
+    """Test that a header claiming another algorithm than the key's is refused."""
+    key = generate_key("ES256")
+    token = jws.encode({"sub": "user-1"}, key.private_key, key.kid)
+    _, payload, signature = token.split(".")
+    header = jws.b64url_encode(b'{"alg":"EdDSA","kid":"x"}')
+    
+    with pytest.raises(JWTError):
+        jws.decode(f"{header}.{payload}.{signature}", key.public_key)
@@ -0,0 +1,56 @@
+# Tests for the signing key ring
+import pytest
+from app.security.key_ring import KeyRing, generate_key, load_keys
+
+DAY = 24 * 3600
+
+
+class TestKeyRing:
+    def test_rotation_publishes_ahead_and_retires(self):
+        """Test a key's life: published first, then signing, then dropped once its tokens expired."""
+        ring = KeyRing("ES256", rotate_every=DAY, publish_ahead=600, retain=3600)
+        first = ring.signing_key
+        start = first.created_at
+        
+        ring.refresh(now=start + DAY - 600)
+        second = ring.jwks()["keys"][-1]["kid"]
+        assert ring.signing_key is first
+        assert [k["kid"] for k in ring.jwks()["keys"]] == [first.kid, second]
+        
+        ring.refresh(now=start + DAY)
+        assert ring.signing_key.kid == second
+        assert ring.get(first.kid) is first
+        
+        ring.refresh(now=start + DAY + 3600)
+        assert ring.get(first.kid) is None
+        assert [k["kid"] for k in ring.jwks()["keys"]] == [second]
+        
+    def test_etag_follows_published_keys(self):
+        """Test that the JWKS ETag changes only when the key set does."""
+        ring = KeyRing("EdDSA", rotate_every=DAY, publish_ahead=600, retain=3600)
+        etag = ring.etag
+        start = ring.signing_key.created_at
+        
+        ring.refresh(now=start + 60)
+        assert ring.etag == etag
+        ring.refresh(now=start + DAY)
+        assert ring.etag != etag
+        
+    def test_directory_keys(self, tmp_path):
+        """Test that a key directory is read by creation time and filtered by algorithm."""
+        old, new = generate_key("ES256", 1_000), generate_key("ES256", 2_000)
+        for key in (old, new, generate_key("EdDSA", 3_000)):
+            (tmp_path / f"{int(key.created_at)}.pem").write_bytes(key.to_pem())
+        
+        ring = KeyRing("ES256", str(tmp_path), publish_ahead=600, retain=3600)
+        ring.refresh(now=2_300)
+        
+        assert [k.kid for k in sorted(load_keys(str(tmp_path)), key=lambda k: k.created_at)][:2] == [old.kid, new.kid]
+        assert ring.signing_key.kid == old.kid
+        ring.refresh(now=2_600)
+        assert ring.signing_key.kid == new.kid
+        
+    def test_empty_directory(self, tmp_path):
+        """Test that a ring with nothing to sign with fails loudly."""
+        with pytest.raises(RuntimeError):
+            KeyRing("ES256", str(tmp_path))
@@ -0,0 +1,51 @@
+# Tests for the Password Hasher
+import asyncio
+import pytest
+from app.security.password_hasher import PasswordHasher, PasswordHasherBusyError
+
+
+@pytest.mark.asyncio
+class TestPasswordHasher:
+    async def test_hash_and_verify(self):
+        """Test hashing in the worker pool and verifying the result."""
+        hasher = PasswordHasher(executor="thread", workers=2, max_pending=4)
+        try:
+            hashed = await hasher.hash("test_password")
+            
+            assert hashed.startswith("$argon2")
+            assert await hasher.verify("test_password", hashed) is True
+            assert await hasher.verify("wrong_password", hashed) is False
+            assert hasher.in_flight == 0
+        finally:
+            hasher.shutdown()
+    
+    async def test_rejects_when_saturated(self):
+        """Test that calls past max_pending fail fast instead of queueing."""
+        hasher = PasswordHasher(executor="thread", workers=1, max_pending=2)
+        try:
+            results = await asyncio.gather(
+                *(hasher.hash(f"password_{i}") for i in range(3)),
+                return_exceptions=True
+            )
+            
+            busy = [r for r in results if isinstance(r, PasswordHasherBusyError)]
+            assert len(busy) == 1
+            assert busy[0].retry_after >= 1
+            assert hasher.in_flight == 0
+        finally:
+            hasher.shutdown()
+    
+    async def test_process_executor(self):
+        """Test hashing in worker processes."""
+        hasher = PasswordHasher(executor="process", workers=1, max_pending=2)
+        try:
+            hashed = await hasher.hash("test_password")
+            
+            assert await hasher.verify("test_password", hashed) is True
+        finally:
+            hasher.shutdown()
+    
+    async def test_unknown_executor(self):
+        """Test that an unknown executor kind is rejected."""
+        with pytest.raises(ValueError):
+            PasswordHasher(executor="fiber")
@@ -0,0 +1,107 @@
+# Tests for the verified token memo and the JWT backends
+import time
+import pytest
+from jose.exceptions import ExpiredSignatureError, JWTError
+from app.security.jwt_backends import BACKENDS, NativeBackend, get_backend, pyjwt
+from app.security.token_cache import VerifiedTokenCache
+
+SECRET = "test-secret"
+
+
+def claims(jti="t1", lifetime=60):
+    return {"sub": "u1", "tenant_id": "tenant_1", "jti": jti, "exp": time.time() + lifetime}
+
+
+class TestVerifiedTokenCache:
+    def test_get_after_put(self):
+        """Test that verified claims are returned for the same token only."""
+        cache = VerifiedTokenCache(maxsize=10, ttl=60)
+        payload = claims()
+        cache.put("token-a", payload)
+
+        assert cache.get("token-a") is payload
+        assert cache.get("token-b") is None
+
+    def test_lifetime_capped_at_exp(self):
+        """Test that a token is not served from the memo past its exp."""
+        cache = VerifiedTokenCache(maxsize=10, ttl=60)
+        cache.put("token-a", claims(lifetime=0.001))
+        time.sleep(0.01)
+
+        assert cache.get("token-a") is None
+        assert len(cache) == 0
+
+    def test_expired_tokens_not_cached(self):
+        """Test that claims already past exp are not remembered."""
+        cache = VerifiedTokenCache(maxsize=10, ttl=60)
+        cache.put("token-a", claims(lifetime=-1))
+
+        assert len(cache) == 0
+
+    def test_least_recently_used_evicted(self):
+        """Test that the memo stays bounded and its jti index with it."""
+        cache = VerifiedTokenCache(maxsize=2, ttl=60)
+        cache.put("token-1", claims("t1"))
+        cache.put("token-2", claims("t2"))
+        cache.get("token-1")
+
+        cache.put("token-3", claims("t3"))
+
+        assert cache.get("token-2") is None
+        assert cache.get("token-1") is not None
+        assert cache.get("token-3") is not None
+        assert set(cache._by_jti) == {"t1", "t3"}
+
+    def test_invalidate_by_jti(self):
+        """Test forgetting one token by its jti, or everything."""
+        cache = VerifiedTokenCache(maxsize=10, ttl=60)
+        cache.put("token-1", claims("t1"))
+        cache.put("token-2", claims("t2"))
+
+        cache.invalidate("t1")
+        assert cache.get("token-1") is None
+        assert cache.get("token-2") is not None
+
+        cache.invalidate()
+        assert len(cache) == 0
+
+    def test_disabled(self):
+        """Test that a zero TTL turns the memo off."""
+        cache = VerifiedTokenCache(maxsize=10, ttl=0)
+        cache.put("token-a", claims())
+
+        assert cache.get("token-a") is None
+
+
+@pytest.mark.parametrize("name", [name for name in BACKENDS if name != "pyjwt" or pyjwt is not None])
+class TestJwtBackends:
+    def test_round_trip(self, name):
+        """Test that each backend decodes its own tokens and the native backend's."""
+        backend = get_backend(name)
+        payload = {"sub": "u1", "exp": int(time.time()) + 60}
+
+        assert backend.decode(backend.encode(payload, SECRET, "HS256"), SECRET, "HS256") == payload
+        assert backend.decode(NativeBackend().encode(payload, SECRET, "HS256"), SECRET, "HS256") == payload
+        assert NativeBackend().decode(backend.encode(payload, SECRET, "HS256"), SECRET, "HS256") == payload
+
+    def test_rejects_wrong_secret(self, name):
+        """Test that a token signed with another secret fails with JWTError."""
+        backend = get_backend(name)
+        token = backend.encode({"sub": "u1"}, "other-secret", "HS256")
+
+        with pytest.raises(JWTError):
+            backend.decode(token, SECRET, "HS256")
+
+    def test_rejects_expired(self, name):
+        """Test that exp is enforced as jose's ExpiredSignatureError."""
+        backend = get_backend(name)
+        token = backend.encode({"sub": "u1", "exp": int(time.time()) - 10}, SECRET, "HS256")
+
+        with pytest.raises(ExpiredSignatureError):
+            backend.decode(token, SECRET, "HS256")
+
+
+def test_unknown_backend():
+    """Test that a misspelt JWT_BACKEND fails at startup."""
+    with pytest.raises(ValueError):
+        get_backend("fastjwt")
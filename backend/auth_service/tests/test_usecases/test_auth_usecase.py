@@ -2,6 +2,11 @@
 import pytest
 from app.usecases.auth_usecase import AuthUsecase
 from app.domain.models import User, Role
+from app.security.password_hasher import PasswordHasher, context_settings
+from app.usecases.dtos import BulkUserDTO
+from app.infra.sqlalchemy_token_repository import SQLAlchemyTokenRepository
+from app.infra.revocation_list import revocation_list
+from app.security.jwt_manager import verify_token
 
 
 @pytest.mark.asyncio
@@ -91,4 +96,113 @@ class TestAuthUsecase:
         
         assert token is not None
         assert isinstance(token, str)
-        assert len(token) > 0
\ No newline at end of file
+        assert len(token) > 0
+
+    async def test_authenticate_rehashes_outdated_hash(self, user_repository):
+        """Test that a login migrates a hash made with old argon2 costs."""
+        old_hasher = PasswordHasher(context_settings(memory_cost=1024, time_cost=1, parallelism=1), executor="thread", workers=1)
+        new_hasher = PasswordHasher(context_settings(memory_cost=2048, time_cost=1, parallelism=1), executor="thread", workers=1)
+        username = "rehash@example.com"
+        password = "test_password"
+        tenant_id = "tenant_1"
+        
+        try:
+            await AuthUsecase(user_repository, old_hasher).register(username, password, tenant_id, ["user"])
+            user = await AuthUsecase(user_repository, new_hasher).authenticate(username, password, tenant_id)
+            
+            assert user is not None
+            assert not new_hasher.needs_update(user.password_hash)
+            stored = await user_repository.get_by_username_and_tenant(username, tenant_id)
+            assert stored.password_hash == user.password_hash
+            assert old_hasher.needs_update(stored.password_hash)
+        finally:
+            old_hasher.shutdown()
+            new_hasher.shutdown()
+
+    async def test_bulk_register(self, user_repository):
+        """Test bulk registration reports one result per row, in order."""
+        hasher = PasswordHasher(context_settings(memory_cost=1024, time_cost=1, parallelism=1), executor="thread", workers=2)
+        usecase = AuthUsecase(user_repository, hasher)
+        rows = [
+            BulkUserDTO(username="bulkuc1@example.com", password="pw1"),
+            BulkUserDTO(username="bulkuc2@example.com", password="pw2", roles=["user", "admin"]),
+            BulkUserDTO(username="bulkuc1@example.com", password="pw3")
+        ]
+        
+        try:
+            results = [row async for chunk in usecase.bulk_register("tenant_bulk_uc", rows) for row in chunk]
+            user = await usecase.authenticate("bulkuc2@example.com", "pw2", "tenant_bulk_uc")
+        finally:
+            hasher.shutdown()
+        
+        assert [r["index"] for r in results] == [0, 1, 2]
+        assert [r["status"] for r in results] == ["created", "created", "exists"]
+        assert user is not None
+        assert sorted(r.name for r in user.roles) == ["admin", "user"]
+        
+    async def test_list_users(self, user_repository):
+        """Test listing a tenant's users without their password hashes."""
+        usecase = AuthUsecase(user_repository)
+        await user_repository.create_user(User(id="listuc-id", username="listuc@example.com", password_hash="hashed",
+                                                tenant_id="tenant_list_uc", roles=[Role(name="admin")]))
+        
+        users = [u async for u in usecase.list_users("tenant_list_uc")]
+        
+        assert users == [{"id": "listuc-id", "username": "listuc@example.com", "tenant_id": "tenant_list_uc", "roles": ["admin"]}]
+
+
+@pytest.fixture
+async def token_usecase(user_repository, test_session):
+    """AuthUsecase with a token repository on the test session, and a stored user."""
+    tokens = SQLAlchemyTokenRepository()
+    tokens._AsyncSession = lambda: test_session
+    usecase = AuthUsecase(user_repository, token_repo=tokens)
+    user = User(id=f"refresh-{id(usecase)}", username=f"refresh-{id(usecase)}@example.com", password_hash="hashed",
+                tenant_id="tenant_refresh", roles=[Role(name="user")])
+    await user_repository.create_user(user)
+    usecase.user = user
+    return usecase
+
+
+class TestRefreshTokens:
+    async def test_refresh_rotates(self, token_usecase):
+        """Test that a refresh token is exchanged once for a new pair."""
+        issued = await token_usecase.issue_tokens(token_usecase.user)
+        
+        renewed = await token_usecase.refresh(issued["refresh_token"])
+        
+        assert renewed is not None
+        assert renewed["refresh_token"] != issued["refresh_token"]
+        claims = verify_token(renewed["access_token"])
+        assert claims["sub"] == token_usecase.user.id
+        assert not revocation_list.is_revoked(claims["jti"])
+        
+    async def test_reuse_revokes_family(self, token_usecase):
+        """Test that replaying an exchanged refresh token revokes every token of its login."""
+        issued = await token_usecase.issue_tokens(token_usecase.user)
+        renewed = await token_usecase.refresh(issued["refresh_token"])
+        
+        assert await token_usecase.refresh(issued["refresh_token"]) is None
+        
+        assert await token_usecase.refresh(renewed["refresh_token"]) is None
+        assert revocation_list.is_revoked(verify_token(renewed["access_token"])["jti"])
+        
+    async def test_rejects_unknown_tokens(self, token_usecase):
+        """Test that malformed, unknown and forged refresh tokens are refused."""
+        issued = await token_usecase.issue_tokens(token_usecase.user)
+        token_id = issued["refresh_token"].split(".")[0]
+        
+        assert await token_usecase.refresh("garbage") is None
+        assert await token_usecase.refresh("unknown.secret") is None
+        assert await token_usecase.refresh(f"{token_id}.forged") is None
+        assert await token_usecase.refresh(issued["refresh_token"]) is not None
+        
+    async def test_logout(self, token_usecase):
+        """Test that logging out revokes the access token and the refresh token family."""
+        issued = await token_usecase.issue_tokens(token_usecase.user)
+        claims = verify_token(issued["access_token"])
+        
+        await token_usecase.logout(claims, issued["refresh_token"])
+        
+        assert revocation_list.is_revoked(claims["jti"])
+        assert await token_usecase.refresh(issued["refresh_token"]) is None
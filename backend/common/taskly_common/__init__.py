@@ -0,0 +1,7 @@
+"""
+Code shared by the Taskly backend services
+
+Installed into each service's image (pip install ./common); modules that
+need a web framework import it themselves, so the orchestrator can use the
+logging without starlette.
+"""
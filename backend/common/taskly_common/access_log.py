@@ -0,0 +1,105 @@
+"""
+Non-blocking structured logging
+Records are queued on the calling thread and written as JSON lines by a background thread
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Sequence
+
+access_logger = logging.getLogger("access")
+
+# Fraction of access records kept below ERROR; errors are always logged
+_sample_rate = 1.0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with any `extra={"fields": {...}}` merged in"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking or erroring when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(
+    level: str = None,
+    sample_rate: float = None,
+    queue_size: int = None,
+    quiet_loggers: Sequence[str] = ()
+) -> logging.handlers.QueueListener:
+    """Route all logging through a bounded queue to a JSON writer thread
+
+    `quiet_loggers` are chatty libraries limited to WARNING and above.
+    """
+    global _sample_rate
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    _sample_rate = sample_rate if sample_rate is not None else float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+    queue_size = queue_size or int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter())
+    log_queue = queue.Queue(maxsize=queue_size)
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.handlers = [DroppingQueueHandler(log_queue)]
+    root.setLevel(level.upper())
+
+    # uvicorn installs its own synchronous handlers; send its records through the queue too
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+    # Requests are covered by the access log
+    for name in ("uvicorn.access", *quiet_loggers):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def status_level(status_code: int) -> int:
+    """Access log level for an HTTP status: ERROR for 5xx, INFO (sampled) for everything else
+
+    4xx stays sampled, as a burst of 401s or 429s is exactly when logging
+    every request would hurt most.
+    """
+    return logging.ERROR if status_code >= 500 else logging.INFO
+
+
+def log_access(level: int, message: str, fields: dict):
+    """Emit one access record, sampling everything below ERROR"""
+    if level < logging.ERROR and _sample_rate < 1.0 and random.random() >= _sample_rate:
+        return
+    if access_logger.isEnabledFor(level):
+        access_logger.log(level, message, extra={"fields": fields})
@@ -0,0 +1,47 @@
+"""
+ASGI middleware shared by the HTTP services
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from taskly_common.access_log import log_access, status_level
+
+
+class AccessLogMiddleware:
+    """ASGI middleware writing one structured record per HTTP request
+
+    Inner middleware and handlers add fields through
+    scope["state"]["access_log"].
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def status_send(message: Message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, status_send)
+        finally:
+            code = status[0]
+            fields = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": code,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "client": scope["client"][0] if scope.get("client") else None
+            }
+            fields.update(scope.get("state", {}).get("access_log", {}))
+            log_access(status_level(code), "request", fields)
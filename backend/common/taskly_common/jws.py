@@ -0,0 +1,138 @@
+"""
+Compact JWS signing and verification for ES256 and EdDSA (Ed25519)
+The auth service signs access tokens with it and the gateway verifies them offline
+
+python-jose has no EdDSA, and its ECDSA path re-parses the key for every
+token, so asymmetric tokens are signed and checked here directly with
+cryptography. Errors are jose's JWTError family, as for HS256 tokens.
+"""
+import base64
+import hashlib
+import time
+from typing import Any, Dict, Optional, Union
+
+import orjson
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature, encode_dss_signature
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
+
+ASYMMETRIC_ALGORITHMS = ("ES256", "EdDSA")
+
+PrivateKey = Union[ec.EllipticCurvePrivateKey, ed25519.Ed25519PrivateKey]
+PublicKey = Union[ec.EllipticCurvePublicKey, ed25519.Ed25519PublicKey]
+
+
+def b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def algorithm_for(key: Union[PrivateKey, PublicKey]) -> str:
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)) and key.curve.name == "secp256r1":
+        return "ES256"
+    raise ValueError("signing keys must be P-256 (ES256) or Ed25519 (EdDSA)")
+
+
+def public_jwk(public_key: PublicKey) -> Dict[str, str]:
+    """The key's required JWK members (RFC 7517), which are also what its thumbprint covers"""
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        raw = public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        return {"crv": "Ed25519", "kty": "OKP", "x": b64url_encode(raw)}
+    numbers = public_key.public_numbers()
+    return {
+        "crv": "P-256", "kty": "EC",
+        "x": b64url_encode(numbers.x.to_bytes(32, "big")),
+        "y": b64url_encode(numbers.y.to_bytes(32, "big"))
+    }
+
+
+def thumbprint(jwk: Dict[str, str]) -> str:
+    """RFC 7638 JWK thumbprint, used as the kid"""
+    return b64url_encode(hashlib.sha256(orjson.dumps(jwk, option=orjson.OPT_SORT_KEYS)).digest())
+
+
+def public_key_from_jwk(jwk: Dict[str, Any]) -> PublicKey:
+    if jwk.get("kty") == "OKP" and jwk.get("crv") == "Ed25519":
+        return ed25519.Ed25519PublicKey.from_public_bytes(b64url_decode(jwk["x"]))
+    if jwk.get("kty") == "EC" and jwk.get("crv") == "P-256":
+        x = int.from_bytes(b64url_decode(jwk["x"]), "big")
+        y = int.from_bytes(b64url_decode(jwk["y"]), "big")
+        return ec.EllipticCurvePublicNumbers(x, y, ec.SECP256R1()).public_key()
+    raise ValueError(f"unsupported JWK: kty={jwk.get('kty')} crv={jwk.get('crv')}")
+
+
+def sign(private_key: PrivateKey, data: bytes) -> bytes:
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return private_key.sign(data)
+    # JWS wants the raw r || s pair, not the DER encoding cryptography produces
+    r, s = decode_dss_signature(private_key.sign(data, ec.ECDSA(hashes.SHA256())))
+    return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+
+
+def verify_signature(public_key: PublicKey, signature: bytes, data: bytes) -> bool:
+    try:
+        if isinstance(public_key, ed25519.Ed25519PublicKey):
+            public_key.verify(signature, data)
+        else:
+            if len(signature) != 64:
+                return False
+            der = encode_dss_signature(int.from_bytes(signature[:32], "big"), int.from_bytes(signature[32:], "big"))
+            public_key.verify(der, data, ec.ECDSA(hashes.SHA256()))
+    except InvalidSignature:
+        return False
+    return True
+
+
+def encode(claims: Dict[str, Any], private_key: PrivateKey, kid: str) -> str:
+    header = {"alg": algorithm_for(private_key), "kid": kid, "typ": "JWT"}
+    signing_input = f"{b64url_encode(orjson.dumps(header))}.{b64url_encode(orjson.dumps(claims))}"
+    return f"{signing_input}.{b64url_encode(sign(private_key, signing_input.encode()))}"
+
+
+def unverified_header(token: str) -> Dict[str, Any]:
+    try:
+        header = orjson.loads(b64url_decode(token.split(".", 1)[0]))
+    except (ValueError, orjson.JSONDecodeError) as e:
+        raise JWTError("malformed token header") from e
+    if not isinstance(header, dict):
+        raise JWTError("malformed token header")
+    return header
+
+
+def decode(token: str, public_key: PublicKey, now: Optional[float] = None) -> Dict[str, Any]:
+    """Verify the signature, then exp and nbf, and return the claims"""
+    try:
+        signing_input, _, signature = token.rpartition(".")
+        header_segment, _, payload_segment = signing_input.partition(".")
+        header = orjson.loads(b64url_decode(header_segment))
+        signature = b64url_decode(signature)
+    except (ValueError, orjson.JSONDecodeError) as e:
+        raise JWTError("malformed token") from e
+    # The key decides the algorithm; the header only has to agree with it
+    if not isinstance(header, dict) or header.get("alg") != algorithm_for(public_key):
+        raise JWTError("token algorithm does not match its key")
+    if not verify_signature(public_key, signature, signing_input.encode()):
+        raise JWTError("signature verification failed")
+
+    try:
+        claims = orjson.loads(b64url_decode(payload_segment))
+    except (ValueError, orjson.JSONDecodeError) as e:
+        raise JWTError("malformed token payload") from e
+    if not isinstance(claims, dict):
+        raise JWTError("malformed token payload")
+    now = time.time() if now is None else now
+    try:
+        if "exp" in claims and not float(claims["exp"]) > now:
+            raise ExpiredSignatureError("signature has expired")
+        if "nbf" in claims and float(claims["nbf"]) > now:
+            raise JWTClaimsError("the token is not yet valid")
+    except (TypeError, ValueError) as e:
+        raise JWTClaimsError("exp and nbf must be numeric dates") from e
+    return claims
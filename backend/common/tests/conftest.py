@@ -0,0 +1,7 @@
+# Test configuration and fixtures
+import sys
+from pathlib import Path
+
+# taskly_common, when it has not been pip-installed
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
@@ -0,0 +1,60 @@
+# Tests for the shared access log
+import logging
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from taskly_common import access_log
+from taskly_common.access_log import log_access, status_level
+from taskly_common.asgi import AccessLogMiddleware
+
+
+@pytest.fixture
+def records(monkeypatch):
+    """Access records emitted, with sampling set to drop everything it may drop"""
+    emitted = []
+    monkeypatch.setattr(access_log, "_sample_rate", 0.0)
+    monkeypatch.setattr(access_log.access_logger, "log", lambda level, message, extra: emitted.append(
+        (logging.getLevelName(level), message, extra["fields"])))
+    monkeypatch.setattr(access_log.access_logger, "isEnabledFor", lambda level: True)
+    return emitted
+
+
+class TestAccessLog:
+    @pytest.mark.parametrize("status_code, level", [
+        (200, logging.INFO), (304, logging.INFO), (401, logging.INFO), (429, logging.INFO),
+        (500, logging.ERROR), (503, logging.ERROR)
+    ])
+    def test_status_level(self, status_code, level):
+        """Test that only 5xx responses are logged above INFO."""
+        assert status_level(status_code) == level
+
+    def test_only_errors_bypass_sampling(self, records):
+        """Test that INFO and WARNING records are sampled and ERROR records never are."""
+        log_access(logging.INFO, "request", {"status": 429})
+        log_access(logging.WARNING, "unhandled event", {})
+        log_access(logging.ERROR, "request", {"status": 502})
+
+        assert records == [("ERROR", "request", {"status": 502})]
+
+    def test_middleware_record(self, records, monkeypatch):
+        """Test that the middleware logs one record per request, with fields added by the app."""
+        monkeypatch.setattr(access_log, "_sample_rate", 1.0)
+
+        def handler(request):
+            request.scope.setdefault("state", {})["access_log"] = {"service": "svc"}
+            return PlainTextResponse("nope", status_code=int(request.path_params["status"]))
+
+        app = Starlette(routes=[Route("/status/{status}", handler)])
+        app.add_middleware(AccessLogMiddleware)
+        client = TestClient(app, raise_server_exceptions=False)
+
+        client.get("/status/401")
+        client.get("/status/503")
+
+        assert [(level, fields["path"], fields["status"], fields["service"]) for level, _, fields in records] == [
+            ("INFO", "/status/401", 401, "svc"),
+            ("ERROR", "/status/503", 503, "svc"),
+        ]
+        assert all(fields["duration_ms"] >= 0 and fields["method"] == "GET" for _, _, fields in records)
@@ -0,0 +1,50 @@
+# Tests for the shared Prometheus instruments
+from taskly_common.metrics import Counter, Gauge, Histogram, Registry, status_class
+
+
+class TestMetrics:
+    def test_counter_and_gauge(self):
+        """Test label rendering, escaping and gauge updates."""
+        registry = Registry()
+        requests = registry.register(Counter("requests_total", "Requests", ("route",)))
+        in_flight = registry.register(Gauge("in_flight", "In flight"))
+        requests.inc('/a"b')
+        requests.inc('/a"b', amount=2)
+        in_flight.inc()
+        in_flight.inc()
+        in_flight.dec()
+
+        assert registry.render() == (
+            "# HELP requests_total Requests\n"
+            "# TYPE requests_total counter\n"
+            'requests_total{route="/a\\"b"} 3\n'
+            "# HELP in_flight In flight\n"
+            "# TYPE in_flight gauge\n"
+            "in_flight 1\n"
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that bucket counts accumulate up to +Inf, with values on a bound counted in it."""
+        histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value, "/a")
+
+        assert histogram.render() == [
+            'latency_seconds_bucket{route="/a",le="0.1"} 2',
+            'latency_seconds_bucket{route="/a",le="1"} 3',
+            'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+            'latency_seconds_sum{route="/a"} 2.65',
+            'latency_seconds_count{route="/a"} 4',
+        ]
+
+    def test_collectors_run_before_render(self):
+        """Test that collectors refresh gauges at scrape time."""
+        registry = Registry()
+        entries = registry.register(Gauge("entries", "Entries"))
+        cache = {"a": 1, "b": 2}
+        registry.add_collector(lambda: entries.set(len(cache)))
+
+        assert "entries 2\n" in registry.render()
+
+    def test_status_class(self):
+        assert [status_class(code) for code in (200, 404, 503)] == ["2xx", "4xx", "5xx"]
@@ -11,11 +11,13 @@ import sys
 from kafka import KafkaConsumer, KafkaProducer
 from kafka.errors import NoBrokersAvailable, KafkaError
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from taskly_common.access_log import configure_logging, log_access
+
+# Seconds to wait for the broker to acknowledge an outgoing event
+SEND_TIMEOUT_SECONDS = 30
+
+# Configure logging (JSON lines written off the consumer thread)
+configure_logging(quiet_loggers=("kafka",))
 logger = logging.getLogger(__name__)
 
 def wait_for_kafka(bootstrap_servers, max_retries=30, retry_interval=2):
@@ -66,11 +68,10 @@ def create_consumer_producer(bootstrap_servers):
 
 
 def handle_user_registered(event, producer):
-    """Handle user.registered event"""
+    """Handle user.registered event; returns whether the welcome event was delivered"""
     try:
         user_id = event.get("user_id")
         tenant_id = event.get("tenant_id")
-        logger.info(f"👤 New user registered: {user_id} in tenant: {tenant_id}")
         
         # Send welcome workflow event
         welcome_event = {
@@ -80,11 +81,13 @@ def handle_user_registered(event, producer):
             "timestamp": time.time()
         }
         
-        producer.send("user.welcome", welcome_event)
-        logger.info(f"🎉 Welcome workflow initiated for user: {user_id}")
+        # Wait for the broker's ack, so a failed send is reported rather than lost
+        producer.send("user.welcome", welcome_event).get(timeout=SEND_TIMEOUT_SECONDS)
+        return True
         
     except Exception as e:
         logger.error(f"❌ Error handling user.registered: {e}")
+        return False
 
 def main():
     """Main orchestrator loop"""
@@ -108,21 +111,31 @@ def main():
     try:
         # Main event processing loop
         for message in consumer:
+            started = time.perf_counter()
             try:
                 event = message.value
                 event_type = event.get("type", "unknown")
                 
-                logger.info(f"📨 Received event: {event_type}")
-                
                 # Route events to appropriate handlers
                 if event_type == "user.registered":
-                    handle_user_registered(event, producer)
+                    handled = handle_user_registered(event, producer)
+                    level, outcome = (logging.INFO, "handled") if handled else (logging.ERROR, "failed")
                 else:
-                    logger.warning(f"⚠️ Unhandled event type: {event_type}")
+                    level, outcome = logging.WARNING, "unhandled"
                 
                 # Flush producer to ensure messages are sent
                 producer.flush()
                 
+                log_access(level, "event" if outcome == "handled" else f"{outcome} event", {
+                    "event_type": event_type,
+                    "outcome": outcome,
+                    "topic": message.topic,
+                    "partition": message.partition,
+                    "offset": message.offset,
+                    "tenant_id": event.get("tenant_id"),
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+                })
+                
             except json.JSONDecodeError as e:
                 logger.error(f"❌ Invalid JSON in message: {e}")
             except Exception as e: